@@ -0,0 +1,12 @@
+"""性能基准测试模块"""
+import os
+
+# 绘制在SDL虚拟显示驱动下进行，需在导入pygame之前设置
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from .scenarios import SCENARIOS, Scenario
+from .runner import run_scenario
+
+__all__ = ['SCENARIOS', 'Scenario', 'run_scenario']
@@ -0,0 +1,63 @@
+"""运行基准测试并输出JSON
+
+用法:
+    python -m benchmarks                              # 运行全部场景
+    python -m benchmarks default large_fleets -o bench.json
+    python -m benchmarks --no-draw --ticks 1000
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from .scenarios import SCENARIOS
+from .runner import run_scenario
+
+def git_revision() -> str:
+    """当前提交哈希，不在git仓库中时返回空字符串"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def main():
+    parser = argparse.ArgumentParser(description="太空战争模拟器性能基准")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"要运行的场景（默认全部）: {', '.join(SCENARIOS)}")
+    parser.add_argument("--ticks", type=int, help="覆盖每个场景的测量帧数")
+    parser.add_argument("--no-draw", action="store_true", help="只测量 update()")
+    parser.add_argument("-o", "--output", help="把JSON结果写入文件（默认输出到标准输出）")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"未知场景: {', '.join(unknown)}")
+
+    results = []
+    for name in args.scenarios or list(SCENARIOS):
+        result = run_scenario(SCENARIOS[name], ticks=args.ticks, draw=not args.no_draw)
+        results.append(result)
+        draw = result["draw"]
+        print(f"{name:<18} update {result['update']['per_second']:8.1f} 帧/秒 "
+              f"p50 {result['update']['p50_ms']:7.2f}ms p99 {result['update']['p99_ms']:7.2f}ms"
+              + (f" | draw p50 {draw['p50_ms']:7.2f}ms p99 {draw['p99_ms']:7.2f}ms" if draw else ""),
+              file=sys.stderr, flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
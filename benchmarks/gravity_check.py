@@ -0,0 +1,91 @@
+"""核心引力回归检查：批量计算与逐对循环的轨迹一致性及耗时
+
+用若干个真实的 Core 对象积分相同的步数：参考轨迹逐个核心调用 Core._gravity_force，
+即游戏中核心数低于 core_batch_gravity_threshold 时的路径（按帧初位置）；另两条轨迹分别用
+全对向量化和 Barnes–Hut 算出引力。三者都像游戏中一样经由 Core.update 积分，比较最终位置，
+偏差超过容差时以非零状态退出。
+
+用法:
+    python -m benchmarks.gravity_check
+    python -m benchmarks.gravity_check --cores 300 --steps 60 --theta 0.3
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from config import GameConfig, SIM_DT
+from entities import Core
+from game.core_physics import barnes_hut_gravity, pairwise_gravity
+from utils.vector2 import Vector2
+
+Forces = Callable[[List[Core], GameConfig], List[Tuple[float, float]]]
+
+def naive_forces(cores: List[Core], config: GameConfig) -> List[Tuple[float, float]]:
+    """按帧初位置逐个核心调用 Core._gravity_force，与 SpaceWarSimulator._core_gravity 核心较少时相同"""
+    return [core._gravity_force(config, cores) for core in cores]
+
+def batched_forces(gravity) -> Forces:
+    """用 gravity(positions, masses, strength) 按帧初位置一次算出全部引力"""
+    def forces(cores: List[Core], config: GameConfig) -> List[Tuple[float, float]]:
+        positions = np.array([(core.pos.x, core.pos.y) for core in cores])
+        masses = np.array([core.mass for core in cores])
+        return [tuple(f) for f in gravity(positions, masses, config.gravity_strength).tolist()]
+    return forces
+
+def make_cores(positions: np.ndarray, config: GameConfig) -> List[Core]:
+    """在给定位置创建静止的核心"""
+    rng = random.Random(0)
+    cores = [Core(Vector2(x, y), i, config, rng) for i, (x, y) in enumerate(positions.tolist())]
+    for core in cores:
+        core.velocity.set(0, 0)
+    return cores
+
+def integrate(forces: Forces, positions: np.ndarray, config: GameConfig, steps: int):
+    """与游戏中一样逐个调用 Core.update 积分，返回最终位置和总耗时"""
+    cores = make_cores(positions, config)
+    start = time.perf_counter()
+    for _ in range(steps):
+        for core, force in zip(cores, forces(cores, config)):
+            core.update(config, [], cores, SIM_DT, force)
+    elapsed = time.perf_counter() - start
+    return np.array([(core.pos.x, core.pos.y) for core in cores]), elapsed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="核心引力回归检查")
+    parser.add_argument("--cores", type=int, default=200, help="核心数量")
+    parser.add_argument("--steps", type=int, default=120, help="积分步数")
+    parser.add_argument("--theta", type=float, default=0.5, help="Barnes–Hut 开角")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--exact-tol", type=float, default=1e-6, help="向量化结果允许的最大位置偏差（像素）")
+    parser.add_argument("--approx-tol", type=float, default=1.0, help="Barnes–Hut 允许的最大位置偏差（像素）")
+    args = parser.parse_args()
+
+    config = GameConfig(world_width=4000, world_height=4000)
+    rng = np.random.default_rng(args.seed)
+    positions = rng.uniform((0, 0), (config.world_width, config.world_height), size=(args.cores, 2))
+
+    reference, naive_time = integrate(naive_forces, positions, config, args.steps)
+    cases = [
+        ("全对向量化", batched_forces(pairwise_gravity), args.exact_tol),
+        (f"Barnes–Hut θ={args.theta}",
+         batched_forces(lambda p, m, g: barnes_hut_gravity(p, m, g, args.theta)), args.approx_tol),
+    ]
+
+    print(f"{args.cores} 个核心, {args.steps} 步")
+    print(f"{'逐对循环':<20}{naive_time / args.steps * 1000:9.3f} ms/步")
+    failed = False
+    for name, gravity, tolerance in cases:
+        result, elapsed = integrate(gravity, positions, config, args.steps)
+        deviation = float(np.sqrt(((result - reference) ** 2).sum(axis=1)).max())
+        ok = deviation <= tolerance
+        failed |= not ok
+        print(f"{name:<20}{elapsed / args.steps * 1000:9.3f} ms/步  最大偏差 {deviation:.3g}px "
+              f"(容差 {tolerance:g}) {'OK' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
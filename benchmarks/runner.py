@@ -0,0 +1,69 @@
+"""基准场景运行与统计"""
+import time
+from typing import List
+
+from game.simulator import SpaceWarSimulator
+from .scenarios import Scenario
+
+def percentile(sorted_values: List[int], fraction: float) -> float:
+    """已排序数据的百分位数（最近秩）"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize_timings(samples_ns: List[int]) -> dict:
+    """把每帧耗时（纳秒）汇总为毫秒统计"""
+    if not samples_ns:
+        return {}
+    ordered = sorted(samples_ns)
+    total = sum(ordered)
+    return {
+        "per_second": len(ordered) / (total / 1e9) if total else 0.0,
+        "mean_ms": total / len(ordered) / 1e6,
+        "p50_ms": percentile(ordered, 0.50) / 1e6,
+        "p99_ms": percentile(ordered, 0.99) / 1e6,
+        "max_ms": ordered[-1] / 1e6,
+    }
+
+def run_scenario(scenario: Scenario, ticks: int = None, draw: bool = True) -> dict:
+    """运行一个场景，分别统计 update() 和 draw() 的每帧耗时"""
+    ticks = scenario.ticks if ticks is None else ticks
+    simulator = SpaceWarSimulator(scenario.config, headless=True, seed=scenario.seed)
+    if len(simulator.all_cores) != scenario.config.num_factions:
+        raise ValueError(f"场景 {scenario.name}: 请求 {scenario.config.num_factions} 个阵营，"
+                         f"只放下了 {len(simulator.all_cores)} 个核心")
+    if draw:
+        simulator.attach_viewer()
+    if scenario.setup is not None:
+        scenario.setup(simulator)
+    simulator.step(scenario.warmup_ticks)
+
+    update_ns, draw_ns = [], []
+    peak = {"ships": 0, "projectiles": 0, "particles": 0}
+    perf_counter_ns = time.perf_counter_ns
+    for _ in range(ticks):
+        start = perf_counter_ns()
+        simulator.update()
+        update_ns.append(perf_counter_ns() - start)
+
+        if draw:
+            start = perf_counter_ns()
+            simulator.draw()
+            draw_ns.append(perf_counter_ns() - start)
+
+        peak["ships"] = max(peak["ships"], sum(len(core.ships) for core in simulator.cores))
+        peak["projectiles"] = max(peak["projectiles"], len(simulator.projectiles))
+        peak["particles"] = max(peak["particles"], simulator.particles.count)
+
+    return {
+        "name": scenario.name,
+        "description": scenario.description,
+        "seed": scenario.seed,
+        "ticks": ticks,
+        "cores": len(simulator.all_cores),
+        "map_objects": len(simulator.map_objects),
+        "peak": peak,
+        "update": summarize_timings(update_ns),
+        "draw": summarize_timings(draw_ns),
+    }
@@ -0,0 +1,105 @@
+"""固定种子的基准场景"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+
+from config import GameConfig, ObjectType, SCREEN_WIDTH, SCREEN_HEIGHT
+from entities import MapObject
+from utils.vector2 import Vector2
+
+if TYPE_CHECKING:
+    from game.simulator import SpaceWarSimulator
+
+@dataclass
+class Scenario:
+    """基准场景：配置 + 可选的初始布置"""
+    name: str
+    description: str
+    config: GameConfig = field(default_factory=GameConfig)
+    setup: Optional[Callable[['SpaceWarSimulator'], None]] = None
+    seed: int = 12345
+    warmup_ticks: int = 60
+    ticks: int = 600
+
+def fill_fleets(simulator: 'SpaceWarSimulator'):
+    """让每个核心立即造满舰船"""
+    for core in simulator.cores:
+        while len(core.ships) < core.max_ships:
+            core.spawn_ship(simulator.config)
+
+def setup_projectile_storm(simulator: 'SpaceWarSimulator'):
+    """造满舰船，配合高射速低伤害的配置制造大量飞行中的子弹"""
+    fill_fleets(simulator)
+
+def setup_mass_destruction(simulator: 'SpaceWarSimulator'):
+    """造满舰船后在第一帧摧毁除一个核心外的所有核心及其舰船"""
+    fill_fleets(simulator)
+    simulator.step(1)
+    for core in simulator.cores[1:]:
+        for ship in core.ships:
+            ship.take_damage(ship.health, simulator)
+        core.shield_energy = 0
+        core.take_damage(core.health * 10, simulator)
+
+def setup_many_map_objects(simulator: 'SpaceWarSimulator', count: int = 500):
+    """补足地图物体数量（不检查间距）"""
+    config = simulator.config
+    rng = simulator.rng
+    obj_types = [ObjectType.OBSTACLE, ObjectType.RESOURCE, ObjectType.BUFF, ObjectType.DEBUFF]
+    weights = [0.65, 0.18, 0.10, 0.07]
+    while len(simulator.map_objects) < count:
+        obj_type = rng.choices(obj_types, weights=weights, k=1)[0]
+        pos = Vector2(rng.randint(60, config.world_width - 60), rng.randint(60, config.world_height - 60))
+        size_range = getattr(config, f"{obj_type.value}_size_range")
+        simulator.map_objects.append(MapObject(pos, rng.uniform(*size_range), obj_type, rng))
+    simulator.rebuild_map_object_grid()
+    fill_fleets(simulator)
+
+def setup_large_world(simulator: 'SpaceWarSimulator'):
+    """造满舰船，有窗口时把相机对准第一个核心"""
+    fill_fleets(simulator)
+    if simulator.camera is not None:
+        core = simulator.cores[0]
+        simulator.camera.center_on(core.pos.x, core.pos.y)
+
+SCENARIOS: Dict[str, Scenario] = {s.name: s for s in [
+    Scenario(
+        "default",
+        "默认配置，6个阵营",
+    ),
+    Scenario(
+        "large_fleets",
+        "10个阵营，每个阵营200艘舰船",
+        config=GameConfig(num_factions=10, core_max_ships=200, core_spacing=250.0),
+        setup=fill_fleets,
+        ticks=300,
+    ),
+    Scenario(
+        "projectile_storm",
+        "满编舰队高射速低伤害，大量子弹同时飞行",
+        config=GameConfig(core_max_ships=80, ship_attack_cooldown=4, ship_attack_angle=360.0,
+                          ship_attack_damage=0.01, ship_attack_range=600.0),
+        setup=setup_projectile_storm,
+        ticks=300,
+    ),
+    Scenario(
+        "mass_destruction",
+        "10个阵营同时被摧毁，爆炸粒子峰值",
+        config=GameConfig(num_factions=10, core_max_ships=60, core_spacing=250.0),
+        setup=setup_mass_destruction,
+        warmup_ticks=0,
+        ticks=240,
+    ),
+    Scenario(
+        "map_objects_500",
+        "500个地图物体",
+        setup=setup_many_map_objects,
+    ),
+    Scenario(
+        "large_world",
+        "边长为窗口5倍的战场，40个阵营、1250个地图物体，相机只看其中一块",
+        config=GameConfig(world_width=SCREEN_WIDTH * 5, world_height=SCREEN_HEIGHT * 5,
+                          num_factions=40, map_objects_count=1250, core_max_ships=60),
+        setup=setup_large_world,
+        ticks=300,
+    ),
+]}
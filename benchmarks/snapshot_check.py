@@ -0,0 +1,81 @@
+"""快照回归检查：快照/恢复的耗时，以及分叉后两个模拟器的一致性
+
+在满编舰队的对局中途保存快照，测量编码和恢复耗时；随后分叉出一个模拟器，
+两者各自推进相同帧数后比较快照字节，并检查恢复出的实体属性集合与原对象相同。
+不一致时以非零状态退出。
+
+用法:
+    python -m benchmarks.snapshot_check
+    python -m benchmarks.snapshot_check --scenario projectile_storm --ticks 600
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from benchmarks.scenarios import SCENARIOS
+from game.simulator import SpaceWarSimulator
+
+def timed(func, repeat: int) -> float:
+    """func 的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def attribute_mismatches(original: SpaceWarSimulator, restored: SpaceWarSimulator):
+    """属性集合不同的实体类型"""
+    pairs = [("核心", original.all_cores, restored.all_cores),
+             ("地图物体", original.map_objects, restored.map_objects),
+             ("舰船", [s for c in original.cores for s in c.ships], [s for c in restored.cores for s in c.ships])]
+    for name, left, right in pairs:
+        if len(left) != len(right):
+            yield f"{name}数量 {len(left)} != {len(right)}"
+            continue
+        for a, b in zip(left, right):
+            if set(vars(a)) != set(vars(b)):
+                yield f"{name}属性 {sorted(set(vars(a)) ^ set(vars(b)))}"
+                break
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="快照回归检查")
+    parser.add_argument("--scenario", default="large_fleets", choices=sorted(SCENARIOS))
+    parser.add_argument("--warmup", type=int, default=120, help="保存快照前推进的帧数")
+    parser.add_argument("--ticks", type=int, default=300, help="分叉后各自推进的帧数")
+    parser.add_argument("--repeat", type=int, default=10, help="计时重复次数")
+    args = parser.parse_args()
+
+    scenario = SCENARIOS[args.scenario]
+    sim = SpaceWarSimulator(scenario.config, headless=True, seed=scenario.seed)
+    if scenario.setup:
+        scenario.setup(sim)
+    sim.step(args.warmup)
+
+    ships = sum(len(core.ships) for core in sim.cores)
+    data = sim.snapshot()
+    encode_ms = timed(sim.snapshot, args.repeat)
+    restored = SpaceWarSimulator(headless=True, snapshot=data)
+    restore_ms = timed(lambda: restored.restore(data), args.repeat)
+    print(f"{args.scenario}: {ships} 艘舰船, {len(sim.projectiles)} 枚子弹, 快照 {len(data) / 1024:.0f} KiB")
+    print(f"保存 {encode_ms:.2f} ms  恢复 {restore_ms:.2f} ms")
+
+    problems = list(attribute_mismatches(sim, restored))
+    if restored.snapshot() != data:
+        problems.append("恢复后再次保存的快照与原快照不同")
+
+    fork = sim.fork()
+    sim.step(args.ticks)
+    fork.step(args.ticks)
+    if sim.snapshot() != fork.snapshot():
+        problems.append(f"分叉后推进 {args.ticks} 帧，两个模拟器的状态不同")
+
+    for problem in problems:
+        print("FAIL", problem)
+    if not problems:
+        print(f"分叉后推进 {args.ticks} 帧状态一致 OK")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
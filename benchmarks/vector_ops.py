@@ -0,0 +1,81 @@
+"""Vector2 微基准：对比分配临时对象的写法和原地/平方距离写法
+
+用法:
+    python -m benchmarks.vector_ops
+    python -m benchmarks.vector_ops --points 2000 --repeat 7
+"""
+import argparse
+import math
+import random
+import timeit
+
+from utils.vector2 import Vector2, nearest
+
+class DictVector2:
+    """不带 __slots__、每次运算都返回新对象的旧版向量，作为对照"""
+
+    def __init__(self, x: float = 0, y: float = 0):
+        self.x, self.y = x, y
+
+    def __add__(self, other):
+        return DictVector2(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other):
+        return DictVector2(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, scalar):
+        return DictVector2(self.x * scalar, self.y * scalar)
+
+    def magnitude(self):
+        return math.sqrt(self.x * self.x + self.y * self.y)
+
+    def distance_to(self, other):
+        return (self - other).magnitude()
+
+def bench_nearest_alloc(origin, points):
+    closest, closest_distance = None, float('inf')
+    for p in points:
+        distance = origin.distance_to(p)
+        if distance < closest_distance:
+            closest, closest_distance = p, distance
+    return closest
+
+def bench_nearest_sq(origin, points):
+    return nearest(origin, points)
+
+def bench_integrate_alloc(positions, velocity, dt):
+    for i, pos in enumerate(positions):
+        positions[i] = pos + velocity * dt
+
+def bench_integrate_inplace(positions, velocity, dt):
+    vx, vy = velocity.x * dt, velocity.y * dt
+    for pos in positions:
+        pos.x += vx
+        pos.y += vy
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector2 微基准")
+    parser.add_argument("--points", type=int, default=1000, help="每轮处理的向量数量")
+    parser.add_argument("--number", type=int, default=200, help="每次计时的轮数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复计时次数，取最小值")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    coords = [(rng.uniform(0, 1800), rng.uniform(0, 1000)) for _ in range(args.points)]
+    old_points = [DictVector2(x, y) for x, y in coords]
+    new_points = [Vector2(x, y) for x, y in coords]
+    dt = 1 / 60
+
+    cases = [
+        ("最近点 distance_to (旧)", lambda: bench_nearest_alloc(DictVector2(900, 500), old_points)),
+        ("最近点 nearest (新)", lambda: bench_nearest_sq(Vector2(900, 500), new_points)),
+        ("位置积分 pos + v*dt (旧)", lambda: bench_integrate_alloc(old_points, DictVector2(3, 4), dt)),
+        ("位置积分 原地 (新)", lambda: bench_integrate_inplace(new_points, Vector2(3, 4), dt)),
+    ]
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        per_vector_ns = best / (args.number * args.points) * 1e9
+        print(f"{name:<28}{per_vector_ns:8.1f} ns/向量")
+
+if __name__ == "__main__":
+    main()
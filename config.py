@@ -7,6 +7,7 @@ from enum import Enum
 SCREEN_WIDTH = 1800
 SCREEN_HEIGHT = 1000
 FPS = 60
+SIM_DT = 1.0 / FPS  # 固定逻辑步长（秒），与渲染帧率无关
 
 class ObjectType(Enum):
     """地图物体类型"""
@@ -21,6 +22,12 @@ class GameConfig:
     # 基础设置
     num_factions: int = 6
     map_objects_count: int = 50
+    world_width: int = SCREEN_WIDTH  # 战场大小，可以远大于窗口，由相机平移缩放查看
+    world_height: int = SCREEN_HEIGHT
+    use_fleet_arrays: bool = False  # 使用NumPy数组批量计算舰船运动
+    dirty_rect_rendering: bool = False  # 无屏幕震动时只重绘变化的区域
+    stats_panel_refresh_hz: float = 5.0  # 统计面板数值的最高刷新频率，0表示每帧刷新
+    quality_frame_budget_ms: float = 15.0  # 每帧耗时超出此预算时自动降低粒子、尾迹、星空和光晕等视觉效果，0表示关闭
     
     # 核心设置
     core_radius: float = 30.0
@@ -29,6 +36,7 @@ class GameConfig:
     core_spawn_ships_interval: int = 120
     core_max_ships: int = 35
     core_health: float = 1500.0
+    core_spacing: float = 350.0  # 核心之间的最小初始距离
     
     # 舰船设置
     ship_length: float = 24.0
@@ -42,9 +50,16 @@ class GameConfig:
     ship_attack_cooldown: int = 50
     ship_turn_rate: float = 3.8
     ship_retreat_heal_rate: float = 12.0
+    ship_ai_interval: int = 6  # 舰船每隔多少帧重新选择目标（各舰船错开在不同帧），1表示每帧
+    ship_sprite_angles: int = 64  # 舰船精灵预先旋转的朝向数，0表示逐帧绘制多边形
     
     # 物理设置
     gravity_strength: float = 120.0
+    # 核心数达到此值时用向量化批量计算引力，低于时逐对循环；两者都按帧初位置计算（任何核心移动之前），
+    # 结果只相差浮点舍入。Barnes–Hut 近似另有误差，随 barnes_hut_theta 增大
+    core_batch_gravity_threshold: int = 16
+    core_barnes_hut_threshold: int = 2048  # 核心数达到此值时改用 Barnes–Hut 近似
+    barnes_hut_theta: float = 0.5  # Barnes–Hut 开角，越小越精确
     friction: float = 0.98
     boundary_bounce: float = 0.85
     
@@ -52,4 +67,10 @@ class GameConfig:
     obstacle_size_range: Tuple[float, float] = (35.0, 90.0)
     resource_size_range: Tuple[float, float] = (18.0, 35.0)
     buff_size_range: Tuple[float, float] = (12.0, 18.0)
-    debuff_size_range: Tuple[float, float] = (12.0, 18.0)
\ No newline at end of file
+    debuff_size_range: Tuple[float, float] = (12.0, 18.0)
+    # 地图物体之间的最小中心距离，两类物体之间取两者中的较大值
+    obstacle_spacing: float = 120.0
+    resource_spacing: float = 120.0
+    buff_spacing: float = 120.0
+    debuff_spacing: float = 120.0
+    core_exclusion_radius: float = 180.0  # 地图物体与核心的最小距离
@@ -1,8 +1,8 @@
 """实体模块初始化"""
 from .core import Core
 from .ship import Ship
-from .projectile import Projectile
-from .explosion import Explosion
+from .projectile import ProjectileSystem, ProjectileFrame
+from .particle_system import ParticleSystem
 from .map_object import MapObject
 
-__all__ = ['Core', 'Ship', 'Projectile', 'Explosion', 'MapObject']
\ No newline at end of file
+__all__ = ['Core', 'Ship', 'ProjectileSystem', 'ProjectileFrame', 'ParticleSystem', 'MapObject']
\ No newline at end of file
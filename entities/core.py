@@ -2,29 +2,36 @@
 import pygame
 import math
 import random
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 from utils.vector2 import Vector2
 from utils.colors import *
-from config import GameConfig, SCREEN_WIDTH, SCREEN_HEIGHT
+from utils.sprite_cache import draw_alpha_circle
+from utils.roster import Roster
+from utils.quality import render_quality
+from config import GameConfig, ObjectType, FPS, SIM_DT
 
 if TYPE_CHECKING:
     from entities.ship import Ship
     from entities.map_object import MapObject
     from game.simulator import SpaceWarSimulator
+    from game.core_physics import ObstacleIndex
 
 class Core:
     """阵营核心基地"""
     
-    def __init__(self, pos: Vector2, faction_id: int, config: GameConfig):
+    def __init__(self, pos: Vector2, faction_id: int, config: GameConfig, rng: random.Random):
         self.pos = pos
+        self.rng = rng
         self.velocity = Vector2(
-            random.uniform(-config.core_initial_velocity_range[0], config.core_initial_velocity_range[1]),
-            random.uniform(-config.core_initial_velocity_range[0], config.core_initial_velocity_range[1])
+            rng.uniform(-config.core_initial_velocity_range[0], config.core_initial_velocity_range[1]),
+            rng.uniform(-config.core_initial_velocity_range[0], config.core_initial_velocity_range[1])
         )
         self.faction_id = faction_id
+        self.color = faction_color(faction_id)
         self.radius = config.core_radius
         self.mass = config.core_mass
-        self.ships: List['Ship'] = []
+        self.ships: Roster['Ship'] = Roster()  # 挂接在 simulator.factions.ships 下
+        self.ships_built = 0
         self.spawn_timer = 0
         self.max_ships = config.core_max_ships
         self.spawn_interval = config.core_spawn_ships_interval
@@ -33,6 +40,7 @@ class Core:
         self.resources = 100.0
         self.ship_production_cost = 25.0
         self.damage_flash_timer = 0
+        self.prev_pos = None  # 上一逻辑帧的位置，用于插值绘制
         
         # 护盾系统
         self.shield_energy = 100.0
@@ -44,65 +52,92 @@ class Core:
         self.total_damage_dealt = 0.0
         self.total_damage_taken = 0.0
         
-    def update(self, config: GameConfig, map_objects: List['MapObject'], other_cores: List['Core']):
-        """更新核心状态"""
+    def update(self, config: GameConfig, map_objects: List['MapObject'], other_cores: List['Core'],
+               dt: float = SIM_DT, gravity: Optional[Tuple[float, float]] = None,
+               obstacle_index: Optional['ObstacleIndex'] = None):
+        """更新核心状态，gravity为模拟器批量算好的引力合力（None时逐对计算）"""
         if self.health <= 0:
             return
             
-        self._apply_physics(config, map_objects, other_cores)
+        self._apply_physics(config, map_objects, other_cores, dt, gravity, obstacle_index)
         self._handle_boundaries(config)
-        self._update_systems()
+        self._update_systems(dt)
         self._try_spawn_ship(config)
         
-    def _apply_physics(self, config: GameConfig, map_objects: List['MapObject'], other_cores: List['Core']):
+    def _apply_physics(self, config: GameConfig, map_objects: List['MapObject'], other_cores: List['Core'],
+                       dt: float, gravity: Optional[Tuple[float, float]] = None,
+                       obstacle_index: Optional['ObstacleIndex'] = None):
         """应用物理效果"""
-        forces = Vector2(0, 0)
+        fx, fy = self._gravity_force(config, other_cores) if gravity is None else gravity
+        px, py = self.pos.x, self.pos.y
         
-        # 核心间的引力
-        for other in other_cores:
-            if other != self and other.health > 0:
-                direction = other.pos - self.pos
-                dist = max(direction.magnitude(), 1.0)
-                force_magnitude = (config.gravity_strength * self.mass * other.mass) / (dist * dist)
-                forces += direction.normalized() * force_magnitude
-                
         # 障碍物排斥力
-        for obj in map_objects:
-            if obj.type.value == "obstacle":
-                direction = self.pos - obj.pos
-                dist = max(direction.magnitude(), 1.0)
-                if dist < self.radius + obj.size + 60:
-                    forces += direction.normalized() * (6000.0 / (dist * dist))
+        if obstacle_index is not None:
+            obstacles = obstacle_index.near(self.pos, self.radius + 60)
+        else:
+            obstacles = [obj for obj in map_objects if obj.type == ObjectType.OBSTACLE]
+        for obj in obstacles:
+            dx = px - obj.pos.x
+            dy = py - obj.pos.y
+            mag = math.sqrt(dx * dx + dy * dy)
+            dist = max(mag, 1.0)
+            if dist < self.radius + obj.size + 60 and mag != 0:
+                repulsion = 6000.0 / (dist * dist)
+                fx += dx / mag * repulsion
+                fy += dy / mag * repulsion
                     
         # 更新速度和位置
-        self.velocity = (self.velocity + (forces / self.mass) / 60) * config.friction
+        damping = config.friction ** (dt * FPS)
+        velocity = self.velocity
+        velocity.x = (velocity.x + (fx / self.mass) * dt) * damping
+        velocity.y = (velocity.y + (fy / self.mass) * dt) * damping
         
-        if self.velocity.magnitude() > 120.0:
-            self.velocity = self.velocity.normalized() * 120.0
+        speed = velocity.magnitude()
+        if speed > 120.0:
+            velocity.x = velocity.x / speed * 120.0
+            velocity.y = velocity.y / speed * 120.0
             
-        self.pos += self.velocity / 60
+        self.pos.x += velocity.x * dt
+        self.pos.y += velocity.y * dt
+        
+    def _gravity_force(self, config: GameConfig, other_cores: List['Core']) -> Tuple[float, float]:
+        """逐对计算其他核心的引力合力"""
+        fx = fy = 0.0
+        px, py = self.pos.x, self.pos.y
+        for other in other_cores:
+            if other != self and other.health > 0:
+                dx = other.pos.x - px
+                dy = other.pos.y - py
+                mag = math.sqrt(dx * dx + dy * dy)
+                if mag == 0:
+                    continue
+                dist = max(mag, 1.0)
+                force_magnitude = (config.gravity_strength * self.mass * other.mass) / (dist * dist)
+                fx += dx / mag * force_magnitude
+                fy += dy / mag * force_magnitude
+        return fx, fy
         
     def _handle_boundaries(self, config: GameConfig):
         """处理边界碰撞"""
         if self.pos.x - self.radius < 0: 
             self.pos.x = self.radius
             self.velocity.x *= -config.boundary_bounce
-        elif self.pos.x + self.radius > SCREEN_WIDTH: 
-            self.pos.x = SCREEN_WIDTH - self.radius
+        elif self.pos.x + self.radius > config.world_width: 
+            self.pos.x = config.world_width - self.radius
             self.velocity.x *= -config.boundary_bounce
             
         if self.pos.y - self.radius < 0: 
             self.pos.y = self.radius
             self.velocity.y *= -config.boundary_bounce
-        elif self.pos.y + self.radius > SCREEN_HEIGHT: 
-            self.pos.y = SCREEN_HEIGHT - self.radius
+        elif self.pos.y + self.radius > config.world_height: 
+            self.pos.y = config.world_height - self.radius
             self.velocity.y *= -config.boundary_bounce
             
-    def _update_systems(self):
+    def _update_systems(self, dt: float):
         """更新系统状态"""
         # 护盾充能
         if self.shield_energy < self.max_shield:
-            self.shield_energy = min(self.max_shield, self.shield_energy + self.shield_recharge_rate / 60)
+            self.shield_energy = min(self.max_shield, self.shield_energy + self.shield_recharge_rate * dt)
         
         # 资源增长
         self.resources = min(self.resources + 0.15, 250.0)
@@ -123,9 +158,11 @@ class Core:
     def spawn_ship(self, config: GameConfig):
         """生产新舰船"""
         from entities.ship import Ship
-        angle = random.uniform(0, 2 * math.pi)
+        angle = self.rng.uniform(0, 2 * math.pi)
         spawn_pos = self.pos + Vector2(math.cos(angle), math.sin(angle)) * (self.radius + 40)
-        self.ships.append(Ship(spawn_pos, self.faction_id, config))
+        ship_id = (self.faction_id << 20) | self.ships_built
+        self.ships_built += 1
+        self.ships.add(Ship(spawn_pos, self.faction_id, config, self.rng, ship_id))
         
     def take_damage(self, damage: float, simulator: 'SpaceWarSimulator'):
         """受到伤害"""
@@ -145,78 +182,83 @@ class Core:
         # 核心被摧毁
         if self.health <= 0:
             self.health = 0
+            for ship in self.ships:
+                simulator.ship_grid.remove(ship)  # 离场的舰船不再被本帧后续的目标搜索选中
             self.ships.clear()
             self._create_destruction_effect(simulator)
             
     def _create_destruction_effect(self, simulator: 'SpaceWarSimulator'):
         """创建摧毁特效"""
-        from entities.explosion import Explosion
-        color = FACTION_COLORS[self.faction_id % len(FACTION_COLORS)]
-        explosion = Explosion(
+        simulator.spawn_explosion(
             self.pos, 
-            color, 
+            self.color, 
             num_particles=300, 
             particle_size_range=(5, 15), 
             duration_range=(120, 240)
         )
-        simulator.effects.append(explosion)
         simulator.screen_shake = 15
         
-    def draw(self, screen):
-        """绘制核心"""
+    def draw(self, screen, at: Optional[Tuple[float, float]] = None):
+        """绘制核心，at为绘制位置（屏幕坐标），默认为核心自身的位置"""
         if self.health <= 0:
             return
+        x, y = at or (self.pos.x, self.pos.y)
             
-        color = FACTION_COLORS[self.faction_id % len(FACTION_COLORS)]
+        color = self.color
         
         # 绘制护盾
-        self._draw_shield(screen)
+        self._draw_shield(screen, x, y)
         
         # 脉冲效果
-        self._draw_pulse_effect(screen, color)
+        if render_quality.glow_layers >= 1:
+            self._draw_pulse_effect(screen, x, y, color)
         
         # 主体核心
-        self._draw_core_body(screen, color)
+        self._draw_core_body(screen, x, y, color)
         
         # 状态条
-        self._draw_status_bars(screen)
+        self._draw_status_bars(screen, x, y)
         
-    def _draw_shield(self, screen):
+    def draw_bounds(self, at: Optional[Tuple[float, float]] = None) -> pygame.Rect:
+        """在at处绘制时内容（脉冲光晕和上方状态条）的屏幕范围"""
+        x, y = at or (self.pos.x, self.pos.y)
+        half_width = max(self.radius * 1.4, 52) + 2
+        top = y - self.radius - 53
+        return pygame.Rect(int(x - half_width), int(top),
+                           int(half_width * 2) + 1, int(y + self.radius * 1.4 - top) + 3)
+        
+    def _draw_shield(self, screen, x, y):
         """绘制护盾效果"""
         if self.shield_energy > 0:
             shield_alpha = int(120 * (self.shield_energy / self.max_shield))
             shield_radius = self.radius + 8
-            shield_surface = pygame.Surface((shield_radius * 2, shield_radius * 2), pygame.SRCALPHA)
             shield_color = (100, 200, 255, shield_alpha)
-            pygame.draw.circle(shield_surface, shield_color, (shield_radius, shield_radius), shield_radius, 3)
-            screen.blit(shield_surface, (self.pos.x - shield_radius, self.pos.y - shield_radius))
+            draw_alpha_circle(screen, shield_color, (x, y), shield_radius, 3)
     
-    def _draw_pulse_effect(self, screen, color):
+    def _draw_pulse_effect(self, screen, x, y, color):
         """绘制脉冲效果"""
         pulse_alpha = (math.sin(pygame.time.get_ticks() * 0.003) + 1) / 2 * 80 + 40
         pulse_radius = self.radius * 1.4
-        pulse_surface = pygame.Surface((pulse_radius * 2, pulse_radius * 2), pygame.SRCALPHA)
         pulse_color = (color[0], color[1], color[2], int(pulse_alpha))
-        pygame.draw.circle(pulse_surface, pulse_color, (pulse_radius, pulse_radius), pulse_radius)
-        screen.blit(pulse_surface, (self.pos.x - pulse_radius, self.pos.y - pulse_radius))
+        draw_alpha_circle(screen, pulse_color, (x, y), pulse_radius)
     
-    def _draw_core_body(self, screen, color):
+    def _draw_core_body(self, screen, x, y, color):
         """绘制核心主体"""
         final_color = WHITE if self.damage_flash_timer > 0 else color
-        pygame.draw.circle(screen, final_color, (int(self.pos.x), int(self.pos.y)), int(self.radius))
-        pygame.draw.circle(screen, WHITE, (int(self.pos.x), int(self.pos.y)), int(self.radius), 4)
+        pygame.draw.circle(screen, final_color, (int(x), int(y)), int(self.radius))
+        pygame.draw.circle(screen, WHITE, (int(x), int(y)), int(self.radius), 4)
         
         # 内部发光环
+        if render_quality.glow_layers < 2:
+            return
         inner_radius = int(self.radius * 0.7)
-        inner_surface = pygame.Surface((inner_radius * 2, inner_radius * 2), pygame.SRCALPHA)
         inner_color = (255, 255, 255, 150)
-        pygame.draw.circle(inner_surface, inner_color, (inner_radius, inner_radius), inner_radius)
-        screen.blit(inner_surface, (int(self.pos.x - inner_radius), int(self.pos.y - inner_radius)))
+        draw_alpha_circle(screen, inner_color, (int(x), int(y)), inner_radius)
     
-    def _draw_status_bars(self, screen):
+    def _draw_status_bars(self, screen, x, y):
         """绘制状态条"""
         bar_width, bar_height = 100, 12
-        bar_x, bar_y = self.pos.x - bar_width // 2, self.pos.y - self.radius - 35
+        bar_x, bar_y = x - bar_width // 2, y - self.radius - 35
         
         # 血量条背景和前景
         pygame.draw.rect(screen, (40, 40, 40), (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4))
@@ -2,27 +2,30 @@
 import pygame
 import random
 import math
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from utils.vector2 import Vector2
 from utils.colors import *
-from config import ObjectType
+from utils.sprite_cache import draw_alpha_circle
+from utils.quality import render_quality
+from config import ObjectType, SIM_DT
 
 class MapObject:
     """地图上的物体（障碍物、资源、增益/减益道具）"""
     
-    def __init__(self, pos: Vector2, size: float, obj_type: ObjectType):
+    def __init__(self, pos: Vector2, size: float, obj_type: ObjectType, rng: random.Random):
         self.pos = pos
         self.size = size
         self.type = obj_type
         self.active = True
-        self.animation_timer = random.uniform(0, 2 * math.pi)
+        self.index = 0  # 在模拟器地图物体列表中的位置，重建空间索引时写入
+        self.animation_timer = rng.uniform(0, 2 * math.pi)
         
         # 根据类型设置属性
         self._setup_type_attributes()
         
         # 为障碍物创建形状
         if obj_type == ObjectType.OBSTACLE: 
-            self.shape_points = self._create_asteroid_shape()
+            self.shape_points = self._create_asteroid_shape(rng)
             
     def _setup_type_attributes(self):
         """根据类型设置属性"""
@@ -35,41 +38,61 @@ class MapObject:
             self.effect_value = 0.4
             self.effect_duration = 240
             
-    def _create_asteroid_shape(self) -> List[Tuple[float, float]]:
+    def _create_asteroid_shape(self, rng: random.Random) -> List[Tuple[float, float]]:
         """创建小行星形状"""
         points = []
-        num_vertices = random.randint(8, 14)
+        num_vertices = rng.randint(8, 14)
         for i in range(num_vertices):
             angle = (i / num_vertices) * 2 * math.pi
-            dist = self.size * random.uniform(0.7, 1.3)
+            dist = self.size * rng.uniform(0.7, 1.3)
             points.append((
                 self.pos.x + math.cos(angle) * dist, 
                 self.pos.y + math.sin(angle) * dist
             ))
         return points
         
-    def update(self):
+    def update(self, dt: float = SIM_DT):
         """更新动画"""
-        self.animation_timer += 0.02
+        self.animation_timer += 1.2 * dt
         
-    def draw(self, screen):
-        """绘制地图物体"""
+    def draw(self, screen, at: Optional[Tuple[float, float]] = None):
+        """绘制地图物体，at为绘制位置（屏幕坐标），默认为物体自身的位置"""
+        x, y = at or (self.pos.x, self.pos.y)
         if self.type == ObjectType.OBSTACLE:
-            self._draw_asteroid(screen)
+            self._draw_asteroid(screen, self._shape_at(x, y))
         else:
-            self._draw_interactive_object(screen)
+            self._draw_interactive_object(screen, x, y)
             
-    def _draw_asteroid(self, screen):
+    def draw_bounds(self, at: Optional[Tuple[float, float]] = None) -> pygame.Rect:
+        """在at处绘制时内容（小行星外形或可交互物体的发光）的屏幕范围"""
+        x, y = at or (self.pos.x, self.pos.y)
+        if self.type == ObjectType.OBSTACLE:
+            points = self._shape_at(x, y)
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            left, top = int(min(xs)) - 3, int(min(ys)) - 3
+            return pygame.Rect(left, top, int(max(xs)) + 6 - left, int(max(ys)) + 6 - top)
+        radius = int(self.size * 1.8) + 2
+        return pygame.Rect(int(x) - radius, int(y) - radius, radius * 2 + 1, radius * 2 + 1)
+        
+    def _shape_at(self, x: float, y: float) -> List[Tuple[float, float]]:
+        """平移到 (x, y) 处的小行星外形（外形保持原始大小）"""
+        dx, dy = x - self.pos.x, y - self.pos.y
+        if dx == 0 and dy == 0:
+            return self.shape_points
+        return [(px + dx, py + dy) for px, py in self.shape_points]
+        
+    def _draw_asteroid(self, screen, points):
         """绘制小行星"""
         # 阴影
-        shadow_points = [(p[0] + 2, p[1] + 2) for p in self.shape_points]
+        shadow_points = [(p[0] + 2, p[1] + 2) for p in points]
         pygame.draw.polygon(screen, (30, 30, 30), shadow_points)
         
         # 主体
-        pygame.draw.polygon(screen, GRAY, self.shape_points)
-        pygame.draw.polygon(screen, LIGHT_GRAY, self.shape_points, 3)
+        pygame.draw.polygon(screen, GRAY, points)
+        pygame.draw.polygon(screen, LIGHT_GRAY, points, 3)
         
-    def _draw_interactive_object(self, screen):
+    def _draw_interactive_object(self, screen, x, y):
         """绘制可交互物体"""
         color_map = {
             ObjectType.RESOURCE: (GREEN, (0, 255, 100)),
@@ -80,30 +103,29 @@ class MapObject:
         
         # 动态发光效果
         pulse = math.sin(self.animation_timer) * 0.3 + 0.7
-        self._draw_glow_effect(screen, glow_color, pulse)
-        self._draw_main_body(screen, color, pulse)
-        self._draw_inner_glow(screen, pulse)
+        glow_layers = render_quality.glow_layers
+        if glow_layers >= 1:
+            self._draw_glow_effect(screen, x, y, glow_color, pulse)
+        self._draw_main_body(screen, x, y, color, pulse)
+        if glow_layers >= 2:
+            self._draw_inner_glow(screen, x, y, pulse)
         
-    def _draw_glow_effect(self, screen, glow_color, pulse):
+    def _draw_glow_effect(self, screen, x, y, glow_color, pulse):
         """绘制发光效果"""
         glow_radius = int(self.size * 1.8 * pulse)
         glow_alpha = int(80 * pulse)
         
-        glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
         glow_color_with_alpha = (glow_color[0], glow_color[1], glow_color[2], glow_alpha)
-        pygame.draw.circle(glow_surface, glow_color_with_alpha, (glow_radius, glow_radius), glow_radius)
-        screen.blit(glow_surface, (int(self.pos.x - glow_radius), int(self.pos.y - glow_radius)))
+        draw_alpha_circle(screen, glow_color_with_alpha, (int(x), int(y)), glow_radius)
         
-    def _draw_main_body(self, screen, color, pulse):
+    def _draw_main_body(self, screen, x, y, color, pulse):
         """绘制主体"""
-        pygame.draw.circle(screen, color, (int(self.pos.x), int(self.pos.y)), int(self.size))
-        pygame.draw.circle(screen, WHITE, (int(self.pos.x), int(self.pos.y)), int(self.size), 2)
+        pygame.draw.circle(screen, color, (int(x), int(y)), int(self.size))
+        pygame.draw.circle(screen, WHITE, (int(x), int(y)), int(self.size), 2)
         
-    def _draw_inner_glow(self, screen, pulse):
+    def _draw_inner_glow(self, screen, x, y, pulse):
         """绘制内部发光"""
         inner_size = int(self.size * 0.6)
         inner_alpha = int(150 * pulse)
-        inner_surface = pygame.Surface((inner_size * 2, inner_size * 2), pygame.SRCALPHA)
         inner_color = (255, 255, 255, inner_alpha)
-        pygame.draw.circle(inner_surface, inner_color, (inner_size, inner_size), inner_size)
-        screen.blit(inner_surface, (int(self.pos.x - inner_size), int(self.pos.y - inner_size)))
\ No newline at end of file
+        draw_alpha_circle(screen, inner_color, (int(x), int(y)), inner_size)
\ No newline at end of file
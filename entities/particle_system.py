@@ -0,0 +1,161 @@
+"""全局粒子系统"""
+import math
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+import pygame
+
+from utils.vector2 import Vector2
+from utils.sprite_cache import sprite_cache
+from config import FPS, SIM_DT
+
+class ParticleSystem:
+    """以预分配数组保存所有存活粒子，每帧一次向量化更新
+
+    粒子过期时用末尾的存活粒子填补空位，存活粒子始终连续存放在 [0, count)。
+    """
+
+    DRAG = 0.96          # 每1/60秒的速度衰减
+    FADE_FRAMES = 120    # 寿命达到该帧数时完全不透明
+    COLOR_STEP = 16      # 粒子颜色量化步长
+
+    def __init__(self, capacity: int = 4096, seed: Optional[int] = None):
+        self.count = 0
+        self.capacity = 0
+        self.grows = 0  # 初次分配之后的扩容次数，稳态下应不再增长
+        self.rng = np.random.default_rng(seed)
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """分配（或扩容）粒子数组，保留已有粒子"""
+        n = self.count
+        pos = np.zeros((capacity, 2))
+        velocity = np.zeros((capacity, 2))
+        size = np.zeros(capacity)
+        lifetime = np.zeros(capacity, dtype=np.int32)
+        color = np.zeros((capacity, 3), dtype=np.uint8)
+        if self.capacity:
+            self.grows += 1
+            pos[:n] = self.pos[:n]
+            velocity[:n] = self.velocity[:n]
+            size[:n] = self.size[:n]
+            lifetime[:n] = self.lifetime[:n]
+            color[:n] = self.color[:n]
+        self.pos, self.velocity, self.size, self.lifetime, self.color = pos, velocity, size, lifetime, color
+        self.capacity = capacity
+
+    def stats(self) -> Dict[str, int]:
+        """数组占用和扩容次数，供 SpaceWarSimulator.pool_stats() 和性能分析叠加层使用"""
+        return {"live": self.count, "capacity": self.capacity, "grows": self.grows}
+
+    def emit(self, pos: Vector2, color: Tuple[int, int, int], num_particles: int,
+             particle_size_range: Tuple[float, float], duration_range: Tuple[int, int]):
+        """在pos处向四周喷射一批粒子"""
+        self._emit((pos.x, pos.y), np.asarray(color[:3]), num_particles, particle_size_range, duration_range)
+
+    def emit_many(self, positions: np.ndarray, colors: np.ndarray, num_particles: int,
+                  particle_size_range: Tuple[float, float], duration_range: Tuple[int, int]):
+        """在多处同时喷射粒子：positions为 (k, 2)，colors为 (k, 3)，每处num_particles个"""
+        self._emit(np.repeat(positions, num_particles, axis=0), np.repeat(colors[:, :3], num_particles, axis=0),
+                   len(positions) * num_particles, particle_size_range, duration_range)
+
+    def _emit(self, pos, color, num_particles: int,
+              particle_size_range: Tuple[float, float], duration_range: Tuple[int, int]):
+        """写入num_particles个新粒子，pos和color可以是单个值或逐粒子的数组"""
+        if num_particles <= 0:
+            return
+        start = self.count
+        end = start + num_particles
+        if end > self.capacity:
+            self._allocate(max(end, self.capacity * 2))
+
+        rng = self.rng
+        angle = rng.uniform(0, 2 * math.pi, num_particles)
+        speed = rng.uniform(20, 150, num_particles)
+
+        self.pos[start:end] = pos
+        self.velocity[start:end, 0] = np.cos(angle) * speed
+        self.velocity[start:end, 1] = np.sin(angle) * speed
+        self.size[start:end] = rng.uniform(particle_size_range[0], particle_size_range[1], num_particles)
+        self.lifetime[start:end] = rng.integers(duration_range[0], duration_range[1], num_particles, endpoint=True)
+
+        # 颜色变化，量化到COLOR_STEP以便共用精灵缓存
+        jitter = rng.integers(-30, 30, (num_particles, 3), endpoint=True)
+        varied = np.clip(color + jitter, 0, 255)
+        self.color[start:end] = np.minimum(np.round(varied / self.COLOR_STEP) * self.COLOR_STEP, 255)
+        self.count = end
+
+    def update(self, dt: float = SIM_DT):
+        """更新所有粒子并压缩掉过期粒子"""
+        n = self.count
+        if n == 0:
+            return
+
+        self.pos[:n] += self.velocity[:n] * dt
+        self.velocity[:n] *= self.DRAG ** (dt * FPS)  # 阻力
+        self.lifetime[:n] -= 1
+
+        dead = np.flatnonzero(self.lifetime[:n] <= 0)
+        if dead.size == 0:
+            return
+
+        # 用尾部存活粒子填补前部空位
+        alive_count = n - dead.size
+        holes = dead[dead < alive_count]
+        if holes.size:
+            movers = np.flatnonzero(self.lifetime[alive_count:n] > 0) + alive_count
+            self.pos[holes] = self.pos[movers]
+            self.velocity[holes] = self.velocity[movers]
+            self.size[holes] = self.size[movers]
+            self.lifetime[holes] = self.lifetime[movers]
+            self.color[holes] = self.color[movers]
+        self.count = alive_count
+
+    def clear(self):
+        """清除所有粒子"""
+        self.count = 0
+
+    def _visible(self, view) -> Tuple[np.ndarray, object]:
+        """粒子的屏幕坐标和可见粒子的下标
+        
+        view为 (x, y, zoom, 宽, 高) 形式的视口，None表示屏幕坐标即世界坐标且全部绘制。
+        缩放只作用于位置，粒子保持原始大小。
+        """
+        n = self.count
+        if view is None:
+            return self.pos[:n], slice(0, n)
+        x, y, zoom, width, height = view
+        screen_pos = (self.pos[:n] - (x, y)) * zoom
+        size = self.size[:n]
+        inside = ((screen_pos[:, 0] > -size) & (screen_pos[:, 0] < width + size) &
+                  (screen_pos[:, 1] > -size) & (screen_pos[:, 1] < height + size))
+        index = np.flatnonzero(inside)
+        return screen_pos[index], index
+
+    def draw_bounds(self, cell_size: int = 64, view=None) -> List[pygame.Rect]:
+        """存活粒子覆盖的屏幕范围，按cell_size网格合并为若干矩形"""
+        pos, index = self._visible(view)
+        if len(pos) == 0:
+            return []
+        margin = int(self.size[index].max()) + 2
+        cells = np.unique((pos // cell_size).astype(np.int64), axis=0)
+        return [pygame.Rect(cx * cell_size - margin, cy * cell_size - margin,
+                            cell_size + 2 * margin, cell_size + 2 * margin)
+                for cx, cy in cells.tolist()]
+
+    def draw(self, screen, view=None):
+        """绘制视口内的粒子"""
+        pos, index = self._visible(view)
+        if len(pos) == 0:
+            return
+
+        size = self.size[index]
+        alpha = np.clip(255 * self.lifetime[index] / self.FADE_FRAMES, 0, 255).astype(np.int32)
+        size_int = np.maximum(1, size.astype(np.int32))
+        top_left = (pos - size[:, None]).astype(np.int32)
+
+        for color, a, s, position in zip(self.color[index].tolist(), alpha.tolist(),
+                                         size_int.tolist(), top_left.tolist()):
+            sprite = sprite_cache.circle(s, color)
+            sprite.set_alpha(a)
+            screen.blit(sprite, position)
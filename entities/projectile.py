@@ -1,73 +1,278 @@
-"""子弹类"""
+"""子弹系统"""
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
 import pygame
-import math
-from typing import Union, Tuple, List, TYPE_CHECKING
+
 from utils.vector2 import Vector2
-from utils.colors import *
-from config import FPS
+from utils.sprite_cache import draw_alpha_circle
+from utils.quality import render_quality
+from config import FPS, SIM_DT
 
 if TYPE_CHECKING:
     from entities.ship import Ship
     from entities.core import Core
     from game.simulator import SpaceWarSimulator
 
-class Projectile:
-    """子弹类"""
-    
-    def __init__(self, pos: Vector2, target: Union['Ship', 'Core'], 
-                 damage: float, color: Tuple[int, int, int]):
-        self.pos = pos
-        self.target = target
-        self.damage = damage
-        self.color = color
-        self.speed = 600.0
-        direction = (target.pos - pos).normalized()
-        self.velocity = direction * self.speed
-        self.lifetime = 2.8 * FPS
-        self.trail_positions = [Vector2(pos.x, pos.y) for _ in range(5)]
-        
-    def update(self, simulator: 'SpaceWarSimulator'):
-        """更新子弹状态"""
-        self.pos += self.velocity / FPS
-        self.lifetime -= 1
-        
-        # 更新尾迹
-        self.trail_positions.append(Vector2(self.pos.x, self.pos.y))
-        if len(self.trail_positions) > 8:
-            self.trail_positions.pop(0)
-        
+class ProjectileFrame(NamedTuple):
+    """本帧要绘制的子弹在屏幕上的位置"""
+    pos: np.ndarray       # (k, 2) 弹丸位置
+    trail: np.ndarray     # (k, TRAIL_LENGTH, 2) 尾迹点，从旧到新
+    counts: np.ndarray    # (k,) 有效尾迹点数
+    colors: np.ndarray    # (k, 3)
+
+class ProjectileSystem:
+    """以预分配数组保存所有飞行中的子弹，每帧一次向量化推进和命中检测
+
+    尾迹是每枚子弹固定长度的环形缓冲；目标对象按编号存放，同一目标只读取一次位置。
+    失效子弹在清理阶段按原顺序压缩，存活子弹始终连续存放在 [0, count)。
+    """
+
+    SPEED = 600.0
+    LIFETIME = 2.8 * FPS
+    TRAIL_LENGTH = 8
+    INITIAL_TRAIL = 5     # 发射时尾迹点数（全部位于发射点）
+    HIT_RADIUS = 22
+
+    _ARRAYS = ("pos", "prev_pos", "velocity", "damage", "lifetime", "color",
+               "target_id", "trail", "trail_start", "trail_count")
+    STATE_FIELDS = ("pos", "velocity", "damage", "lifetime", "color", "trail", "trail_start", "trail_count")
+
+    # 尾迹点数 -> [(下标, 透明度, 半径)]，越新的点越亮越大
+    _TRAIL_STYLES = {
+        count: [(i, int(255 * (i / count) * 0.8), max(1, int(4 * (i / count)))) for i in range(1, count)]
+        for count in range(INITIAL_TRAIL, TRAIL_LENGTH + 1)
+    }
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.capacity = 0
+        self.grows = 0  # 初次分配之后的扩容次数，稳态下应不再增长
+        self._targets: List[Union['Ship', 'Core']] = []
+        self._target_ids: Dict[Union['Ship', 'Core'], int] = {}
+        self._allocate(capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _allocate(self, capacity: int):
+        """分配（或扩容）子弹数组，保留已有子弹"""
+        n = self.count
+        arrays = {
+            "pos": np.zeros((capacity, 2)),
+            "prev_pos": np.zeros((capacity, 2)),  # 上一逻辑帧的位置，NaN表示本帧刚发射
+            "velocity": np.zeros((capacity, 2)),
+            "damage": np.zeros(capacity),
+            "lifetime": np.zeros(capacity),
+            "color": np.zeros((capacity, 3), dtype=np.uint8),
+            "target_id": np.zeros(capacity, dtype=np.int64),
+            "trail": np.zeros((capacity, self.TRAIL_LENGTH, 2)),
+            "trail_start": np.zeros(capacity, dtype=np.int64),
+            "trail_count": np.zeros(capacity, dtype=np.int64),
+        }
+        if self.capacity:
+            self.grows += 1
+        for name, array in arrays.items():
+            if self.capacity:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def stats(self) -> Dict[str, int]:
+        """数组占用和扩容次数，供 SpaceWarSimulator.pool_stats() 和性能分析叠加层使用"""
+        return {"live": self.count, "capacity": self.capacity, "grows": self.grows}
+
+    def spawn(self, pos: Vector2, target: Union['Ship', 'Core'], damage: float, color: Tuple[int, int, int]):
+        """从pos向target发射一枚子弹"""
+        i = self.count
+        if i == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        velocity = Vector2(target.pos.x - pos.x, target.pos.y - pos.y)
+        velocity.normalize_ip()
+        velocity *= self.SPEED
+
+        self.pos[i] = (pos.x, pos.y)
+        self.prev_pos[i] = np.nan
+        self.velocity[i] = (velocity.x, velocity.y)
+        self.damage[i] = damage
+        self.lifetime[i] = self.LIFETIME
+        self.color[i] = color
+        self.target_id[i] = self._target_slot(target)
+        self.trail[i] = (pos.x, pos.y)
+        self.trail_start[i] = 0
+        self.trail_count[i] = self.INITIAL_TRAIL
+        self.count = i + 1
+
+    def update(self, simulator: 'SpaceWarSimulator', dt: float = SIM_DT):
+        """推进所有子弹并批量检测命中，伤害按子弹顺序依次结算"""
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.pos[:n]
+        pos += self.velocity[:n] * dt
+        lifetime = self.lifetime[:n]
+        lifetime -= 1
+        self._push_trail(n)
+
         # 屏幕震动
-        if self.lifetime < 5 and self.lifetime > 0:
+        if np.any((lifetime > 0) & (lifetime < 5)):
             simulator.screen_shake = 3
-            
-        if not self.target or self.target.health <= 0:
-            self.lifetime = 0
-            return
-            
-        # 碰撞检测
-        if self.pos.distance_to(self.target.pos) < 22:
-            self.target.take_damage(self.damage, simulator)
-            # 命中特效
-            from entities.explosion import Explosion
-            hit_effect = Explosion(self.pos, self.color, 25, (2, 5), (20, 40))
-            simulator.effects.append(hit_effect)
-            self.lifetime = 0
-            
-    def draw(self, screen):
-        """绘制子弹和尾迹"""
-        # 绘制能量尾迹
-        for i, trail_pos in enumerate(self.trail_positions):
-            if i > 0:
-                alpha = int(255 * (i / len(self.trail_positions)) * 0.8)
-                width = max(1, int(4 * (i / len(self.trail_positions))))
-                trail_color = (*self.color, alpha)
-                
-                trail_surface = pygame.Surface((width*2, width*2), pygame.SRCALPHA)
-                pygame.draw.circle(trail_surface, trail_color, (width, width), width)
-                screen.blit(trail_surface, (trail_pos.x - width, trail_pos.y - width))
-        
-        # 绘制主弹丸
-        glow_surface = pygame.Surface((16, 16), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (*self.color, 120), (8, 8), 8)
-        screen.blit(glow_surface, (self.pos.x - 8, self.pos.y - 8))
-        pygame.draw.circle(screen, self.color, (int(self.pos.x), int(self.pos.y)), 3)
\ No newline at end of file
+
+        # 每个目标只读取一次位置和存活状态
+        targets = self._targets
+        target_pos = np.array([(target.pos.x, target.pos.y) for target in targets]).reshape(-1, 2)
+        target_alive = np.array([target.health > 0 for target in targets], dtype=bool)
+        target_id = self.target_id[:n]
+
+        alive = target_alive[target_id]
+        lifetime[~alive] = 0
+        delta = target_pos[target_id] - pos
+        hit = alive & ((delta * delta).sum(axis=1) < self.HIT_RADIUS * self.HIT_RADIUS)
+        hits = np.flatnonzero(hit)
+        if hits.size:
+            self._resolve_hits(simulator, hits, target_id)
+
+    def _push_trail(self, n: int):
+        """把当前位置写入尾迹环形缓冲，满了覆盖最旧的点"""
+        start = self.trail_start[:n]
+        count = self.trail_count[:n]
+        self.trail[np.arange(n), (start + count) % self.TRAIL_LENGTH] = self.pos[:n]
+        full = count == self.TRAIL_LENGTH
+        start[full] = (start[full] + 1) % self.TRAIL_LENGTH
+        count[~full] += 1
+
+    def _resolve_hits(self, simulator: 'SpaceWarSimulator', hits: np.ndarray, target_id: np.ndarray):
+        """依次结算命中的子弹伤害，最后一次性产生全部命中特效
+
+        与逐枚更新等价：目标被前面的子弹摧毁后，同一目标后面的子弹不再造成伤害，
+        且本帧即失效。
+        """
+        n = self.count
+        targets = self._targets
+        lifetime = self.lifetime
+        killed_at = np.full(len(targets), n)  # 目标在第几枚子弹命中时被摧毁
+        struck = []
+        for i, tid, damage in zip(hits.tolist(), target_id[hits].tolist(), self.damage[hits].tolist()):
+            lifetime[i] = 0
+            target = targets[tid]
+            if target.health <= 0:
+                continue
+            target.take_damage(damage, simulator)
+            struck.append(i)
+            if target.health <= 0:
+                killed_at[tid] = i
+        lifetime[:n][killed_at[target_id] < np.arange(n)] = 0
+
+        # 命中特效
+        if struck:
+            simulator.spawn_explosions(self.pos[struck], self.color[struck], 25, (2, 5), (20, 40))
+
+    def compact(self):
+        """按原顺序移除失效子弹，并释放不再被引用的目标"""
+        n = self.count
+        keep = np.flatnonzero(self.lifetime[:n] > 0)
+        m = keep.size
+        if m < n:
+            for name in self._ARRAYS:
+                array = getattr(self, name)
+                array[:m] = array[keep]
+            self.count = m
+
+            used, remap = np.unique(self.target_id[:m], return_inverse=True)
+            self._targets = [self._targets[t] for t in used.tolist()]
+            self._target_ids = {target: i for i, target in enumerate(self._targets)}
+            self.target_id[:m] = remap
+
+    def get_state(self) -> Tuple[Dict[str, np.ndarray], List[Union['Ship', 'Core']]]:
+        """存活子弹各数组的副本和各自的目标，供快照使用"""
+        n = self.count
+        arrays = {name: getattr(self, name)[:n].copy() for name in self.STATE_FIELDS}
+        targets = self._targets
+        return arrays, [targets[t] for t in self.target_id[:n].tolist()]
+
+    def set_state(self, arrays: Dict[str, np.ndarray], targets: List[Union['Ship', 'Core']]):
+        """用 get_state() 格式的数据替换全部子弹"""
+        self.clear()
+        n = len(targets)
+        if n > self.capacity:
+            self._allocate(max(n, self.capacity * 2))
+        for name in self.STATE_FIELDS:
+            getattr(self, name)[:n] = arrays[name]
+        self.prev_pos[:n] = np.nan
+        self.target_id[:n] = [self._target_slot(target) for target in targets]
+        self.count = n
+
+    def _target_slot(self, target: Union['Ship', 'Core']) -> int:
+        """目标的编号，新目标追加到目标表末尾"""
+        target_id = self._target_ids.get(target)
+        if target_id is None:
+            target_id = self._target_ids[target] = len(self._targets)
+            self._targets.append(target)
+        return target_id
+
+    def clear(self):
+        """清除所有子弹"""
+        self.count = 0
+        self._targets = []
+        self._target_ids = {}
+
+    def snapshot_positions(self):
+        """记录逻辑帧开始前的位置，供插值绘制使用"""
+        n = self.count
+        self.prev_pos[:n] = self.pos[:n]
+
+    def select(self, rect: Optional[Tuple[float, float, float, float]] = None) -> np.ndarray:
+        """位置落在世界矩形 (left, top, right, bottom) 内的子弹下标，rect为None时为全部子弹"""
+        n = self.count
+        if rect is None:
+            return np.arange(n)
+        left, top, right, bottom = rect
+        x = self.pos[:n, 0]
+        y = self.pos[:n, 1]
+        return np.flatnonzero((x >= left) & (x <= right) & (y >= top) & (y <= bottom))
+
+    def frame(self, index: np.ndarray, alpha: float = 1.0, view=None) -> ProjectileFrame:
+        """index中的子弹在本帧的屏幕坐标
+
+        弹丸在前后两个逻辑帧之间插值，刚发射的子弹不插值；view与粒子系统相同，
+        为 (x, y, zoom, 宽, 高) 形式的视口，None表示屏幕坐标即世界坐标。
+        """
+        pos = self.pos[index]
+        if alpha < 1.0:
+            prev = self.prev_pos[index]
+            pos = np.where(np.isnan(prev), pos, prev + (pos - prev) * alpha)
+        slots = (self.trail_start[index, None] + np.arange(self.TRAIL_LENGTH)) % self.TRAIL_LENGTH
+        trail = self.trail[index[:, None], slots]
+        if view is not None:
+            x, y, zoom = view[:3]
+            pos = (pos - (x, y)) * zoom
+            trail = (trail - (x, y)) * zoom
+        return ProjectileFrame(pos, trail, self.trail_count[index], self.color[index])
+
+    @staticmethod
+    def draw_bounds(frame: ProjectileFrame) -> List[pygame.Rect]:
+        """每枚子弹的弹丸和尾迹的屏幕范围"""
+        if len(frame.pos) == 0:
+            return []
+        # 尾迹缓冲未满时空余的位置仍是发射点，不影响范围
+        low = np.minimum(frame.trail.min(axis=1), frame.pos).astype(np.int64) - 9
+        high = np.maximum(frame.trail.max(axis=1), frame.pos).astype(np.int64) + 10
+        return [pygame.Rect(left, top, right - left, bottom - top)
+                for (left, top), (right, bottom) in zip(low.tolist(), high.tolist())]
+
+    def draw(self, screen, frame: ProjectileFrame):
+        """绘制子弹和尾迹，尾迹最多画 render_quality.trail_points 个最新的点"""
+        limit = render_quality.trail_points
+        styles = {count: style[len(style) - min(limit, len(style)):] for count, style in self._TRAIL_STYLES.items()}
+        for (x, y), trail, count, color in zip(frame.pos.tolist(), frame.trail.tolist(),
+                                               frame.counts.tolist(), frame.colors.tolist()):
+            color = tuple(color)
+            # 绘制能量尾迹
+            for i, alpha, width in styles[count]:
+                draw_alpha_circle(screen, (*color, alpha), trail[i], width)
+
+            # 绘制主弹丸
+            draw_alpha_circle(screen, (*color, 120), (x, y), 8)
+            pygame.draw.circle(screen, color, (int(x), int(y)), 3)
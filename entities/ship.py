@@ -3,24 +3,35 @@ import pygame
 import math
 import random
 from typing import List, Optional, Union, Tuple, TYPE_CHECKING
-from utils.vector2 import Vector2
+from utils.vector2 import Vector2, nearest
 from utils.colors import *
-from config import GameConfig, SCREEN_WIDTH, SCREEN_HEIGHT
+from utils.sprite_cache import draw_alpha_circle
+from utils.rng import cosmetic_rng
+from utils.ship_sprites import ship_atlas
+from config import GameConfig, SIM_DT
 
 if TYPE_CHECKING:
     from entities.core import Core
     from entities.map_object import MapObject
     from game.simulator import SpaceWarSimulator
+    from utils.spatial_grid import SpatialHashGrid
 
 class Ship:
     """战斗舰船"""
     
-    def __init__(self, pos: Vector2, faction_id: int, config: GameConfig):
+    RETREAT_HEALTH_RATIO = 0.25  # 血量低于此比例时撤退
+    PICKUP_MARGIN = 15  # 舰船中心进入地图物体半径外这一距离内即拾取
+    
+    def __init__(self, pos: Vector2, faction_id: int, config: GameConfig, rng: random.Random,
+                 ship_id: int = 0):
         # 基础属性
         self.pos = pos
-        self.faction_id = faction_id
+        self.ship_id = ship_id
+        self.faction_id = faction_id  # 也是 simulator.factions 中的键
+        self.color = faction_color(faction_id)
+        self.rng = rng
         self.velocity = Vector2(0, 0)
-        self.angle = random.uniform(0, 2 * math.pi)
+        self.angle = rng.uniform(0, 2 * math.pi)
         
         # 物理属性
         self.length = config.ship_length
@@ -39,9 +50,10 @@ class Ship:
         # AI状态
         self.target: Optional[Union['Ship', 'Core']] = None
         self.state = "patrol"  # patrol, attack_ship, assault_core, retreat
-        self.patrol_center = pos
+        self.patrol_center = Vector2(pos.x, pos.y)
         self.patrol_radius = 180.0
-        self.patrol_target = pos
+        self.patrol_target = self.patrol_center
+        self.ai_due = True  # 下次更新时立即重新选择目标，不等轮到所在批次
         
         # 效果和状态
         self.buffs: List[Tuple[float, int]] = []
@@ -49,23 +61,47 @@ class Ship:
         self.damage_flash_timer = 0
         self.is_moving = False
         self.heal_particle_timer = 0
+        self.prev_pos = None  # 上一逻辑帧的位置，用于插值绘制
         
         # 统计数据
         self.kills = 0
         self.damage_dealt = 0.0
         
     def update(self, config: GameConfig, all_ships: List['Ship'], all_cores: List['Core'], 
-               map_objects: List['MapObject'], simulator: 'SpaceWarSimulator'):
+               map_objects: List['MapObject'], simulator: 'SpaceWarSimulator', dt: float = SIM_DT):
         """更新舰船状态"""
         if self.health <= 0: 
             return
 
         self._update_effects()
-        self._ai_behavior(all_ships, all_cores)
-        self._move(config, simulator)
-        self._handle_boundaries()
-        self._interact_with_objects(map_objects)
-        self._update_retreat_healing(config, simulator)
+        self._update_ai(config, all_ships, all_cores, simulator)
+        self._move(config, simulator, dt)
+        self._handle_boundaries(config)
+        simulator.ship_grid.relocate(self)
+        self._interact_with_objects(simulator)
+        self._update_retreat_healing(config, simulator, dt)
+        self._update_timers()
+        
+    def plan_move(self, config: GameConfig, all_ships: List['Ship'], all_cores: List['Core'],
+                  simulator: 'SpaceWarSimulator') -> Optional[Vector2]:
+        """数组后端第一阶段：更新效果和AI决策，返回本帧的目标位置"""
+        if self.health <= 0:
+            return None
+            
+        self._update_effects()
+        self._update_ai(config, all_ships, all_cores, simulator)
+        return self._get_target_position()
+        
+    def finish_move(self, config: GameConfig, map_objects: List['MapObject'], 
+                    simulator: 'SpaceWarSimulator', dt: float = SIM_DT):
+        """数组后端第二阶段：在批量运动积分之后执行攻击、交互和计时器"""
+        if self.health <= 0:
+            return
+            
+        self._try_attack(simulator)
+        simulator.ship_grid.relocate(self)
+        self._interact_with_objects(simulator)
+        self._update_retreat_healing(config, simulator, dt)
         self._update_timers()
         
     def _update_effects(self):
@@ -73,10 +109,30 @@ class Ship:
         self.buffs = [(e, d - 1) for e, d in self.buffs if d > 1]
         self.debuffs = [(e, d - 1) for e, d in self.debuffs if d > 1]
         
-    def _ai_behavior(self, all_ships: List['Ship'], all_cores: List['Core']):
+    def _update_ai(self, config: GameConfig, all_ships: List['Ship'], all_cores: List['Core'],
+                   simulator: 'SpaceWarSimulator'):
+        """需要时立即重新选择目标，否则按批次轮转定期寻找更好的目标
+        
+        当前目标失效、血量越过撤退线或被标记为 ai_due（如未交战时遭到攻击）时立即重新选择；
+        其余情况下舰船按 ship_id 分到 ship_ai_interval 个批次，每帧只有一个批次做完整的目标搜索。
+        """
+        urgent = (self.ai_due or self._target_lost(simulator)
+                  or (self.state == "retreat") != (self.health < self.max_health * self.RETREAT_HEALTH_RATIO))
+        interval = config.ship_ai_interval
+        if urgent or interval <= 1 or (simulator.tick + self.ship_id) % interval == 0:
+            self.ai_due = False
+            self._ai_behavior(all_ships, all_cores, simulator.ship_grid)
+            
+    def _target_lost(self, simulator: 'SpaceWarSimulator') -> bool:
+        """当前目标已被摧毁，或其阵营核心已被摧毁（核心被摧毁时舰船随之离场，但血量不变）"""
+        target = self.target
+        return target is not None and (target.health <= 0 or simulator.factions[target.faction_id].core.health <= 0)
+        
+    def _ai_behavior(self, all_ships: List['Ship'], all_cores: List['Core'],
+                     ship_grid: Optional['SpatialHashGrid'] = None):
         """AI行为逻辑"""
         # 低血量时撤退
-        if self.health < self.max_health * 0.25:
+        if self.health < self.max_health * self.RETREAT_HEALTH_RATIO:
             self.state = "retreat"
             self.target = None
             return
@@ -86,10 +142,14 @@ class Ship:
             self.target = None
 
         # 寻找最近的敌方舰船
-        closest_enemy_ship = self._find_closest_enemy_ship(all_ships)
+        engage_range = self.attack_range * 1.3
+        if ship_grid is not None:
+            closest_enemy_ship = ship_grid.nearest_enemy(self.pos, self.faction_id, engage_range)
+        else:
+            closest_enemy_ship = self._find_closest_enemy_ship(all_ships)
         if closest_enemy_ship:
             ship, distance = closest_enemy_ship
-            if distance <= self.attack_range * 1.3:
+            if distance <= engage_range:
                 self.target = ship
                 self.state = "attack_ship"
                 return
@@ -108,54 +168,49 @@ class Ship:
         
     def _find_closest_enemy_ship(self, all_ships: List['Ship']):
         """寻找最近的敌方舰船"""
-        closest_ship = None
-        closest_distance = float('inf')
-        
-        for ship in all_ships:
-            if ship.faction_id != self.faction_id and ship.health > 0:
-                distance = self.pos.distance_to(ship.pos)
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_ship = ship
-                    
-        return (closest_ship, closest_distance) if closest_ship else None
+        enemies = [ship for ship in all_ships if ship.faction_id != self.faction_id and ship.health > 0]
+        found = nearest(self.pos, [ship.pos for ship in enemies])
+        if found is None:
+            return None
+        index, distance_sq = found
+        return enemies[index], math.sqrt(distance_sq)
         
     def _find_closest_enemy_core(self, all_cores: List['Core']):
         """寻找最近的敌方核心"""
-        closest_core = None
-        closest_distance = float('inf')
-        
-        for core in all_cores:
-            if core.faction_id != self.faction_id and core.health > 0:
-                distance = self.pos.distance_to(core.pos)
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_core = core
-                    
-        return (closest_core, closest_distance) if closest_core else None
-        
-    def _move(self, config: GameConfig, simulator: 'SpaceWarSimulator'):
+        enemies = [core for core in all_cores if core.faction_id != self.faction_id and core.health > 0]
+        found = nearest(self.pos, [core.pos for core in enemies])
+        if found is None:
+            return None
+        index, distance_sq = found
+        return enemies[index], math.sqrt(distance_sq)
+        
+    def _move(self, config: GameConfig, simulator: 'SpaceWarSimulator', dt: float):
         """移动和转向逻辑"""
         target_pos = self._get_target_position()
         
         self.is_moving = False
         if target_pos:
-            self._turn_towards_target(target_pos, config)
+            self._turn_towards_target(target_pos, config, dt)
             
-            if self.pos.distance_to(target_pos) > 15:
+            if self.pos.distance_sq_to(target_pos) > 15 * 15:
                 self.is_moving = True
                 
             # 计算移动速度（考虑效果修正）
             speed_modifier = self._calculate_speed_modifier()
-            self.velocity = Vector2(math.cos(self.angle), math.sin(self.angle)) * self.speed * speed_modifier
+            self.velocity.set(math.cos(self.angle) * self.speed * speed_modifier,
+                              math.sin(self.angle) * self.speed * speed_modifier)
         else:
-            self.velocity = Vector2(0, 0)
+            self.velocity.set(0, 0)
             
         # 更新位置
         if self.is_moving:
-            self.pos += self.velocity / 60
+            self.pos.x += self.velocity.x * dt
+            self.pos.y += self.velocity.y * dt
+        
+        self._try_attack(simulator)
         
-        # 尝试攻击
+    def _try_attack(self, simulator: 'SpaceWarSimulator'):
+        """尝试攻击当前目标"""
         if (self.state in ["attack_ship", "assault_core"]) and self.target and self.attack_cooldown == 0:
             self._attack(self.target, simulator)
             
@@ -170,24 +225,25 @@ class Ship:
             
     def _get_patrol_target(self):
         """获取巡逻目标位置"""
-        if (self.pos.distance_to(self.patrol_center) > self.patrol_radius or 
+        if (self.pos.distance_sq_to(self.patrol_center) > self.patrol_radius * self.patrol_radius or 
             not hasattr(self, 'patrol_target') or 
-            self.pos.distance_to(self.patrol_target) < 60):
+            self.pos.distance_sq_to(self.patrol_target) < 60 * 60):
             
-            angle = random.uniform(0, 2 * math.pi)
+            angle = self.rng.uniform(0, 2 * math.pi)
             self.patrol_target = self.patrol_center + Vector2(
                 math.cos(angle), math.sin(angle)
             ) * self.patrol_radius
             
         return self.patrol_target
         
-    def _turn_towards_target(self, target_pos: Vector2, config: GameConfig):
+    def _turn_towards_target(self, target_pos: Vector2, config: GameConfig, dt: float):
         """转向目标位置"""
-        direction = target_pos - self.pos
-        if direction.magnitude() > 1:
-            target_angle = math.atan2(direction.y, direction.x)
+        dx = target_pos.x - self.pos.x
+        dy = target_pos.y - self.pos.y
+        if dx * dx + dy * dy > 1:
+            target_angle = math.atan2(dy, dx)
             angle_diff = (target_angle - self.angle + math.pi) % (2 * math.pi) - math.pi
-            max_turn_this_frame = config.ship_turn_rate / 60
+            max_turn_this_frame = config.ship_turn_rate * dt
             turn_amount = max(-max_turn_this_frame, min(max_turn_this_frame, angle_diff))
             self.angle += turn_amount
             self.angle = (self.angle + math.pi) % (2 * math.pi) - math.pi
@@ -203,12 +259,13 @@ class Ship:
         
     def _attack(self, target: Union['Ship', 'Core'], simulator: 'SpaceWarSimulator'):
         """执行攻击"""
-        if target.health <= 0 or self.pos.distance_to(target.pos) > self.attack_range:
+        if target.health <= 0 or self.pos.distance_sq_to(target.pos) > self.attack_range * self.attack_range:
             return
             
-        to_target = target.pos - self.pos
-        if to_target.magnitude() > 0:
-            angle_to_target = math.atan2(to_target.y, to_target.x)
+        dx = target.pos.x - self.pos.x
+        dy = target.pos.y - self.pos.y
+        if dx != 0 or dy != 0:
+            angle_to_target = math.atan2(dy, dx)
             angle_diff = (angle_to_target - self.angle + math.pi) % (2*math.pi) - math.pi
             
             if abs(angle_diff) <= self.attack_angle / 2:
@@ -228,23 +285,16 @@ class Ship:
         """记录伤害统计"""
         self.damage_dealt += damage
         
-        # 更新阵营统计
-        for core in simulator.cores:
-            if core.faction_id == self.faction_id and core.health > 0:
-                core.total_damage_dealt += damage
-                break
+        simulator.factions[self.faction_id].record_damage(damage)
                 
     def _create_projectile(self, target, damage: float, simulator: 'SpaceWarSimulator'):
         """创建子弹"""
-        from entities.projectile import Projectile
-        color = FACTION_COLORS[self.faction_id % len(FACTION_COLORS)]
-        projectile = Projectile(self.pos, target, damage, color)
-        simulator.projectiles.append(projectile)
+        simulator.spawn_projectile(self.pos, target, damage, self.color)
         
-    def _update_retreat_healing(self, config: GameConfig, simulator: 'SpaceWarSimulator'):
+    def _update_retreat_healing(self, config: GameConfig, simulator: 'SpaceWarSimulator', dt: float):
         """更新撤退时的治疗效果"""
         if self.state == "retreat":
-            self.health = min(self.max_health, self.health + config.ship_retreat_heal_rate / 60)
+            self.health = min(self.max_health, self.health + config.ship_retreat_heal_rate * dt)
             self.heal_particle_timer += 1
             if self.heal_particle_timer > 8:
                 self.heal_particle_timer = 0
@@ -252,9 +302,7 @@ class Ship:
                 
     def _create_heal_effect(self, simulator: 'SpaceWarSimulator'):
         """创建治疗粒子效果"""
-        from entities.explosion import Explosion
-        particle = Explosion(self.pos, HEAL_GREEN, 2, (1, 3), (10, 20))
-        simulator.effects.append(particle)
+        simulator.spawn_heal_effect(self.pos)
         
     def _update_timers(self):
         """更新计时器"""
@@ -264,18 +312,24 @@ class Ship:
         if self.damage_flash_timer > 0:
             self.damage_flash_timer -= 1
             
-    def _handle_boundaries(self):
+    def _handle_boundaries(self, config: GameConfig):
         """处理边界限制"""
-        self.pos.x = max(20, min(SCREEN_WIDTH - 20, self.pos.x))
-        self.pos.y = max(20, min(SCREEN_HEIGHT - 20, self.pos.y))
-        
-    def _interact_with_objects(self, map_objects: List['MapObject']):
-        """与地图物体交互"""
-        for obj in map_objects:
-            if obj.active and self.pos.distance_to(obj.pos) < obj.size + 15:
-                self._apply_object_effect(obj)
-                obj.active = False
-                return
+        self.pos.x = max(20, min(config.world_width - 20, self.pos.x))
+        self.pos.y = max(20, min(config.world_height - 20, self.pos.y))
+        
+    def _interact_with_objects(self, simulator: 'SpaceWarSimulator'):
+        """与地图物体交互：只检查空间索引中附近的物体，同时接触多个时按列表顺序拾取第一个"""
+        reach = simulator.map_object_reach
+        x, y = self.pos.x, self.pos.y
+        touching = []
+        for obj in simulator.map_object_grid.query_rect(x - reach, y - reach, x + reach, y + reach):
+            limit = obj.size + self.PICKUP_MARGIN
+            if obj.active and self.pos.distance_sq_to(obj.pos) < limit * limit:
+                touching.append(obj)
+        if touching:
+            obj = touching[0] if len(touching) == 1 else min(touching, key=lambda obj: obj.index)
+            self._apply_object_effect(obj)
+            obj.active = False
                 
     def _apply_object_effect(self, obj):
         """应用地图物体效果"""
@@ -291,56 +345,73 @@ class Ship:
         old_health = self.health
         self.health -= damage
         self.damage_flash_timer = 6
+        if self.state != "attack_ship":
+            self.ai_due = True  # 未与舰船交战时遭到攻击，尽快寻找还击目标
         
         if self.health <= 0 and old_health > 0:
             self.health = 0
+            simulator.factions.ship_destroyed(self)
             self._record_kill_stats(simulator)
             self._create_destruction_effect(simulator)
             
     def _record_kill_stats(self, simulator: 'SpaceWarSimulator'):
         """记录击杀统计"""
-        for core in simulator.cores:
-            if core.faction_id == self.faction_id and core.health > 0:
-                core.total_kills += 1
-                break
+        simulator.factions[self.faction_id].record_kill()
                 
     def _create_destruction_effect(self, simulator: 'SpaceWarSimulator'):
         """创建摧毁特效"""
-        from entities.explosion import Explosion
-        color = FACTION_COLORS[self.faction_id % len(FACTION_COLORS)]
-        explosion = Explosion(self.pos, color, 80, (2, 6), (30, 60))
-        simulator.effects.append(explosion)
+        simulator.spawn_explosion(self.pos, self.color, 80, (2, 6), (30, 60))
         
-    def draw(self, screen):
-        """绘制舰船"""
+    def draw(self, screen, at: Optional[Tuple[float, float]] = None):
+        """绘制舰船，at为绘制位置（屏幕坐标），默认为舰船自身的位置"""
         if self.health <= 0:
             return
+        x, y = at or (self.pos.x, self.pos.y)
             
-        color = FACTION_COLORS[self.faction_id % len(FACTION_COLORS)]
+        color = self.color
         body_color = DARK_GRAY
         
         if self.damage_flash_timer > 0:
             body_color, color = WHITE, WHITE
             
-        # 绘制引擎尾焰
-        if self.is_moving:
-            self._draw_engine_flames(screen)
-        
-        # 绘制舰船主体
-        self._draw_ship_body(screen, body_color, color)
+        if ship_atlas.steps:
+            self._blit_sprites(screen, x, y, body_color, color)
+        else:
+            # 绘制引擎尾焰
+            if self.is_moving:
+                self._draw_engine_flames(screen, x, y)
+            
+            # 绘制舰船主体
+            self._draw_ship_body(screen, x, y, body_color, color)
         
         # 绘制效果指示器
-        self._draw_effect_indicators(screen)
+        self._draw_effect_indicators(screen, x, y)
         
         # 绘制血量条
         if self.health < self.max_health:
-            self._draw_health_bar(screen)
+            self._draw_health_bar(screen, x, y)
             
-    def _draw_engine_flames(self, screen):
+    def draw_bounds(self, at: Optional[Tuple[float, float]] = None) -> pygame.Rect:
+        """在at处绘制时内容（含尾焰、效果指示器和血量条）的屏幕范围"""
+        x, y = at or (self.pos.x, self.pos.y)
+        half = max(self.length * 2.2, 26) + 2
+        return pygame.Rect(int(x - half), int(y - half), int(half * 2) + 1, int(half * 2) + 1)
+        
+    def _blit_sprites(self, screen, x, y, body_color, color):
+        """用图集中最接近当前朝向的精灵绘制尾焰和舰船主体"""
+        index = ship_atlas.angle_index(self.angle)
+        if self.is_moving:
+            flicker = cosmetic_rng.randrange(ship_atlas.FLAME_STEPS)
+            sprite, dx, dy = ship_atlas.flame(self.length, self.width, index, flicker)
+            screen.blit(sprite, (x + dx, y + dy))
+        sprite, dx, dy = ship_atlas.body(self.length, self.width, body_color, color, index)
+        screen.blit(sprite, (x + dx, y + dy))
+        
+    def _draw_engine_flames(self, screen, x, y):
         """绘制引擎尾焰"""
-        flame_len = self.length * 1.2 * random.uniform(0.7, 1.3)
+        flame_len = self.length * 1.2 * cosmetic_rng.uniform(0.7, 1.3)
         flame_w = self.width * 0.8
-        flame_c = self.pos - Vector2(math.cos(self.angle), math.sin(self.angle)) * (self.length / 1.6)
+        flame_c = Vector2(x, y) - Vector2(math.cos(self.angle), math.sin(self.angle)) * (self.length / 1.6)
         
         p1 = flame_c + Vector2(math.cos(self.angle+math.pi/2), math.sin(self.angle+math.pi/2)) * flame_w/2
         p2 = flame_c + Vector2(math.cos(self.angle-math.pi/2), math.sin(self.angle-math.pi/2)) * flame_w/2
@@ -352,14 +423,14 @@ class Ship:
         inner_flame_tip = flame_c - Vector2(math.cos(self.angle), math.sin(self.angle)) * flame_len * 0.6
         pygame.draw.polygon(screen, YELLOW, [(p1.x, p1.y), (p2.x, p2.y), (inner_flame_tip.x, inner_flame_tip.y)])
         
-    def _draw_ship_body(self, screen, body_color, color):
+    def _draw_ship_body(self, screen, x, y, body_color, color):
         """绘制舰船主体"""
         l, w = self.length / 2, self.width / 2
         points = [
-            (self.pos.x + l*math.cos(self.angle), self.pos.y + l*math.sin(self.angle)),
-            (self.pos.x + w*math.cos(self.angle-math.pi/2), self.pos.y + w*math.sin(self.angle-math.pi/2)),
-            (self.pos.x - l*0.6*math.cos(self.angle), self.pos.y - l*0.6*math.sin(self.angle)),
-            (self.pos.x + w*math.cos(self.angle+math.pi/2), self.pos.y + w*math.sin(self.angle+math.pi/2))
+            (x + l*math.cos(self.angle), y + l*math.sin(self.angle)),
+            (x + w*math.cos(self.angle-math.pi/2), y + w*math.sin(self.angle-math.pi/2)),
+            (x - l*0.6*math.cos(self.angle), y - l*0.6*math.sin(self.angle)),
+            (x + w*math.cos(self.angle+math.pi/2), y + w*math.sin(self.angle+math.pi/2))
         ]
         
         # 阴影
@@ -369,22 +440,18 @@ class Ship:
         pygame.draw.polygon(screen, body_color, points)
         pygame.draw.polygon(screen, color, points, 3)
         
-    def _draw_effect_indicators(self, screen):
+    def _draw_effect_indicators(self, screen, x, y):
         """绘制效果指示器"""
         if self.buffs:
-            buff_surface = pygame.Surface((8, 8), pygame.SRCALPHA)
-            pygame.draw.circle(buff_surface, (0, 255, 0, 150), (4, 4), 4)
-            screen.blit(buff_surface, (self.pos.x + 15, self.pos.y - 15))
+            draw_alpha_circle(screen, (0, 255, 0, 150), (x + 19, y - 11), 4)
             
         if self.debuffs:
-            debuff_surface = pygame.Surface((8, 8), pygame.SRCALPHA)
-            pygame.draw.circle(debuff_surface, (255, 0, 255, 150), (4, 4), 4)
-            screen.blit(debuff_surface, (self.pos.x + 15, self.pos.y - 5))
+            draw_alpha_circle(screen, (255, 0, 255, 150), (x + 19, y - 1), 4)
             
-    def _draw_health_bar(self, screen):
+    def _draw_health_bar(self, screen, x, y):
         """绘制血量条"""
         bar_w, bar_h = 28, 5
-        bar_x, bar_y = self.pos.x - bar_w/2, self.pos.y - 25
+        bar_x, bar_y = x - bar_w/2, y - 25
         pygame.draw.rect(screen, (60, 0, 0), (bar_x - 1, bar_y - 1, bar_w + 2, bar_h + 2))
         pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_w, bar_h))
         pygame.draw.rect(screen, GREEN, (bar_x, bar_y, bar_w * (self.health / self.max_health), bar_h))
\ No newline at end of file
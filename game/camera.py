@@ -0,0 +1,93 @@
+"""视口相机：世界坐标与屏幕坐标之间的平移和缩放"""
+from typing import Dict, List, NamedTuple, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entities.projectile import ProjectileFrame
+
+class Camera:
+    """可平移、缩放的视口
+
+    (x, y) 是视口左上角的世界坐标。缩放只改变位置间距，实体保持原始像素大小
+    （战略视图），因此视口外扩 CULL_MARGIN 像素即可包含所有可能露出的绘制内容。
+    """
+    MIN_ZOOM = 0.5
+    MAX_ZOOM = 2.0
+    CULL_MARGIN = 150  # 屏幕像素，覆盖实体在其位置周围的最大绘制范围
+
+    def __init__(self, screen_size: Tuple[int, int], world_size: Tuple[int, int]):
+        self.screen_width, self.screen_height = screen_size
+        self.world_width, self.world_height = world_size
+        self.min_zoom = min(1.0, max(self.MIN_ZOOM, self.screen_width / self.world_width,
+                                     self.screen_height / self.world_height))
+        self.reset()
+
+    def reset(self):
+        """缩放复位并对准世界中心"""
+        self.zoom = 1.0
+        self.center_on(self.world_width / 2, self.world_height / 2)
+
+    @property
+    def view_width(self) -> float:
+        return self.screen_width / self.zoom
+
+    @property
+    def view_height(self) -> float:
+        return self.screen_height / self.zoom
+
+    def center_on(self, x: float, y: float):
+        """把世界坐标 (x, y) 移到屏幕中心"""
+        self.x = x - self.view_width / 2
+        self.y = y - self.view_height / 2
+        self._clamp()
+
+    def pan(self, dx: float, dy: float):
+        """按屏幕像素平移视口"""
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self._clamp()
+
+    def zoom_at(self, factor: float, screen_pos: Tuple[float, float]):
+        """以屏幕上的某点为中心缩放，该点下的世界坐标保持不变"""
+        wx, wy = self.to_world(*screen_pos)
+        self.zoom = max(self.min_zoom, min(self.MAX_ZOOM, self.zoom * factor))
+        self.x = wx - screen_pos[0] / self.zoom
+        self.y = wy - screen_pos[1] / self.zoom
+        self._clamp()
+
+    def _clamp(self):
+        """视口不超出世界；视口比世界大时居中"""
+        for axis, view, world in (("x", self.view_width, self.world_width),
+                                  ("y", self.view_height, self.world_height)):
+            if view >= world:
+                setattr(self, axis, (world - view) / 2)
+            else:
+                setattr(self, axis, max(0.0, min(world - view, getattr(self, axis))))
+
+    def to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def to_world(self, sx: float, sy: float) -> Tuple[float, float]:
+        return self.x + sx / self.zoom, self.y + sy / self.zoom
+
+    def is_identity(self) -> bool:
+        """世界坐标与屏幕坐标是否一致（无需变换和裁剪）"""
+        return self.x == 0 and self.y == 0 and self.zoom == 1.0 and self.covers_world()
+
+    def covers_world(self) -> bool:
+        """视口是否包含整个世界"""
+        return (self.x <= 0 and self.y <= 0 and self.x + self.view_width >= self.world_width
+                and self.y + self.view_height >= self.world_height)
+
+    def cull_rect(self) -> Tuple[float, float, float, float]:
+        """需要绘制的世界范围 (left, top, right, bottom)，含绘制余量"""
+        margin = self.CULL_MARGIN / self.zoom
+        return (self.x - margin, self.y - margin,
+                self.x + self.view_width + margin, self.y + self.view_height + margin)
+
+class VisibleSet(NamedTuple):
+    """本帧需要绘制的对象"""
+    map_objects: List
+    cores: List
+    ships: List
+    projectiles: 'ProjectileFrame'  # 已换算到屏幕坐标
+    screen: Dict[object, Tuple[float, float]]  # 实体本帧插值并换算后的屏幕坐标，不在其中的按自身位置绘制
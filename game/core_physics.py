@@ -0,0 +1,161 @@
+"""核心的批量引力计算和障碍物索引"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import ObjectType
+
+def pairwise_gravity(positions: np.ndarray, masses: np.ndarray, strength: float) -> np.ndarray:
+    """全部核心两两之间的引力合力，返回 (N, 2) 数组
+
+    与 Core._apply_physics 的逐对循环相同：距离下限为1，重合的核心之间没有作用力。
+    """
+    delta = positions[None, :, :] - positions[:, None, :]  # delta[i, j] = p_j - p_i
+    mag = np.sqrt((delta * delta).sum(axis=2))
+    dist = np.maximum(mag, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = strength * masses[:, None] * masses[None, :] / (dist * dist) / mag
+    scale[mag == 0] = 0.0
+    return (delta * scale[:, :, None]).sum(axis=1)
+
+class _QuadNode:
+    """Barnes–Hut 四叉树节点，叶子节点直接保存物体下标"""
+    __slots__ = ("cx", "cy", "half", "depth", "mass", "mx", "my", "bodies", "children")
+
+    MAX_DEPTH = 24  # 位置重合的物体在此深度停止细分
+
+    def __init__(self, cx: float, cy: float, half: float, depth: int = 0):
+        self.cx, self.cy, self.half, self.depth = cx, cy, half, depth
+        self.mass = self.mx = self.my = 0.0
+        self.bodies: List[int] = []
+        self.children: Optional[List['_QuadNode']] = None
+
+    def insert(self, i: int, xs: List[float], ys: List[float], ms: List[float]):
+        x, y, m = xs[i], ys[i], ms[i]
+        self.mass += m
+        self.mx += m * x
+        self.my += m * y
+        if self.children is not None:
+            self._child_for(x, y).insert(i, xs, ys, ms)
+            return
+        self.bodies.append(i)
+        if len(self.bodies) > 1 and self.depth < self.MAX_DEPTH:
+            self._split(xs, ys, ms)
+
+    def _split(self, xs, ys, ms):
+        quarter = self.half / 2
+        depth = self.depth + 1
+        self.children = [
+            _QuadNode(self.cx - quarter, self.cy - quarter, quarter, depth),
+            _QuadNode(self.cx + quarter, self.cy - quarter, quarter, depth),
+            _QuadNode(self.cx - quarter, self.cy + quarter, quarter, depth),
+            _QuadNode(self.cx + quarter, self.cy + quarter, quarter, depth),
+        ]
+        bodies, self.bodies = self.bodies, []
+        for j in bodies:
+            self._child_for(xs[j], ys[j]).insert(j, xs, ys, ms)
+
+    def _child_for(self, x: float, y: float) -> '_QuadNode':
+        return self.children[(x >= self.cx) + 2 * (y >= self.cy)]
+
+def barnes_hut_gravity(positions: np.ndarray, masses: np.ndarray, strength: float,
+                       theta: float = 0.5) -> np.ndarray:
+    """Barnes–Hut 近似的引力合力，返回 (N, 2) 数组
+
+    节点边长与到其质心距离之比小于theta时，把整个节点视为位于质心的单个物体。
+    """
+    n = len(positions)
+    forces = np.zeros((n, 2))
+    if n < 2:
+        return forces
+
+    xs = positions[:, 0].tolist()
+    ys = positions[:, 1].tolist()
+    ms = masses.tolist()
+    low = positions.min(axis=0)
+    high = positions.max(axis=0)
+    root = _QuadNode((low[0] + high[0]) / 2, (low[1] + high[1]) / 2, float(max(high - low)) / 2 + 1.0)
+    for i in range(n):
+        root.insert(i, xs, ys, ms)
+
+    theta_sq = theta * theta
+    for i in range(n):
+        x, y, m = xs[i], ys[i], ms[i]
+        fx = fy = 0.0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                for j in node.bodies:
+                    if j != i:
+                        fx, fy = _add_pull(fx, fy, xs[j] - x, ys[j] - y, strength * m * ms[j])
+                continue
+            dx = node.mx / node.mass - x
+            dy = node.my / node.mass - y
+            size = 2 * node.half
+            if size * size < theta_sq * (dx * dx + dy * dy):
+                fx, fy = _add_pull(fx, fy, dx, dy, strength * m * node.mass)
+            else:
+                stack.extend(child for child in node.children if child.mass > 0)
+        forces[i] = fx, fy
+    return forces
+
+def _add_pull(fx: float, fy: float, dx: float, dy: float, gm: float) -> Tuple[float, float]:
+    """累加一个位于 (dx, dy) 处的物体的引力，距离下限为1"""
+    mag = math.sqrt(dx * dx + dy * dy)
+    if mag == 0:
+        return fx, fy
+    dist = max(mag, 1.0)
+    force = gm / (dist * dist)
+    return fx + dx / mag * force, fy + dy / mag * force
+
+def core_gravity(positions: np.ndarray, masses: np.ndarray, strength: float,
+                 barnes_hut_threshold: int, theta: float = 0.5) -> np.ndarray:
+    """按核心数量选择全对向量化计算或 Barnes–Hut 近似"""
+    if len(positions) >= barnes_hut_threshold:
+        return barnes_hut_gravity(positions, masses, strength, theta)
+    return pairwise_gravity(positions, masses, strength)
+
+class ObstacleIndex:
+    """障碍物的静态网格索引，核心只需检查附近的障碍物
+
+    障碍物不会移动；地图物体列表被替换或数量变化时重建。
+    near() 按原列表顺序返回候选，保证累加顺序与线性扫描一致。
+    """
+
+    def __init__(self, cell_size: float = 200.0):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Tuple[int, object]]] = {}
+        self.max_size = 0.0
+        self._source = None
+        self._count = -1
+
+    def sync(self, map_objects: list):
+        """地图物体变化时重建索引"""
+        if map_objects is self._source and len(map_objects) == self._count:
+            return
+        self._source = map_objects
+        self._count = len(map_objects)
+        self.cells = {}
+        self.max_size = 0.0
+        for i, obj in enumerate(map_objects):
+            if obj.type == ObjectType.OBSTACLE:
+                key = (math.floor(obj.pos.x / self.cell_size), math.floor(obj.pos.y / self.cell_size))
+                self.cells.setdefault(key, []).append((i, obj))
+                self.max_size = max(self.max_size, obj.size)
+
+    def near(self, pos, reach: float) -> list:
+        """表面距pos可能在reach以内的障碍物"""
+        radius = reach + self.max_size
+        cell = self.cell_size
+        x0, x1 = math.floor((pos.x - radius) / cell), math.floor((pos.x + radius) / cell)
+        y0, y1 = math.floor((pos.y - radius) / cell), math.floor((pos.y + radius) / cell)
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        found.sort(key=lambda entry: entry[0])
+        return [obj for _, obj in found]
@@ -0,0 +1,93 @@
+"""阵营登记表：按 faction_id 直接找到阵营的核心、颜色、舰船名单和统计"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from utils.roster import Roster
+
+if TYPE_CHECKING:
+    from entities.core import Core
+    from entities.ship import Ship
+
+class Faction:
+    """单个阵营，统计数值保存在核心上，核心被摧毁后不再累加"""
+
+    def __init__(self, core: 'Core'):
+        self.faction_id = core.faction_id
+        self.core = core
+        self.color: Tuple[int, int, int] = core.color
+
+    @property
+    def alive(self) -> bool:
+        return self.core.health > 0
+
+    @property
+    def ships(self) -> Roster['Ship']:
+        """当前的舰船名单（核心被摧毁后为空）"""
+        return self.core.ships
+
+    @property
+    def kills(self) -> int:
+        return self.core.total_kills
+
+    @property
+    def damage_dealt(self) -> float:
+        return self.core.total_damage_dealt
+
+    @property
+    def damage_taken(self) -> float:
+        return self.core.total_damage_taken
+
+    def record_damage(self, damage: float):
+        """累加本阵营舰船造成的伤害"""
+        core = self.core
+        if core.health > 0:
+            core.total_damage_dealt += damage
+
+    def record_kill(self):
+        """击杀数加一"""
+        core = self.core
+        if core.health > 0:
+            core.total_kills += 1
+
+class FactionRegistry:
+    """faction_id -> Faction，包括已被摧毁的阵营，不随 simulator.cores 的清理而变化
+
+    ships 是全部在场舰船的全局名单，各核心的舰船名单挂接在它下面，随之增删。
+    被摧毁的舰船先登记，在帧末清理阶段统一移出名单，帧内遍历名单时不会改变顺序。
+    """
+
+    def __init__(self):
+        self._factions: Dict[int, Faction] = {}
+        self.ships: Roster['Ship'] = Roster()
+        self._destroyed: List['Ship'] = []
+
+    def __getitem__(self, faction_id: int) -> Faction:
+        return self._factions[faction_id]
+
+    def __iter__(self) -> Iterator[Faction]:
+        return iter(self._factions.values())
+
+    def __len__(self) -> int:
+        return len(self._factions)
+
+    def register(self, core: 'Core') -> Faction:
+        faction = self._factions[core.faction_id] = Faction(core)
+        core.ships.attach(self.ships)
+        return faction
+
+    def rebuild(self, cores: List['Core'], ships: Optional[Iterable['Ship']] = None):
+        """按核心列表重新登记全部阵营，ships给出全局名单的顺序（默认按核心依次排列）"""
+        self._factions = {}
+        self.ships = Roster(ships or ())
+        self._destroyed = []
+        for core in cores:
+            self.register(core)
+
+    def ship_destroyed(self, ship: 'Ship'):
+        """登记被摧毁的舰船，留到 remove_destroyed() 时移出名单"""
+        self._destroyed.append(ship)
+
+    def remove_destroyed(self):
+        """把本帧被摧毁的舰船移出所属核心和全局名单"""
+        for ship in self._destroyed:
+            self._factions[ship.faction_id].core.ships.remove(ship)
+        self._destroyed.clear()
@@ -0,0 +1,148 @@
+"""舰队结构化数组存储（NumPy批量运动后端）"""
+import math
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from config import GameConfig, SIM_DT
+from utils.vector2 import Vector2
+
+if TYPE_CHECKING:
+    from entities.ship import Ship
+
+# 舰船状态编码
+STATE_CODES = {"patrol": 0, "attack_ship": 1, "assault_core": 2, "retreat": 3}
+
+class FleetStore:
+    """以连续数组保存全部在场舰船的运动状态，每帧对整支舰队批量转向、积分和边界限制
+
+    挂接在全局舰船名单下：舰船加入名单时追加一行，移出名单时用最后一行填补空位，
+    因此第 i 行始终对应全局名单中的第 i 艘舰船。位置、速度、朝向只在数组中推进，
+    每帧只写入目标位置和速度修正；结果原地写回各舰船的 pos/velocity/angle/is_moving，
+    供AI、攻击、绘制和统计面板读取。Ship 对象仍负责AI决策、攻击和绘制。
+    """
+
+    # 字段名 -> (每行形状, 类型, 初始值)
+    _FIELDS = {
+        "pos": ((2,), np.float64, 0.0),
+        "velocity": ((2,), np.float64, 0.0),
+        "angle": ((), np.float64, 0.0),
+        "speed": ((), np.float64, 0.0),
+        "speed_modifier": ((), np.float64, 1.0),
+        "target_pos": ((2,), np.float64, 0.0),
+        "has_target": ((), bool, False),
+        "is_moving": ((), bool, False),
+    }
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.capacity = 0
+        self.ships: List['Ship'] = []  # 与数组行一一对应
+        self._rows: Dict['Ship', int] = {}
+        self._allocate(max(1, capacity))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, ship: 'Ship') -> bool:
+        return ship in self._rows
+
+    def _allocate(self, capacity: int):
+        """分配（或扩容）数组，保留已有数据"""
+        for name, (shape, dtype, fill) in self._FIELDS.items():
+            array = np.full((capacity,) + shape, fill, dtype=dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def add(self, ship: 'Ship'):
+        """舰船加入名单时追加一行，读入它当前的运动状态"""
+        i = self.count
+        if i == self.capacity:
+            self._allocate(self.capacity * 2)
+        self.pos[i] = (ship.pos.x, ship.pos.y)
+        self.velocity[i] = (ship.velocity.x, ship.velocity.y)
+        self.angle[i] = ship.angle
+        self.speed[i] = ship.speed
+        self.is_moving[i] = ship.is_moving
+        self._rows[ship] = i
+        self.ships.append(ship)
+        self.count = i + 1
+
+    def remove(self, ship: 'Ship') -> bool:
+        """舰船移出名单时用最后一行填补它的位置"""
+        i = self._rows.pop(ship, None)
+        if i is None:
+            return False
+        last = self.count - 1
+        moved = self.ships.pop()
+        if i != last:
+            for name in self._FIELDS:
+                array = getattr(self, name)
+                array[i] = array[last]
+            self.ships[i] = moved
+            self._rows[moved] = i
+        self.count = last
+        return True
+
+    def set_targets(self, target_positions: List[Optional[Vector2]]):
+        """写入本帧各行的目标位置（None表示没有目标）和速度修正"""
+        n = self.count
+        if n == 0:
+            return
+        target = np.array([(p.x, p.y) if p is not None else (math.nan, math.nan) for p in target_positions])
+        has_target = self.has_target[:n]
+        np.logical_not(np.isnan(target[:, 0]), out=has_target)
+        self.target_pos[:n] = np.where(has_target[:, None], target, self.pos[:n])
+        self.speed_modifier[:n] = [ship._calculate_speed_modifier() for ship in self.ships]
+
+    def step(self, config: GameConfig, dt: float = SIM_DT):
+        """整支舰队的转向、速度修正、位置积分和边界限制"""
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.pos[:n]
+        angle = self.angle[:n]
+        has_target = self.has_target[:n]
+
+        direction = self.target_pos[:n] - pos
+        distance = np.hypot(direction[:, 0], direction[:, 1])
+
+        # 转向目标，每帧转角不超过 turn_rate * dt
+        turning = has_target & (distance > 1)
+        target_angle = np.arctan2(direction[:, 1], direction[:, 0])
+        angle_diff = np.mod(target_angle - angle + math.pi, 2 * math.pi) - math.pi
+        max_turn = config.ship_turn_rate * dt
+        turned = np.mod(angle + np.clip(angle_diff, -max_turn, max_turn) + math.pi, 2 * math.pi) - math.pi
+        np.copyto(angle, turned, where=turning)
+
+        # 速度（考虑效果修正）
+        move_speed = np.where(has_target, self.speed[:n] * self.speed_modifier[:n], 0.0)
+        velocity = self.velocity[:n]
+        velocity[:, 0] = np.cos(angle) * move_speed
+        velocity[:, 1] = np.sin(angle) * move_speed
+
+        # 距离目标足够远时才移动
+        moving = self.is_moving[:n]
+        np.greater(distance, 15, out=moving)
+        moving &= has_target
+        pos += velocity * (moving[:, None] * dt)
+
+        # 边界限制
+        np.clip(pos[:, 0], 20, config.world_width - 20, out=pos[:, 0])
+        np.clip(pos[:, 1], 20, config.world_height - 20, out=pos[:, 1])
+
+    def store(self):
+        """把运动结果原地写回舰船对象"""
+        n = self.count
+        pos = self.pos[:n].tolist()
+        velocity = self.velocity[:n].tolist()
+        angle = self.angle[:n].tolist()
+        moving = self.is_moving[:n].tolist()
+        for i, ship in enumerate(self.ships):
+            ship.pos.x, ship.pos.y = pos[i]
+            ship.velocity.x, ship.velocity.y = velocity[i]
+            ship.angle = angle[i]
+            ship.is_moving = moving[i]
@@ -0,0 +1,203 @@
+"""基于网格的 Bridson 泊松圆盘采样，用于放置核心和地图物体"""
+import math
+import random
+import warnings
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from utils.vector2 import Vector2
+
+SHORTFALL_WARN_RATIO = 0.95  # 放下的数量低于请求数的这一比例时才发出警告
+
+class MapDensityWarning(UserWarning):
+    """请求的数量在给定间距下放不下"""
+
+class PoissonDiskSampler:
+    """在矩形区域内按类型间距放置点，两点间距不小于两者类型间距中的较大值
+
+    背景网格的格子边长为最小间距/√2，每个格子至多容纳一个点，
+    检查候选点只需查看最大间距覆盖的邻近格子，整体耗时与点数成线性。
+    exclusions 是 (圆心, 半径) 形式的禁止区域，例如核心周围。
+    """
+    SPARSE_RATIO = 4  # 请求点数不到容量的1/4时直接随机投点
+    FILL_RETRIES = 8  # 候选位置少于请求点数时重新铺设的次数，取最多的一次
+
+    def __init__(self, bounds: Tuple[float, float, float, float], spacing: Dict[Hashable, float],
+                 rng: random.Random, exclusions: Sequence[Tuple[Vector2, float]] = (), attempts: int = 30,
+                 spread: float = 0.05):
+        self.x0, self.y0, self.x1, self.y1 = bounds
+        self.spacing = spacing
+        self.rng = rng
+        self.attempts = attempts
+        self.spread = spread
+        self.points: List[Tuple[Hashable, Vector2]] = []
+
+        # 网格四周留出reach格的空边，查询邻格时不必检查越界；格子里存 (x, y, 间距)
+        self.cell_size = min(spacing.values()) / math.sqrt(2)
+        self.reach = math.ceil(max(spacing.values()) / self.cell_size)
+        cols = max(1, math.ceil((self.x1 - self.x0) / self.cell_size))
+        rows = max(1, math.ceil((self.y1 - self.y0) / self.cell_size))
+        self.stride = cols + 2 * self.reach
+        self.grid: List[Optional[Tuple[float, float, float]]] = [None] * (self.stride * (rows + 2 * self.reach))
+        # 只保留最近距离可能小于最大间距的邻格（边长为间距/√2，去掉远角）
+        limit = (max(spacing.values()) / self.cell_size) ** 2
+        self.neighbor_offsets = [
+            dr * self.stride + dc
+            for dr in range(-self.reach, self.reach + 1)
+            for dc in range(-self.reach, self.reach + 1)
+            if max(abs(dr) - 1, 0) ** 2 + max(abs(dc) - 1, 0) ** 2 < limit
+        ]
+
+        self._exclusion_circles = exclusions
+        self.exclusions = [(pos.x, pos.y, radius * radius) for pos, radius in exclusions]
+        self.exclusion_cell = max((radius for _, radius in exclusions), default=1.0)
+        self.exclusion_grid: Dict[Tuple[int, int], List[Tuple[float, float, float]]] = {}
+        for circle in self.exclusions:
+            key = (math.floor(circle[0] / self.exclusion_cell), math.floor(circle[1] / self.exclusion_cell))
+            self.exclusion_grid.setdefault(key, []).append(circle)
+
+    def sample(self, kinds: Sequence[Hashable]) -> List[Tuple[Hashable, Vector2]]:
+        """依次放置kinds中的每个点，返回已放置的 (类型, 位置)，放不下的会被跳过
+
+        点数远少于区域容量时直接在整个区域内随机投点，分布均匀；
+        接近容量时先用 Bridson 方法铺满一组候选位置，再从中随机挑选，
+        这样既不会聚成一团，也能放下接近容量的点数。
+        """
+        if not kinds:
+            return []
+        sparse = len(kinds) * self.SPARSE_RATIO < self.capacity_estimate(min(self.spacing.values()))
+        candidates = [] if sparse else self._fill_candidates(len(kinds))
+
+        active: List[int] = []
+        placed: List[Tuple[Hashable, Vector2]] = []
+        for kind in kinds:
+            pos = self._dart(kind) if sparse else self._pick(kind, candidates)
+            if pos is None:
+                pos = self._place(kind, active)
+            if pos is not None:
+                active.append(len(self.points))
+                self.points.append((kind, pos))
+                placed.append((kind, pos))
+        return placed
+
+    def _fill_candidates(self, wanted: int) -> List[Vector2]:
+        """用最小间距把区域铺满，返回全部位置作为候选；不足wanted个时重新铺设，保留最多的一次"""
+        best: List[Vector2] = []
+        for _ in range(self.FILL_RETRIES):
+            candidates = self._fill_once()
+            if len(candidates) > len(best):
+                best = candidates
+            if len(best) >= wanted:
+                break
+        return best
+
+    def _fill_once(self) -> List[Vector2]:
+        kind = min(self.spacing, key=self.spacing.get)
+        filler = PoissonDiskSampler((self.x0, self.y0, self.x1, self.y1), {kind: self.spacing[kind]},
+                                    self.rng, self._exclusion_circles, self.attempts, self.spread)
+        active: List[int] = []
+        while True:
+            pos = filler._place(kind, active)
+            if pos is None:
+                return [point for _, point in filler.points]
+            active.append(len(filler.points))
+            filler.points.append((kind, pos))
+
+    def _pick(self, kind: Hashable, candidates: List[Vector2]):
+        """从候选位置中随机挑选一个满足间距的，挑中的从候选中移除"""
+        rng = self.rng
+        for _ in range(min(self.attempts, len(candidates))):
+            slot = rng.randrange(len(candidates))
+            pos = candidates[slot]
+            if self._fits(kind, pos.x, pos.y):
+                candidates[slot] = candidates[-1]
+                candidates.pop()
+                return self._insert(kind, pos.x, pos.y)
+        return None
+
+    def _place(self, kind: Hashable, active: List[int]):
+        """为一个点找到合法位置，找不到时返回None
+
+        没有活跃点时（开始时或被禁止区域隔开的区域）在整个区域内随机投点；
+        否则按 Bridson 方法从随机一个活跃点周围 [d, (1+spread)d] 的环带中产生候选
+        （d为两者的间距；经典 Bridson 用 [d, 2d]，环带越窄排得越密），
+        某活跃点连续 attempts 次失败后不再活跃。
+        """
+        rng = self.rng
+        while active:
+            slot = rng.randrange(len(active))
+            parent_kind, parent = self.points[active[slot]]
+            distance = max(self.spacing[kind], self.spacing[parent_kind])
+            for _ in range(self.attempts):
+                angle = rng.uniform(0, 2 * math.pi)
+                radius = distance * (1.0 + self.spread * rng.random())
+                x = parent.x + math.cos(angle) * radius
+                y = parent.y + math.sin(angle) * radius
+                if self._fits(kind, x, y):
+                    return self._insert(kind, x, y)
+            active[slot] = active[-1]
+            active.pop()
+        return self._dart(kind)
+
+    def _dart(self, kind: Hashable):
+        """在整个区域内随机投点，attempts次都不满足间距时返回None"""
+        rng = self.rng
+        for _ in range(self.attempts):
+            x = rng.uniform(self.x0, self.x1)
+            y = rng.uniform(self.y0, self.y1)
+            if self._fits(kind, x, y):
+                return self._insert(kind, x, y)
+        return None
+
+    def _cell_index(self, x: float, y: float) -> int:
+        col = int((x - self.x0) / self.cell_size) + self.reach
+        row = int((y - self.y0) / self.cell_size) + self.reach
+        return row * self.stride + col
+
+    def _insert(self, kind: Hashable, x: float, y: float) -> Vector2:
+        self.grid[self._cell_index(x, y)] = (x, y, self.spacing[kind])
+        return Vector2(x, y)
+
+    def _fits(self, kind: Hashable, x: float, y: float) -> bool:
+        """候选点是否在区域内、不在禁止区域内且与邻近的点保持间距"""
+        if not (self.x0 <= x < self.x1 and self.y0 <= y < self.y1):
+            return False
+
+        if self.exclusion_grid and self._excluded(x, y):
+            return False
+
+        spacing = self.spacing[kind]
+        grid = self.grid
+        base = self._cell_index(x, y)
+        for offset in self.neighbor_offsets:
+            cell = grid[base + offset]
+            if cell is not None:
+                ox, oy, other_spacing = cell
+                distance = spacing if spacing > other_spacing else other_spacing
+                dx = x - ox
+                dy = y - oy
+                if dx * dx + dy * dy < distance * distance:
+                    return False
+        return True
+
+    def _excluded(self, x: float, y: float) -> bool:
+        """是否落在某个禁止区域内"""
+        ex = math.floor(x / self.exclusion_cell)
+        ey = math.floor(y / self.exclusion_cell)
+        for gx in range(ex - 1, ex + 2):
+            for gy in range(ey - 1, ey + 2):
+                for cx, cy, radius_sq in self.exclusion_grid.get((gx, gy), ()):
+                    if (x - cx) ** 2 + (y - cy) ** 2 <= radius_sq:
+                        return True
+        return False
+
+    def capacity_estimate(self, spacing: float) -> int:
+        """间距为spacing时区域大约能容纳的点数（随机序贯填充的极限覆盖率约0.547）"""
+        area = (self.x1 - self.x0 + spacing) * (self.y1 - self.y0 + spacing)
+        return int(0.547 * area / (math.pi * (spacing / 2) ** 2))
+
+def report_shortfall(what: str, requested: int, placed: int, estimate: int):
+    """放置数量明显不足（低于请求数的 SHORTFALL_WARN_RATIO）时发出 MapDensityWarning"""
+    if placed < requested * SHORTFALL_WARN_RATIO:
+        warnings.warn(
+            f"{what}: 请求 {requested} 个，只放下了 {placed} 个（当前区域和间距下约可容纳 {estimate} 个）",
+            MapDensityWarning, stacklevel=3)
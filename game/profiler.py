@@ -0,0 +1,125 @@
+"""逐阶段帧性能分析器"""
+import csv
+import json
+import time
+from collections import deque
+from typing import Dict, Optional, TextIO
+
+class _NullSection:
+    """分析器关闭时使用的空计时区段"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SECTION = _NullSection()
+
+class _Section:
+    """计时区段，退出时把耗时累加到当前帧"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add_time(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+class FrameProfiler:
+    """记录每帧各阶段耗时和实体数量，保留最近window帧的滚动统计
+
+    关闭时 section() 返回共享的空区段，count() 直接返回，开销接近于零。
+    """
+
+    def __init__(self, window: int = 120):
+        self.enabled = False
+        self.window = window
+        self.frame = 0
+        self.times: Dict[str, deque] = {}
+        self.counts: Dict[str, int] = {}
+        self._frame_times: Dict[str, int] = {}
+        self._export_file: Optional[TextIO] = None
+        self._csv_writer = None
+
+    def section(self, name: str):
+        """计时区段：with profiler.section("update.entities"): ..."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add_time(self, name: str, elapsed_ns: int):
+        """把一段耗时累加到当前帧（同一帧内多次进入同一阶段会累加）"""
+        self._frame_times[name] = self._frame_times.get(name, 0) + elapsed_ns
+
+    def count(self, name: str, value: int):
+        """记录当前帧的实体计数"""
+        if self.enabled:
+            self.counts[name] = value
+
+    def end_frame(self):
+        """结束当前帧：写入滚动统计和导出流"""
+        if not self.enabled or not self._frame_times:
+            return
+        for name, elapsed in self._frame_times.items():
+            history = self.times.get(name)
+            if history is None:
+                history = self.times[name] = deque(maxlen=self.window)
+            history.append(elapsed)
+        if self._export_file is not None:
+            self._export_row()
+        self._frame_times = {}
+        self.frame += 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """各阶段最近window帧的平均和最大耗时（毫秒）"""
+        return {
+            name: {
+                "mean_ms": sum(history) / len(history) / 1e6,
+                "max_ms": max(history) / 1e6,
+            }
+            for name, history in self.times.items() if history
+        }
+
+    def reset(self):
+        """清空统计数据"""
+        self.times.clear()
+        self.counts.clear()
+        self._frame_times = {}
+
+    @property
+    def exporting(self) -> bool:
+        return self._export_file is not None
+
+    def start_export(self, path: str):
+        """把每帧数据导出到文件，按扩展名选择CSV或JSONL格式"""
+        self.stop_export()
+        self._export_file = open(path, "w", encoding="utf-8", newline="")
+        self._csv_writer = None
+        self._export_csv = path.lower().endswith(".csv")
+
+    def stop_export(self):
+        """结束导出"""
+        if self._export_file is not None:
+            self._export_file.close()
+            self._export_file = None
+            self._csv_writer = None
+
+    def _export_row(self):
+        row = {"frame": self.frame}
+        row.update({f"{name}_ns": elapsed for name, elapsed in self._frame_times.items()})
+        row.update(self.counts)
+        if not self._export_csv:
+            self._export_file.write(json.dumps(row) + "\n")
+            return
+        if self._csv_writer is None:
+            # 表头取自第一帧，之后新出现的列会被忽略
+            self._csv_writer = csv.DictWriter(self._export_file, fieldnames=list(row), extrasaction="ignore")
+            self._csv_writer.writeheader()
+        self._csv_writer.writerow(row)
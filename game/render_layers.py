@@ -0,0 +1,115 @@
+"""分层渲染：缓存的静态背景层、复用的动态层、脏矩形和实体绘制顺序"""
+import itertools
+import operator
+import numpy as np
+import pygame
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from config import ObjectType
+
+class StaticLayer:
+    """缓存不会移动的小行星，只在激活的障碍物集合或相机视角变化时重绘
+
+    backdrop 是背景色加小行星的不透明底图，每帧一次整块复制即可；
+    surface 只含小行星（色键透明，不用RLE以便快速局部复制），用于把小行星补画回压在上面的星星之上。
+    """
+    COLORKEY = (255, 0, 255)
+
+    def __init__(self, size: Tuple[int, int], background_color: Tuple[int, int, int]):
+        self.background_color = background_color
+        self.backdrop = pygame.Surface(size)
+        self.surface = pygame.Surface(size)
+        self.obstacle_rects: List[pygame.Rect] = []
+        self._obstacles: Optional[list] = None
+        self._view = None
+
+    def update(self, map_objects, view=None, screen: Optional[Dict] = None) -> bool:
+        """障碍物或视角（view为任意可比较的相机状态）变化时重绘缓存，返回是否重绘
+
+        screen 为物体到屏幕坐标的映射，不在其中的按自身位置绘制。
+        """
+        obstacles = [obj for obj in map_objects if obj.active and obj.type == ObjectType.OBSTACLE]
+        if obstacles == self._obstacles and view == self._view:
+            return False
+        self._obstacles = obstacles
+        self._view = view
+        self.surface.set_colorkey(None)
+        self.surface.fill(self.COLORKEY)
+        screen = screen or {}
+        for obj in obstacles:
+            obj.draw(self.surface, screen.get(obj))
+        self.surface.set_colorkey(self.COLORKEY)
+        self.backdrop.fill(self.background_color)
+        self.backdrop.blit(self.surface, (0, 0))
+        self.obstacle_rects = [obj.draw_bounds(screen.get(obj)) for obj in obstacles]
+        return True
+
+    def cover(self, screen: pygame.Surface, rects: Iterable[pygame.Rect], offset=(0, 0)):
+        """在与小行星重叠的区域重新画上小行星，使其遮住先画的星星"""
+        obstacle_rects = self.obstacle_rects
+        for rect in rects:
+            if rect.collidelist(obstacle_rects) != -1:
+                screen.blit(self.surface, rect.move(offset), rect)
+
+class TileMask:
+    """把屏幕划分为固定大小的格子，记录被内容覆盖的格子
+
+    带alpha的动态层合成时区域不能重叠（重叠处会被混合两次），
+    strips() 按行合并相邻格子，得到互不重叠的矩形条。
+    """
+
+    def __init__(self, size: Tuple[int, int], tile_size: int = 64):
+        self.tile_size = tile_size
+        self.screen_rect = pygame.Rect(0, 0, *size)
+        rows = -(-size[1] // tile_size)
+        cols = -(-size[0] // tile_size)
+        self.tiles = np.zeros((rows, cols), dtype=bool)
+
+    def clear(self):
+        self.tiles[:] = False
+
+    def add(self, rects: Iterable[pygame.Rect]):
+        """标记与这些矩形相交的格子"""
+        t = self.tile_size
+        tiles = self.tiles
+        screen_rect = self.screen_rect
+        for rect in rects:
+            rect = rect.clip(screen_rect)
+            if rect.width and rect.height:
+                tiles[rect.top // t:(rect.bottom - 1) // t + 1, rect.left // t:(rect.right - 1) // t + 1] = True
+
+    def coverage(self) -> float:
+        """被标记格子占全部格子的比例"""
+        return float(self.tiles.mean())
+
+    def strips(self) -> List[pygame.Rect]:
+        """被标记区域按行合并后的不重叠矩形"""
+        t = self.tile_size
+        rects = []
+        for row in np.flatnonzero(self.tiles.any(axis=1)).tolist():
+            line = np.concatenate(([0], self.tiles[row].view(np.int8), [0]))
+            edges = np.flatnonzero(np.diff(line)).tolist()
+            for start, end in zip(edges[::2], edges[1::2]):
+                rects.append(pygame.Rect(start * t, row * t, (end - start) * t, t).clip(self.screen_rect))
+        return rects
+
+class DepthOrder:
+    """按y坐标从上到下的实体绘制顺序，跨帧保留
+
+    对象集合不变时（由调用方给出的token判断）直接对上一帧的顺序重新排序：
+    位置每帧只变化一点，列表接近有序，自适应排序只需线性时间。token为None时每帧重建。
+    """
+
+    _depth = operator.attrgetter("pos.y")
+
+    def __init__(self):
+        self._order: List = []
+        self._token: Optional[Hashable] = None
+
+    def update(self, groups: Iterable[Iterable], token: Optional[Hashable] = None) -> List:
+        """本帧的绘制顺序，groups为要绘制的各组对象"""
+        if token is None or token != self._token:
+            self._order = list(itertools.chain.from_iterable(groups))
+            self._token = token
+        self._order.sort(key=self._depth)
+        return self._order
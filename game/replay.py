@@ -0,0 +1,321 @@
+"""对局录像：记录种子和周期性的紧凑状态关键帧
+
+文件格式（小端）:
+    头部:   b"SWRP" | 版本 u16 | 种子 u64 | 关键帧间隔 u32 | 配置JSON长度 u32 | 配置JSON
+    关键帧: 压缩后长度 u32 | zlib(帧头 + 核心记录 + 舰船记录 + 地图物体激活位图)
+
+关键帧只保存绘制和统计面板需要的状态，用于快速回看，不用于继续模拟。
+
+回放时舰船和核心取自关键帧，只有地图按种子重新生成，因此版本号只在文件格式或地图生成改变时增加，
+模拟行为的改变不影响旧录像的回放：
+    2: 泊松圆盘地图生成
+    3: 稀疏地图改为均匀随机投点
+    4: 候选位置不足时重新铺设
+"""
+import bisect
+import json
+import math
+import struct
+import time
+import zlib
+from dataclasses import asdict, fields
+from typing import BinaryIO, Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from config import GameConfig, FPS
+from game.fleet_store import STATE_CODES
+from utils.vector2 import Vector2
+
+if TYPE_CHECKING:
+    from entities.ship import Ship
+    from game.simulator import SpaceWarSimulator
+
+MAGIC = b"SWRP"
+VERSION = 4
+
+_HEADER = struct.Struct("<4sHQII")
+_FRAME_HEADER = struct.Struct("<IHII")  # 帧号, 核心数, 舰船数, 地图物体数
+_LENGTH = struct.Struct("<I")
+
+CORE_DTYPE = np.dtype([
+    ("faction_id", "<u2"), ("x", "<f4"), ("y", "<f4"), ("vx", "<f4"), ("vy", "<f4"),
+    ("health", "<f4"), ("shield", "<f4"), ("resources", "<f4"),
+    ("kills", "<u4"), ("damage_dealt", "<f4"), ("damage_taken", "<f4"),
+])
+
+SHIP_DTYPE = np.dtype([
+    ("ship_id", "<u4"), ("x", "<f4"), ("y", "<f4"), ("angle", "<f4"),
+    ("health", "<f4"), ("state", "u1"), ("flags", "u1"),
+])
+
+# 舰船标志位
+FLAG_MOVING = 1
+FLAG_BUFF = 2
+FLAG_DEBUFF = 4
+FLAG_DAMAGED = 8
+
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+
+def config_to_json(config: GameConfig) -> bytes:
+    return json.dumps(asdict(config)).encode("utf-8")
+
+def config_from_json(data: bytes) -> GameConfig:
+    values = json.loads(data.decode("utf-8"))
+    known = {f.name for f in fields(GameConfig)}
+    return GameConfig(**{
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in values.items() if name in known
+    })
+
+class ReplayRecorder:
+    """每隔固定帧数把模拟器状态写成一个关键帧"""
+
+    def __init__(self, path: str, simulator: 'SpaceWarSimulator', interval: int = 30):
+        self.interval = max(1, interval)
+        self.file: Optional[BinaryIO] = open(path, "wb")
+        config_json = config_to_json(simulator.config)
+        self.file.write(_HEADER.pack(MAGIC, VERSION, simulator.seed, self.interval, len(config_json)))
+        self.file.write(config_json)
+        self.keyframes_written = 0
+        self.write_keyframe(simulator)
+
+    def on_tick(self, simulator: 'SpaceWarSimulator'):
+        """每个逻辑帧结束后调用"""
+        if simulator.tick % self.interval == 0:
+            self.write_keyframe(simulator)
+
+    def write_keyframe(self, simulator: 'SpaceWarSimulator'):
+        """编码并写入当前状态"""
+        if self.file is None:
+            return
+        cores = simulator.cores
+        core_records = np.array([
+            (core.faction_id, core.pos.x, core.pos.y, core.velocity.x, core.velocity.y,
+             core.health, core.shield_energy, core.resources,
+             core.total_kills, core.total_damage_dealt, core.total_damage_taken)
+            for core in cores
+        ], dtype=CORE_DTYPE)
+
+        ships = [ship for core in cores for ship in core.ships if ship.health > 0]
+        ship_records = np.array([
+            (ship.ship_id, ship.pos.x, ship.pos.y, ship.angle, ship.health,
+             STATE_CODES.get(ship.state, 0),
+             (FLAG_MOVING if ship.is_moving else 0) | (FLAG_BUFF if ship.buffs else 0) |
+             (FLAG_DEBUFF if ship.debuffs else 0) | (FLAG_DAMAGED if ship.damage_flash_timer > 0 else 0))
+            for ship in ships
+        ], dtype=SHIP_DTYPE)
+
+        active = np.packbits(np.array([obj.active for obj in simulator.map_objects], dtype=bool))
+        payload = b"".join((
+            _FRAME_HEADER.pack(simulator.tick, len(cores), len(ships), len(simulator.map_objects)),
+            core_records.tobytes(), ship_records.tobytes(), active.tobytes()
+        ))
+        compressed = zlib.compress(payload, 6)
+        self.file.write(_LENGTH.pack(len(compressed)))
+        self.file.write(compressed)
+        self.keyframes_written += 1
+
+    def close(self):
+        """关闭录像文件"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class ReplayReader:
+    """读取录像文件并按需解码关键帧"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, self.interval, config_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"不支持的录像文件: {path}")
+        offset = _HEADER.size
+        self.config = config_from_json(data[offset:offset + config_len])
+        offset += config_len
+
+        self._data = data
+        self._decoded: Dict[int, Dict[str, object]] = {}
+        self._frames = []  # (偏移, 长度)
+        self.ticks: List[int] = []
+        while offset + _LENGTH.size <= len(data):
+            (length,) = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            if offset + length > len(data):
+                break  # 录制中断时丢弃不完整的最后一帧
+            self._frames.append((offset, length))
+            head = zlib.decompressobj().decompress(data[offset:offset + length], _FRAME_HEADER.size)
+            self.ticks.append(_FRAME_HEADER.unpack_from(head, 0)[0])
+            offset += length
+
+    def __len__(self):
+        return len(self._frames)
+
+    def index_at(self, tick: int) -> int:
+        """不晚于tick的最后一个关键帧序号"""
+        return max(0, bisect.bisect_right(self.ticks, tick) - 1)
+
+    def keyframe(self, index: int) -> Dict[str, object]:
+        """解码第index个关键帧（保留最近解码的几帧）"""
+        frame = self._decoded.get(index)
+        if frame is None:
+            frame = self._decode(index)
+            if len(self._decoded) >= 4:
+                self._decoded.pop(next(iter(self._decoded)))
+            self._decoded[index] = frame
+        return frame
+
+    def _decode(self, index: int) -> Dict[str, object]:
+        offset, length = self._frames[index]
+        payload = zlib.decompress(self._data[offset:offset + length])
+        tick, num_cores, num_ships, num_objects = _FRAME_HEADER.unpack_from(payload, 0)
+        pos = _FRAME_HEADER.size
+        cores = np.frombuffer(payload, CORE_DTYPE, num_cores, pos)
+        pos += cores.nbytes
+        ships = np.frombuffer(payload, SHIP_DTYPE, num_ships, pos)
+        pos += ships.nbytes
+        active = np.unpackbits(np.frombuffer(payload, np.uint8, offset=pos), count=num_objects).astype(bool)
+        return {"tick": tick, "cores": cores, "ships": ships, "map_objects_active": active}
+
+class ReplayPlayer:
+    """把关键帧状态套用到模拟器对象上进行绘制，关键帧之间做线性插值"""
+
+    def __init__(self, path: str):
+        from game.simulator import SpaceWarSimulator
+        self.reader = ReplayReader(path)
+        # 相同种子会生成相同的地图和核心
+        self.simulator = SpaceWarSimulator(self.reader.config, headless=True, seed=self.reader.seed)
+        self._cores = {core.faction_id: core for core in self.simulator.all_cores}
+        self._ships: Dict[int, 'Ship'] = {}
+        self.tick = 0
+        self.speed = 1.0
+        self.paused = False
+
+    @property
+    def last_tick(self) -> int:
+        return self.reader.ticks[-1] if self.reader.ticks else 0
+
+    def show(self, tick: float):
+        """把模拟器状态设置为tick时刻（在相邻关键帧之间插值）"""
+        index = self.reader.index_at(int(tick))
+        frame = self.reader.keyframe(index)
+        next_frame = self.reader.keyframe(index + 1) if index + 1 < len(self.reader) else None
+        alpha = 0.0
+        if next_frame is not None and next_frame["tick"] > frame["tick"]:
+            alpha = min(1.0, max(0.0, (tick - frame["tick"]) / (next_frame["tick"] - frame["tick"])))
+
+        sim = self.simulator
+        sim.tick = int(tick)
+        sim.cores = self._apply_cores(frame["cores"], next_frame["cores"] if next_frame else None, alpha)
+        self._apply_ships(frame["ships"], next_frame["ships"] if next_frame else None, alpha)
+        for obj, active in zip(sim.map_objects, frame["map_objects_active"]):
+            obj.active = bool(active)
+        sim.rebuild_ship_grid()
+
+    def _apply_cores(self, records, next_records, alpha: float):
+        next_by_faction = {int(r["faction_id"]): r for r in next_records} if next_records is not None else {}
+        for core in self._cores.values():
+            core.ships.clear()
+        cores = []
+        for r in records:
+            core = self._cores[int(r["faction_id"])]
+            x, y = float(r["x"]), float(r["y"])
+            nxt = next_by_faction.get(int(r["faction_id"]))
+            if nxt is not None:
+                x += (float(nxt["x"]) - x) * alpha
+                y += (float(nxt["y"]) - y) * alpha
+            core.pos = Vector2(x, y)
+            core.velocity = Vector2(float(r["vx"]), float(r["vy"]))
+            core.health = float(r["health"])
+            core.shield_energy = float(r["shield"])
+            core.resources = float(r["resources"])
+            core.total_kills = int(r["kills"])
+            core.total_damage_dealt = float(r["damage_dealt"])
+            core.total_damage_taken = float(r["damage_taken"])
+            cores.append(core)
+        return cores
+
+    def _apply_ships(self, records, next_records, alpha: float):
+        from entities.ship import Ship
+        sim = self.simulator
+        next_by_id = {int(r["ship_id"]): r for r in next_records} if next_records is not None else {}
+        live = {}
+        for r in records:
+            ship_id = int(r["ship_id"])
+            faction_id = ship_id >> 20
+            core = self._cores.get(faction_id)
+            if core is None or core not in sim.cores:
+                continue
+            ship = self._ships.get(ship_id)
+            if ship is None:
+                ship = Ship(Vector2(0, 0), faction_id, sim.config, sim.rng, ship_id)
+
+            x, y, angle = float(r["x"]), float(r["y"]), float(r["angle"])
+            nxt = next_by_id.get(ship_id)
+            if nxt is not None:
+                x += (float(nxt["x"]) - x) * alpha
+                y += (float(nxt["y"]) - y) * alpha
+                turn = (float(nxt["angle"]) - angle + math.pi) % (2 * math.pi) - math.pi
+                angle += turn * alpha
+            ship.pos = Vector2(x, y)
+            ship.angle = angle
+            ship.health = float(r["health"])
+            ship.state = STATE_NAMES.get(int(r["state"]), "patrol")
+            flags = int(r["flags"])
+            ship.is_moving = bool(flags & FLAG_MOVING)
+            ship.buffs = [(1.0, 1)] if flags & FLAG_BUFF else []
+            ship.debuffs = [(1.0, 1)] if flags & FLAG_DEBUFF else []
+            ship.damage_flash_timer = 1 if flags & FLAG_DAMAGED else 0
+            core.ships.add(ship)
+            live[ship_id] = ship
+        self._ships = live
+
+    def run(self):
+        """回放主循环：空格暂停，左右方向键快退/快进10秒，上下方向键调整倍速，ESC退出
+
+        视角操作与对局相同：WASD/右键拖动平移，滚轮缩放，Home复位。
+        """
+        sim = self.simulator
+        sim.attach_viewer()
+        pygame.display.set_caption("太空战争模拟器 - 录像回放")
+        running = True
+        while running:
+            start = time.perf_counter()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    running = self._handle_key_press(event.key)
+                else:
+                    sim.handle_camera_event(event)
+            sim.update_camera(1.0 / FPS)
+
+            if not self.paused:
+                self.tick = min(self.tick + self.speed, self.last_tick)
+            self.show(self.tick)
+            sim.paused = self.paused
+            sim.game_start_time = time.time() - sim.tick / FPS
+            sim.draw()
+            sim.quality.observe((time.perf_counter() - start) * 1000)
+            sim.clock.tick(FPS)
+        pygame.quit()
+
+    def _handle_key_press(self, key) -> bool:
+        """处理回放按键"""
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_RIGHT:
+            self.tick = min(self.tick + 10 * FPS, self.last_tick)
+        elif key == pygame.K_LEFT:
+            self.tick = max(self.tick - 10 * FPS, 0)
+        elif key == pygame.K_UP:
+            self.speed = min(self.speed * 2, 64.0)
+        elif key == pygame.K_DOWN:
+            self.speed = max(self.speed / 2, 0.25)
+        elif key == pygame.K_HOME:
+            self.simulator.camera.reset()
+        elif key == pygame.K_ESCAPE:
+            return False
+        return True
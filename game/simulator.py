@@ -1,32 +1,99 @@
 """游戏模拟器主逻辑"""
 import pygame
+import numpy as np
 import random
 import math
 import time
-from typing import List
+import itertools
+from typing import Dict, List, Optional, Tuple
 
-from config import GameConfig, ObjectType, SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from config import GameConfig, ObjectType, SCREEN_WIDTH, SCREEN_HEIGHT, FPS, SIM_DT
 from utils.vector2 import Vector2
+from utils.spatial_grid import SpatialHashGrid
 from utils.colors import *
-from entities import Core, Ship, Projectile, Explosion, MapObject
+from utils.rng import cosmetic_rng, new_seed
+from entities import Core, Ship, ProjectileSystem, ProjectileFrame, MapObject, ParticleSystem
+from game.fleet_store import FleetStore
+from game.factions import FactionRegistry
+from game.core_physics import ObstacleIndex, core_gravity
+from game.map_gen import PoissonDiskSampler, report_shortfall
+from game.camera import Camera, VisibleSet
+from game.profiler import FrameProfiler
+from game.render_layers import DepthOrder, StaticLayer, TileMask
 from ui.stats_panel import FleetStatsPanel
+from ui.profiler_overlay import ProfilerOverlay
+from utils.sprite_cache import sprite_cache
+from utils.text_cache import text_cache
+from utils.roster import Roster
+from utils.quality import QualityGovernor, render_quality
+from utils.ship_sprites import ship_atlas
 
 class SpaceWarSimulator:
     """太空战争模拟器主类"""
     
-    def __init__(self, config: GameConfig = None):
+    MAX_FRAME_TIME = 0.25        # 单帧计入累加器的最长时间（秒）
+    MAX_TICKS_PER_FRAME = 8      # 每个渲染帧最多追赶的逻辑帧数
+    BACKGROUND_COLOR = (5, 5, 15)  # 深空背景
+    MAX_LAYER_COVERAGE = 0.6     # 动态层内容超过该比例时整层清空/合成
+    MAX_DIRTY_COVERAGE = 0.6     # 脏区域超过该比例时改为整屏重绘
+    CAMERA_PAN_SPEED = 900.0     # 键盘平移速度（屏幕像素/秒）
+    CAMERA_ZOOM_STEP = 1.1       # 滚轮每格的缩放倍数
+    
+    def __init__(self, config: GameConfig = None, headless: bool = False, seed: Optional[int] = None,
+                 snapshot: Optional[bytes] = None):
+        """snapshot不为None时从快照恢复对局（配置取自快照），否则按config和seed新建"""
         self.config = config or GameConfig()
+        self.headless = headless
+        self.dt = SIM_DT
+        self.screen = None
+        self.clock = None
+        self.camera = None
+        self.recorder = None
+        self.telemetry = None
+        self.profiler = FrameProfiler()
+        self.rng = random.Random()
+        self.projectiles = ProjectileSystem()
+        self._init_game_state()
+        if snapshot is None:
+            self.initialize_game(seed)
+        else:
+            self.restore(snapshot)
+        
+        # 无界面模式下渲染、字体与UI在挂载显示时才创建
+        if not headless:
+            self.attach_viewer()
+            
+    def attach_viewer(self):
+        """挂载显示窗口，惰性初始化渲染、字体和UI"""
+        if self.screen is not None:
+            return
+        if not pygame.get_init():
+            pygame.init()
         self._init_pygame()
         self._init_fonts()
-        self._init_game_state()
         self._init_ui()
-        self.initialize_game()
+        self.headless = False
         
     def _init_pygame(self):
         """初始化Pygame"""
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("太空战争模拟器 - 增强版")
         self.clock = pygame.time.Clock()
+        self.quality = QualityGovernor(self.config.quality_frame_budget_ms)
+        ship_atlas.configure(self.config.ship_sprite_angles)
+        self.camera = Camera((SCREEN_WIDTH, SCREEN_HEIGHT), (self.config.world_width, self.config.world_height))
+        
+        # 渲染层：缓存的小行星层 + 每帧清空复用的动态层
+        self.static_layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), self.BACKGROUND_COLOR)
+        self.dynamic_layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        
+        # 动态层内容所在的格子：清空上一帧的、合成本帧的，避免整屏填充和alpha合成
+        size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self._layer_tiles = TileMask(size)
+        self._prev_layer_tiles = TileMask(size)
+        self._dirty_tiles = TileMask(size)
+        self._prev_star_rects = []
+        self._screen_valid = False  # 上一帧的屏幕内容能否作为脏矩形更新的基础
         
     def _init_fonts(self):
         """初始化字体"""
@@ -42,129 +109,358 @@ class SpaceWarSimulator:
         self.paused = False
         self.show_stats = True
         self.screen_shake = 0
+        self.tick = 0
         self.game_start_time = time.time()
+        self._heal_effects = 0
         
     def _init_ui(self):
         """初始化UI组件"""
-        self.stats_panel = FleetStatsPanel(self.font, self.small_font)
+        self.stats_panel = FleetStatsPanel(self.font, self.small_font, self.config.stats_panel_refresh_hz)
+        self._control_panel_surface = None
+        self.profiler_overlay = ProfilerOverlay(self.small_font)
         
-    def initialize_game(self):
-        """初始化游戏世界"""
+    def initialize_game(self, seed: Optional[int] = None):
+        """初始化游戏世界，相同种子和配置得到完全相同的对局"""
+        self.stop_recording()
+        self.stop_telemetry()
+        self.seed = new_seed() if seed is None else seed
+        self.rng.seed(self.seed)
         self._reset_game_objects()
         self._create_starfield()
         self._create_faction_cores()
         self._create_map_objects()
+        self.rebuild_ship_grid()
+        self.tick = 0
         self.game_start_time = time.time()
+        if self.screen is not None:
+            self.stats_panel.invalidate()
         
     def _reset_game_objects(self):
         """重置游戏对象"""
         self.cores: List[Core] = []
+        self.all_cores: List[Core] = []  # 包括已被摧毁的核心，用于赛后统计
+        self.factions = FactionRegistry()
+        self.depth_order = DepthOrder()
         self.map_objects: List[MapObject] = []
-        self.projectiles: List[Projectile] = []
-        self.effects: List[Explosion] = []
+        self.projectiles.clear()
+        self.particles = ParticleSystem(seed=cosmetic_rng.getrandbits(32))
+        self.ship_grid = SpatialHashGrid(self.config.ship_attack_range / 4)
+        self.obstacle_index = ObstacleIndex()
+        self._attach_fleet_store()
+        
+        # 地图物体的空间索引，用于舰船拾取和视口裁剪：地图物体不移动，列表变化时重建
+        self.map_object_grid = SpatialHashGrid(256)
+        self.map_object_reach = 0.0  # 舰船中心与地图物体中心的最大接触距离
+        
+    def _attach_fleet_store(self):
+        """启用数组后端时新建舰队数组，挂接在全局舰船名单下随之增删"""
+        self.fleet_store = FleetStore() if self.config.use_fleet_arrays else None
+        if self.fleet_store is not None:
+            self.factions.ships.attach(self.fleet_store)
         
     def _create_starfield(self):
         """创建星空背景"""
         self.stars = []
         for _ in range(200):
-            star_size = random.uniform(0.5, 2.5)
-            star_brightness = random.uniform(0.3, 1.0)
+            star_size = cosmetic_rng.uniform(0.5, 2.5)
+            star_brightness = cosmetic_rng.uniform(0.3, 1.0)
             self.stars.append([
-                (random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT)), 
+                (cosmetic_rng.randint(0, SCREEN_WIDTH), cosmetic_rng.randint(0, SCREEN_HEIGHT)), 
                 star_size, 
                 star_brightness,
-                random.uniform(0.2, 1.5)  # 移动速度
+                cosmetic_rng.uniform(0.2, 1.5)  # 移动速度
             ])
             
     def _create_faction_cores(self):
         """创建阵营核心"""
-        for i in range(self.config.num_factions):
-            attempts = 0
-            while attempts < 100:
-                pos = Vector2(
-                    random.randint(250, SCREEN_WIDTH - 250),
-                    random.randint(250, SCREEN_HEIGHT - 250)
-                )
-                if all(pos.distance_to(c.pos) > 350 for c in self.cores):
-                    self.cores.append(Core(pos, i, self.config))
-                    break
-                attempts += 1
+        sampler = PoissonDiskSampler((250, 250, self.config.world_width - 250, self.config.world_height - 250),
+                                     {"core": self.config.core_spacing}, self.rng)
+        placed = sampler.sample(["core"] * self.config.num_factions)
+        for i, (_, pos) in enumerate(placed):
+            core = Core(pos, i, self.config, self.rng)
+            self.cores.append(core)
+            self.all_cores.append(core)
+            self.factions.register(core)
+        report_shortfall("核心", self.config.num_factions, len(placed),
+                         sampler.capacity_estimate(self.config.core_spacing))
                 
     def _create_map_objects(self):
         """创建地图物体"""
         obj_types = [ObjectType.OBSTACLE, ObjectType.RESOURCE, ObjectType.BUFF, ObjectType.DEBUFF]
         weights = [0.65, 0.18, 0.10, 0.07]
+        spacing = {obj_type: getattr(self.config, f"{obj_type.value}_spacing") for obj_type in obj_types}
+        exclusions = [(core.pos, self.config.core_exclusion_radius) for core in self.cores]
         
-        for _ in range(self.config.map_objects_count):
-            obj_type = random.choices(obj_types, weights=weights, k=1)[0]
-            attempts = 0
-            while attempts < 50:
-                pos = Vector2(
-                    random.randint(120, SCREEN_WIDTH - 120),
-                    random.randint(120, SCREEN_HEIGHT - 120)
-                )
-                if (all(pos.distance_to(c.pos) > 180 for c in self.cores) and 
-                    all(pos.distance_to(o.pos) > 120 for o in self.map_objects)):
-                    size_range = getattr(self.config, f"{obj_type.value}_size_range")
-                    obj = MapObject(pos, random.uniform(*size_range), obj_type)
-                    self.map_objects.append(obj)
-                    break
-                attempts += 1
+        sampler = PoissonDiskSampler((120, 120, self.config.world_width - 120, self.config.world_height - 120),
+                                     spacing, self.rng, exclusions)
+        kinds = self.rng.choices(obj_types, weights=weights, k=self.config.map_objects_count)
+        placed = sampler.sample(kinds)
+        for obj_type, pos in placed:
+            size_range = getattr(self.config, f"{obj_type.value}_size_range")
+            self.map_objects.append(MapObject(pos, self.rng.uniform(*size_range), obj_type, self.rng))
+        report_shortfall("地图物体", self.config.map_objects_count, len(placed),
+                         sampler.capacity_estimate(min(spacing.values())))
+        self.rebuild_map_object_grid()
                 
     def update(self):
         """更新游戏状态"""
         if self.paused:
             return
             
-        self._update_map_objects()
-        self._update_entities()
-        self._update_effects()
-        self._cleanup_objects()
-        self._handle_object_respawn()
-        self._update_screen_shake()
+        profiler = self.profiler
+        with profiler.section("update.map_objects"):
+            self._update_map_objects()
+        with profiler.section("update.entities"):
+            self._update_entities()
+        with profiler.section("update.effects"):
+            self._update_effects()
+        with profiler.section("update.cleanup"):
+            self._cleanup_objects()
+            self._handle_object_respawn()
+            self._update_screen_shake()
+            self.rebuild_ship_grid()
+        self.tick += 1
+        
+        if profiler.enabled:
+            profiler.count("ships", len(self.factions.ships))
+            profiler.count("projectiles", len(self.projectiles))
+            profiler.count("particles", self.particles.count)
+            profiler.count("projectile_capacity", self.projectiles.capacity)
+            profiler.count("particle_capacity", self.particles.capacity)
+            profiler.count("array_grows", self.projectiles.grows + self.particles.grows)
+        if self.recorder is not None:
+            self.recorder.on_tick(self)
+        if self.telemetry is not None:
+            self.telemetry.on_tick(self)
+        
+    def step(self, n: int = 1) -> int:
+        """无渲染推进n个逻辑帧，返回实际推进的帧数"""
+        start_tick = self.tick
+        for _ in range(n):
+            self.update()
+            self.profiler.end_frame()
+        return self.tick - start_tick
+        
+    def run_until(self, max_ticks: Optional[int] = None) -> Optional[int]:
+        """无渲染全速运行直到分出胜负或达到帧数上限，返回获胜阵营ID"""
+        while not self.is_game_over():
+            if max_ticks is not None and self.tick >= max_ticks:
+                break
+            self.update()
+            self.profiler.end_frame()
+        return self.winner
+        
+    def start_recording(self, path: str, interval: int = 30):
+        """开始录制当前对局（种子 + 每interval帧一个关键帧）"""
+        from game.replay import ReplayRecorder
+        self.stop_recording()
+        self.recorder = ReplayRecorder(path, self, interval)
+        
+    def stop_recording(self):
+        """写入最终状态并结束录制"""
+        if self.recorder is not None:
+            if self.tick % self.recorder.interval != 0:
+                self.recorder.write_keyframe(self)
+            self.recorder.close()
+            self.recorder = None
+            
+    def snapshot(self) -> bytes:
+        """当前逻辑状态的二进制快照（在两个逻辑帧之间调用）"""
+        from game.snapshot import encode_snapshot
+        return encode_snapshot(self)
+        
+    def restore(self, data: bytes):
+        """恢复 snapshot() 保存的状态，进行中的录像和遥测随之结束"""
+        from game.snapshot import decode_snapshot
+        state = decode_snapshot(data, self.rng)
+        self.stop_recording()
+        self.stop_telemetry()
+        self.config = state.config
+        self._reset_game_objects()
+        self._create_starfield()
+        self.seed = state.seed
+        self.tick = state.tick
+        self.screen_shake = state.screen_shake
+        self.rng.setstate(state.rng_state)
+        self.all_cores = state.all_cores
+        self.cores = state.cores
+        self.factions.rebuild(self.all_cores, state.live_ships)
+        self._attach_fleet_store()
+        self.map_objects = state.map_objects
+        self.rebuild_map_object_grid()
+        self.projectiles.set_state(state.projectile_arrays, state.projectile_targets)
+        self.rebuild_ship_grid()
+        if self.screen is not None:
+            if (self.camera.world_width, self.camera.world_height) != (self.config.world_width, self.config.world_height):
+                self.camera = Camera((SCREEN_WIDTH, SCREEN_HEIGHT), (self.config.world_width, self.config.world_height))
+            self.stats_panel.invalidate()
+            
+    def fork(self) -> 'SpaceWarSimulator':
+        """复制当前对局为独立的无界面模拟器，两者此后互不影响，用于并行评估不同分支"""
+        return SpaceWarSimulator(headless=True, snapshot=self.snapshot())
+        
+    def start_telemetry(self, directory: str, interval: int = 30):
+        """开始把各阵营指标每interval帧采样一次，由后台线程写入directory"""
+        from game.telemetry import TelemetryRecorder
+        self.stop_telemetry()
+        self.telemetry = TelemetryRecorder(directory, self, interval)
+        
+    def stop_telemetry(self):
+        """采样最终状态，等待遥测数据写完"""
+        if self.telemetry is not None:
+            if self.tick % self.telemetry.interval != 0:
+                self.telemetry.sample(self)
+            telemetry, self.telemetry = self.telemetry, None
+            telemetry.close()
+            
+    def is_game_over(self) -> bool:
+        """是否已分出胜负（剩余核心不超过一个）"""
+        return len(self.cores) <= 1
+        
+    @property
+    def winner(self) -> Optional[int]:
+        """获胜阵营ID，未结束或平局时为None"""
+        if len(self.cores) == 1:
+            return self.cores[0].faction_id
+        return None
+        
+    def faction_stats(self) -> List[dict]:
+        """各阵营（含已被摧毁的）统计数据"""
+        return [
+            {
+                "faction_id": core.faction_id,
+                "alive": core.health > 0,
+                "core_health": core.health,
+                "ships": len(core.ships),
+                "kills": core.total_kills,
+                "damage_dealt": core.total_damage_dealt,
+                "damage_taken": core.total_damage_taken,
+            }
+            for core in self.all_cores
+        ]
         
     def _update_map_objects(self):
         """更新地图物体"""
         for obj in self.map_objects:
             if obj.active:
-                obj.update()
+                obj.update(self.dt)
                 
     def _update_entities(self):
         """更新游戏实体"""
-        active_cores = [core for core in self.cores if core.health > 0]
-        all_ships = [ship for core in active_cores for ship in core.ships]
+        # 被摧毁的核心和舰船在上一帧末已移出名单（帧间从外部摧毁的核心在更新中被跳过）
+        self.obstacle_index.sync(self.map_objects)
+        
+        if self.fleet_store is not None:
+            self._update_fleet_batched(self.cores, self.factions.ships)
+        else:
+            self._update_cores_and_ships(self.cores, self.factions.ships)
+                
+        # 更新子弹
+        self.projectiles.update(self, self.dt)
+            
+    def rebuild_map_object_grid(self):
+        """地图物体列表变化后重建其空间索引和最大接触距离，并记下每个物体在列表中的位置"""
+        for index, obj in enumerate(self.map_objects):
+            obj.index = index
+        self.map_object_grid.rebuild(self.map_objects)
+        self.map_object_reach = max((obj.size for obj in self.map_objects), default=0.0) + Ship.PICKUP_MARGIN
+        
+    def rebuild_ship_grid(self):
+        """按当前位置重建全部存活舰船的空间索引，供下一帧AI查询和视口裁剪使用"""
+        self.ship_grid.rebuild(self.factions.ships)
         
+        
+    def _update_cores_and_ships(self, active_cores: List[Core], all_ships: Roster[Ship]):
+        """逐个更新核心及其舰船"""
         # 更新核心
-        for core in active_cores:
+        forces = self._core_gravity(active_cores)
+        for i, core in enumerate(active_cores):
             if core.health <= 0:
                 continue
-            core.update(self.config, self.map_objects, active_cores)
-            core.ships = [ship for ship in core.ships if ship.health > 0]
+            core.update(self.config, self.map_objects, active_cores, self.dt,
+                        forces[i], self.obstacle_index)
             
             # 更新舰船
             for ship in core.ships: 
-                ship.update(self.config, all_ships, active_cores, self.map_objects, self)
+                ship.update(self.config, all_ships, active_cores, self.map_objects, self, self.dt)
                 
-        # 更新子弹
-        for proj in self.projectiles:
-            proj.update(self)
+    def _core_gravity(self, active_cores: List[Core]) -> List[Tuple[float, float]]:
+        """按帧初的位置一次算出全部核心受到的引力：核心较少时逐对循环，较多时向量化批量计算
+        
+        两种方式都在任何核心移动之前计算，结果只相差浮点舍入，同一种子的对局不随核心数量改变算法语义。
+        """
+        if len(active_cores) < self.config.core_batch_gravity_threshold:
+            return [core._gravity_force(self.config, active_cores) for core in active_cores]
+        positions = np.array([(core.pos.x, core.pos.y) for core in active_cores])
+        masses = np.array([core.mass if core.health > 0 else 0.0 for core in active_cores])
+        return core_gravity(positions, masses, self.config.gravity_strength,
+                            self.config.core_barnes_hut_threshold, self.config.barnes_hut_theta).tolist()
+        
+    def _update_fleet_batched(self, active_cores: List[Core], ships: Roster[Ship]):
+        """先更新全部核心，再以数组批量完成全部舰船的运动"""
+        forces = self._core_gravity(active_cores)
+        for i, core in enumerate(active_cores):
+            core.update(self.config, self.map_objects, active_cores, self.dt,
+                        forces[i], self.obstacle_index)
+            
+        target_positions = [ship.plan_move(self.config, ships, active_cores, self) for ship in ships]
+        
+        self.fleet_store.set_targets(target_positions)
+        self.fleet_store.step(self.config, self.dt)
+        self.fleet_store.store()
+        
+        for ship in ships:
+            ship.finish_move(self.config, self.map_objects, self, self.dt)
             
+    def spawn_projectile(self, pos: Vector2, target, damage: float, color):
+        """从pos向target发射一枚子弹"""
+        self.projectiles.spawn(pos, target, damage, color)
+        
+    def spawn_explosion(self, pos: Vector2, color, num_particles: int = 150,
+                        particle_size_range=(3, 8), duration_range=(60, 120)):
+        """在pos处向粒子系统写入一次爆炸，粒子数随画质缩减；无界面时没有画面，不产生粒子"""
+        if self.headless:
+            return
+        self.particles.emit(pos, color, render_quality.particles(num_particles),
+                            particle_size_range, duration_range)
+        
+    def spawn_explosions(self, positions: np.ndarray, colors: np.ndarray, num_particles: int,
+                         particle_size_range, duration_range):
+        """在多处同时产生同样规模的爆炸，positions为 (k, 2)，colors为 (k, 3)"""
+        if self.headless:
+            return
+        self.particles.emit_many(positions, colors, render_quality.particles(num_particles),
+                                 particle_size_range, duration_range)
+        
+    def spawn_heal_effect(self, pos: Vector2):
+        """治疗粒子，画质降低时只产生其中一部分"""
+        self._heal_effects += 1
+        if self._heal_effects % render_quality.heal_effect_interval == 0:
+            self.spawn_explosion(pos, HEAL_GREEN, 2, (1, 3), (10, 20))
+        
+    def pool_stats(self) -> dict:
+        """子弹和粒子数组的占用、容量和扩容次数（预分配数组取代了逐对象的对象池）"""
+        return {
+            "projectiles": self.projectiles.stats(),
+            "particles": self.particles.stats(),
+        }
+        
     def _update_effects(self):
-        """更新特效"""
-        for effect in self.effects:
-            effect.update()
+        """更新特效（粒子只用于绘制，无界面时跳过）"""
+        if not self.headless:
+            self.particles.update(self.dt)
             
     def _cleanup_objects(self):
         """清理无效对象"""
-        self.projectiles = [p for p in self.projectiles if p.lifetime > 0]
-        self.effects = [e for e in self.effects if hasattr(e, 'particles') and e.particles]
+        self.projectiles.compact()
+        self.factions.remove_destroyed()
         self.cores = [core for core in self.cores if core.health > 0]
         
     def _handle_object_respawn(self):
         """处理地图物体重生"""
         inactive_objects = [o for o in self.map_objects if not o.active]
-        if len(inactive_objects) > 0 and random.random() < 0.002:
-            obj = random.choice(inactive_objects)
+        if len(inactive_objects) > 0 and self.rng.random() < 0.002:
+            obj = self.rng.choice(inactive_objects)
             obj.active = True
             
     def _update_screen_shake(self):
@@ -172,76 +468,265 @@ class SpaceWarSimulator:
         if self.screen_shake > 0:
             self.screen_shake -= 1
             
-    def draw(self):
-        """绘制游戏画面"""
+    def _interpolated_objects(self):
+        """需要插值绘制的运动实体"""
+        for core in self.cores:
+            yield core
+            yield from core.ships
+        
+    def _snapshot_positions(self):
+        """记录逻辑帧开始前的位置，供插值绘制使用"""
+        for obj in self._interpolated_objects():
+            obj.prev_pos = (obj.pos.x, obj.pos.y)
+        self.projectiles.snapshot_positions()
+            
+    def _visible_objects(self, alpha: float) -> VisibleSet:
+        """本帧需要绘制的对象：相机不做变换时为全部对象，否则按视口范围做空间查询
+        
+        子弹和其余实体的本帧插值并换算后的屏幕坐标一并给出。
+        """
+        camera = self.camera
+        view = self._screen_view()
+        if camera.is_identity():
+            ships = self.factions.ships.items
+            projectiles = self.projectiles.frame(self.projectiles.select(), alpha, view)
+            screen = self._screen_positions(alpha, self.cores, ships, ())
+            return VisibleSet(self.map_objects, self.cores, ships, projectiles, screen)
+            
+        rect = camera.cull_rect()
+        left, top, right, bottom = rect
+        cores = [core for core in self.cores
+                 if left <= core.pos.x <= right and top <= core.pos.y <= bottom]
+        ships = [ship for ship in self.ship_grid.query_rect(left, top, right, bottom) if ship.health > 0]
+        projectiles = self.projectiles.frame(self.projectiles.select(rect), alpha, view)
+        map_objects = self.map_object_grid.query_rect(left, top, right, bottom)
+        screen = self._screen_positions(alpha, cores, ships, map_objects)
+        return VisibleSet(map_objects, cores, ships, projectiles, screen)
+        
+    def _screen_positions(self, alpha: float, cores, ships, map_objects) -> Dict[object, Tuple[float, float]]:
+        """可见实体本帧的屏幕坐标，与自身位置相同的不列出
+        
+        运动实体在前后两个逻辑帧之间插值；相机有平移缩放时再换算到屏幕。
+        只计算绘制位置，不修改实体本身的状态。
+        """
+        camera = self.camera
+        transform = not camera.is_identity()
+        screen = {}
+        if alpha >= 1.0 and not transform:
+            return screen
+        for obj in itertools.chain(cores, ships):
+            x, y = obj.pos.x, obj.pos.y
+            if alpha < 1.0 and obj.prev_pos is not None:
+                px, py = obj.prev_pos
+                x, y = px + (x - px) * alpha, py + (y - py) * alpha
+            elif not transform:
+                continue
+            screen[obj] = camera.to_screen(x, y) if transform else (x, y)
+            
+        if transform:
+            for obj in map_objects:
+                screen[obj] = camera.to_screen(obj.pos.x, obj.pos.y)
+        return screen
+                
+    def _view_key(self):
+        """静态层缓存对应的相机状态，默认视角为None"""
+        camera = self.camera
+        return None if camera.is_identity() else (camera.x, camera.y, camera.zoom)
+        
+    def _screen_view(self):
+        """粒子和子弹绘制用的视口变换 (x, y, zoom, 宽, 高)，默认视角为None"""
+        camera = self.camera
+        return None if camera.is_identity() else (camera.x, camera.y, camera.zoom, SCREEN_WIDTH, SCREEN_HEIGHT)
+                
+    def draw(self, alpha: float = 1.0):
+        """绘制游戏画面，alpha为当前时刻在上一与当前逻辑帧之间的插值比例"""
+        if self.screen is None:
+            self.attach_viewer()
+            
+        profiler = self.profiler
+        blits_before = sprite_cache.hits + sprite_cache.misses
         shake_x, shake_y = self._calculate_screen_shake()
         
-        self.screen.fill((5, 5, 15))  # 深空背景
-        temp_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        offset = (shake_x, shake_y)
+        layer = self.dynamic_layer
         
-        self._draw_starfield(temp_surface)
-        self._draw_map_objects(temp_surface)
-        self._draw_entities(temp_surface)
-        self._draw_projectiles(temp_surface)
-        self._draw_effects(temp_surface)
+        self._update_starfield()
+        with profiler.section("draw.cull"):
+            visible = self._visible_objects(alpha)
+        with profiler.section("draw.background"):
+            static_changed = self.static_layer.update(visible.map_objects, self._view_key(), visible.screen)
+            self._mark_layer_tiles(visible)
+            dirty = self._screen_dirty_rects(static_changed, offset)
+            self._draw_background(offset, dirty)
+        with profiler.section("draw.map_objects"):
+            self._draw_map_objects(layer, visible)
+        with profiler.section("draw.entities"):
+            self._draw_entities(layer, visible)
+        with profiler.section("draw.projectiles"):
+            self._draw_projectiles(layer, visible.projectiles)
+        with profiler.section("draw.effects"):
+            self._draw_effects(layer)
         
-        # 应用屏幕震动
-        self.screen.blit(temp_surface, (shake_x, shake_y))
+        # 合成动态层（带屏幕震动偏移）
+        with profiler.section("draw.compose"):
+            self._compose_dynamic_layer(offset, dirty)
         
         # 绘制UI
         self._draw_ui()
-        pygame.display.flip()
+        if profiler.enabled:
+            profiler.count("sprite_blits", sprite_cache.hits + sprite_cache.misses - blits_before)
+            profiler.count("quality", self.quality.level)
+        self.profiler_overlay.draw(self.screen, profiler)
+        
+        with profiler.section("draw.present"):
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty + self._prev_star_rects)
+        self._screen_valid = offset == (0, 0) and not self.paused and not self.is_game_over()
         
     def _calculate_screen_shake(self):
         """计算屏幕震动偏移"""
-        shake_x = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
-        shake_y = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
+        shake_x = cosmetic_rng.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
+        shake_y = cosmetic_rng.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
         return shake_x, shake_y
         
-    def _draw_starfield(self, surface):
-        """绘制星空背景"""
+    def _content_rects(self, visible: VisibleSet):
+        """本帧动态层上所有内容的屏幕范围"""
+        screen = visible.screen
+        rects = [obj.draw_bounds(screen.get(obj)) for obj in visible.map_objects
+                 if obj.active and obj.type != ObjectType.OBSTACLE]
+        rects.extend(core.draw_bounds(screen.get(core)) for core in visible.cores)
+        rects.extend(ship.draw_bounds(screen.get(ship)) for ship in visible.ships)
+        rects.extend(self.projectiles.draw_bounds(visible.projectiles))
+        rects.extend(self.particles.draw_bounds(view=self._screen_view()))
+        return rects
+        
+    def _ui_rects(self):
+        """本帧UI面板的屏幕范围"""
+        rects = [self._control_panel_rect()]
+        for rect in (self.stats_panel.rect() if self.show_stats else None,
+                     self.profiler_overlay.rect(self.profiler)):
+            if rect is not None:
+                rects.append(rect)
+        return rects
+        
+    def _mark_layer_tiles(self, visible: VisibleSet):
+        """记录本帧动态层内容所在的格子，上一帧的留作清空用"""
+        self._prev_layer_tiles, self._layer_tiles = self._layer_tiles, self._prev_layer_tiles
+        self._layer_tiles.clear()
+        self._layer_tiles.add(self._content_rects(visible))
+        
+    def _screen_dirty_rects(self, static_changed: bool, offset):
+        """脏矩形模式下本帧需要重绘的屏幕区域，None表示整屏重绘
+        
+        区域为上一帧和本帧动态内容及UI面板所在的格子；星星单独按各自的范围更新。
+        """
+        if (not self.config.dirty_rect_rendering or not self._screen_valid
+                or static_changed or offset != (0, 0)):
+            return None
+        tiles = self._dirty_tiles
+        np.logical_or(self._layer_tiles.tiles, self._prev_layer_tiles.tiles, out=tiles.tiles)
+        tiles.add(self._ui_rects())
+        if tiles.coverage() > self.MAX_DIRTY_COVERAGE:
+            return None
+        return tiles.strips()
+        
+    def _visible_stars(self):
+        """按画质绘制的星星（前一部分）"""
+        return self.stars[:int(len(self.stars) * render_quality.star_fraction)]
+        
+    def _star_rects(self):
+        """每颗星星的屏幕范围"""
+        rects = []
+        for (x, y), size, _, _ in self._visible_stars():
+            radius = int(size * 1.2) + 1
+            rects.append(pygame.Rect(int(x) - radius, int(y) - radius, radius * 2 + 1, radius * 2 + 1))
+        return rects
+        
+    def _draw_background(self, offset, dirty):
+        """绘制背景底图和星空（小行星遮挡星星），并清空动态层上一帧的内容"""
+        backdrop = self.static_layer.backdrop
+        star_rects = self._star_rects()
+        if dirty is None:
+            if offset != (0, 0):
+                self.screen.fill(self.BACKGROUND_COLOR)  # 震动时露出的边缘
+            self.screen.blit(backdrop, offset)
+        else:
+            for rect in dirty + self._prev_star_rects + star_rects:
+                self.screen.blit(backdrop, rect, rect)
+        self._draw_starfield(self.screen, offset)
+        self.static_layer.cover(self.screen, star_rects, offset)
+        self._prev_star_rects = star_rects
+        
+        prev_tiles = self._prev_layer_tiles
+        if prev_tiles.coverage() > self.MAX_LAYER_COVERAGE:
+            self.dynamic_layer.fill((0, 0, 0, 0))
+        else:
+            for rect in prev_tiles.strips():
+                self.dynamic_layer.fill((0, 0, 0, 0), rect)
+                
+    def _compose_dynamic_layer(self, offset, dirty):
+        """把动态层中有内容的区域合成到屏幕上"""
+        layer = self.dynamic_layer
+        if dirty is not None:
+            strips = dirty
+        elif self._layer_tiles.coverage() > self.MAX_LAYER_COVERAGE:
+            self.screen.blit(layer, offset)
+            return
+        else:
+            strips = self._layer_tiles.strips()
+        for rect in strips:
+            self.screen.blit(layer, rect.move(offset), rect)
+            
+    def _update_starfield(self):
+        """移动星空"""
         for star in self.stars:
             star[0] = ((star[0][0] - star[3]), star[0][1])
             if star[0][0] < 0:
-                star[0] = (SCREEN_WIDTH + random.randint(0, 100), random.randint(0, SCREEN_HEIGHT))
-            
+                star[0] = (SCREEN_WIDTH + cosmetic_rng.randint(0, 100), cosmetic_rng.randint(0, SCREEN_HEIGHT))
+                
+    def _draw_starfield(self, surface, offset=(0, 0)):
+        """绘制星空背景"""
+        ticks = pygame.time.get_ticks()
+        for star in self._visible_stars():
             # 星星闪烁效果
-            brightness = star[2] * (0.8 + 0.2 * math.sin(pygame.time.get_ticks() * 0.001 + star[0][0] * 0.01))
+            brightness = star[2] * (0.8 + 0.2 * math.sin(ticks * 0.001 + star[0][0] * 0.01))
             star_color = (int(255 * brightness), int(255 * brightness), int(255 * brightness))
             star_size = int(star[1] * (0.8 + 0.4 * brightness))
             
             if star_size > 0:
-                pygame.draw.circle(surface, star_color, star[0], star_size)
+                pygame.draw.circle(surface, star_color, (star[0][0] + offset[0], star[0][1] + offset[1]), star_size)
                 
-    def _draw_map_objects(self, surface):
-        """绘制地图物体"""
-        for obj in self.map_objects:
-            if obj.active:
-                obj.draw(surface)
+    def _draw_map_objects(self, surface, visible: VisibleSet):
+        """绘制可交互的地图物体（小行星在静态层中）"""
+        screen = visible.screen
+        for obj in visible.map_objects:
+            if obj.active and obj.type != ObjectType.OBSTACLE:
+                obj.draw(surface, screen.get(obj))
                 
-    def _draw_entities(self, surface):
+    def _draw_entities(self, surface, visible: VisibleSet):
         """绘制游戏实体"""
-        # 按Y坐标排序以实现深度效果
-        all_game_objects = self.cores + [ship for core in self.cores for ship in core.ships]
-        all_game_objects.sort(key=lambda obj: obj.pos.y)
-
-        for obj in all_game_objects:
-            obj.draw(surface)
+        # 按Y坐标排序以实现深度效果；默认视角下可见的就是全部核心和舰船，名单未变时沿用上一帧的顺序
+        token = (len(self.cores), self.factions.ships.version) if self.camera.is_identity() else None
+        screen = visible.screen
+        for obj in self.depth_order.update((visible.cores, visible.ships), token):
+            obj.draw(surface, screen.get(obj))
             
-    def _draw_projectiles(self, surface):
+    def _draw_projectiles(self, surface, projectiles: ProjectileFrame):
         """绘制子弹"""
-        for proj in self.projectiles:
-            proj.draw(surface)
+        self.projectiles.draw(surface, projectiles)
             
     def _draw_effects(self, surface):
         """绘制特效"""
-        for effect in self.effects:
-            effect.draw(surface)
+        self.particles.draw(surface, view=self._screen_view())
             
     def _draw_ui(self):
         """绘制用户界面"""
-        self._draw_stats_panel()
-        self._draw_control_panel()
+        with self.profiler.section("draw.stats_panel"):
+            self._draw_stats_panel()
+        with self.profiler.section("draw.control_panel"):
+            self._draw_control_panel()
         self._draw_game_status()
         
     def _draw_stats_panel(self):
@@ -250,30 +735,43 @@ class SpaceWarSimulator:
             game_time = time.time() - self.game_start_time
             self.stats_panel.draw(self.screen, self.cores, game_time)
             
+    def _control_panel_rect(self):
+        """控制面板在屏幕上的范围"""
+        return pygame.Rect(10, SCREEN_HEIGHT - 210, 200, 200)
+        
     def _draw_control_panel(self):
-        """绘制控制面板"""
-        controls_width, controls_height = 200, 120
+        """绘制控制面板（内容固定，只渲染一次）"""
+        if self._control_panel_surface is None:
+            self._control_panel_surface = self._render_control_panel()
+        self.screen.blit(self._control_panel_surface, self._control_panel_rect())
+        
+    def _render_control_panel(self):
+        """渲染控制面板表面"""
+        controls_width, controls_height = self._control_panel_rect().size
         controls_surface = pygame.Surface((controls_width, controls_height), pygame.SRCALPHA)
         controls_surface.fill(PANEL_BG)
         pygame.draw.rect(controls_surface, PANEL_BORDER, (0, 0, controls_width, controls_height), 2)
-        self.screen.blit(controls_surface, (10, SCREEN_HEIGHT - controls_height - 10))
         
         controls_text = [
             "控制说明:",
             "空格: 暂停/继续",
             "Tab: 显示/隐藏面板", 
             "R: 重新开始",
+            "F3: 性能分析",
+            "WASD/右键拖动: 平移",
+            "滚轮: 缩放  Home: 复位",
             "ESC: 退出游戏"
         ]
         
         for i, text in enumerate(controls_text):
             color = GOLD if i == 0 else WHITE
             text_surface = self.small_font.render(text, True, color)
-            self.screen.blit(text_surface, (20, SCREEN_HEIGHT - controls_height + 10 + i * 20))
+            controls_surface.blit(text_surface, (10, 20 + i * 20))
+        return controls_surface
             
     def _draw_game_status(self):
         """绘制游戏状态"""
-        if len(self.cores) <= 1:
+        if self.is_game_over():
             self._draw_game_end_status()
         elif self.paused:
             self._draw_pause_status()
@@ -282,7 +780,7 @@ class SpaceWarSimulator:
         """绘制游戏结束状态"""
         if len(self.cores) == 1:
             winner_text = f"阵营 {self.cores[0].faction_id + 1} 获胜!"
-            winner_color = FACTION_COLORS[self.cores[0].faction_id % len(FACTION_COLORS)]
+            winner_color = self.cores[0].color
         else:
             winner_text = "平局!"
             winner_color = WHITE
@@ -299,7 +797,7 @@ class SpaceWarSimulator:
         if font is None:
             font = self.font
             
-        text_surface = font.render(text, True, color)
+        text_surface = text_cache.render(font, text, color)
         text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, y_pos))
         
         # 文本背景
@@ -317,8 +815,29 @@ class SpaceWarSimulator:
             elif event.type == pygame.KEYDOWN:
                 if not self._handle_key_press(event.key):
                     return False
+            else:
+                self.handle_camera_event(event)
+        return True
+        
+    def handle_camera_event(self, event) -> bool:
+        """滚轮缩放、右键拖动平移，返回事件是否被相机处理"""
+        if event.type == pygame.MOUSEWHEEL:
+            self.camera.zoom_at(self.CAMERA_ZOOM_STEP ** event.y, pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+            self.camera.pan(-event.rel[0], -event.rel[1])
+        else:
+            return False
         return True
         
+    def update_camera(self, frame_time: float):
+        """按住WASD时平移视角"""
+        keys = pygame.key.get_pressed()
+        dx = keys[pygame.K_d] - keys[pygame.K_a]
+        dy = keys[pygame.K_s] - keys[pygame.K_w]
+        if dx or dy:
+            step = self.CAMERA_PAN_SPEED * frame_time
+            self.camera.pan(dx * step, dy * step)
+        
     def _handle_key_press(self, key):
         """处理按键事件"""
         if key == pygame.K_SPACE:
@@ -327,16 +846,44 @@ class SpaceWarSimulator:
             self.stats_panel.visible = not self.stats_panel.visible
         elif key == pygame.K_r:
             self.initialize_game()
+        elif key == pygame.K_F3:
+            self.profiler_overlay.visible = not self.profiler_overlay.visible
+            self.profiler.enabled = self.profiler_overlay.visible or self.profiler.exporting
+            self.profiler.reset()
+        elif key == pygame.K_HOME:
+            self.camera.reset()
         elif key == pygame.K_ESCAPE:
             return False
         return True
         
     def run(self):
         """运行游戏主循环"""
+        self.attach_viewer()
         running = True
+        accumulator = 0.0
+        previous_time = time.perf_counter()
         while running:
+            now = time.perf_counter()
+            frame_time = min(now - previous_time, self.MAX_FRAME_TIME)
+            accumulator += frame_time
+            previous_time = now
+            
             running = self.handle_events()
-            self.update()
-            self.draw()
+            self.update_camera(frame_time)
+            
+            # 固定步长推进逻辑，渲染慢时一帧内追赶多个逻辑帧
+            ticks = min(int(accumulator / self.dt), self.MAX_TICKS_PER_FRAME)
+            for i in range(ticks):
+                if i == ticks - 1:
+                    self._snapshot_positions()
+                self.update()
+            accumulator = accumulator - ticks * self.dt if ticks < self.MAX_TICKS_PER_FRAME else 0.0
+            
+            self.draw(accumulator / self.dt)
+            self.quality.observe((time.perf_counter() - now) * 1000)  # 不含限帧等待
+            self.profiler.end_frame()
             self.clock.tick(FPS)
+        self.stop_recording()
+        self.stop_telemetry()
+        self.profiler.stop_export()
         pygame.quit()
\ No newline at end of file
@@ -0,0 +1,295 @@
+"""模拟状态快照：把完整的逻辑状态编码为紧凑的二进制，用于恢复和分叉对局
+
+格式（小端）:
+    头部: b"SWSN" | 版本 u16 | 种子 u64 | 帧号 u64 | 屏幕震动 i32 | 段数 u32
+    段:   长度 u32 | 内容，依次为 配置JSON、随机数状态、核心、舰船、舰船效果、地图物体、小行星顶点、子弹
+
+目标引用编码为ID：舰船用 ship_id，核心用 faction_id。核心已被摧毁、不在任何名单中
+但仍被舰船或子弹瞄准的舰船同样保存，所属核心记为-1。舰船按全局名单的顺序保存，
+并记录在所属核心名单中的位置，两个名单的顺序（影响更新顺序）都能还原。粒子等纯视觉状态不保存。
+"""
+import math
+import operator
+import random
+import struct
+from typing import Dict, List, NamedTuple, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
+
+from config import GameConfig, ObjectType
+from entities import Core, Ship, MapObject, ProjectileSystem
+from game.fleet_store import STATE_CODES
+from game.replay import config_to_json, config_from_json
+from utils.colors import faction_color
+from utils.roster import Roster
+from utils.vector2 import Vector2
+
+if TYPE_CHECKING:
+    from game.simulator import SpaceWarSimulator
+
+MAGIC = b"SWSN"
+VERSION = 3  # 2: 舰船增加 ai_due；3: 舰船按全局名单排列并记录在核心名单中的位置
+
+_HEADER = struct.Struct("<4sHQQiI")
+_LENGTH = struct.Struct("<I")
+_GAUSS = struct.Struct("<d")
+
+# 目标类型
+TARGET_NONE = 0
+TARGET_SHIP = 1
+TARGET_CORE = 2
+
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+OBJECT_TYPES = list(ObjectType)
+OBJECT_TYPE_CODES = {obj_type: code for code, obj_type in enumerate(OBJECT_TYPES)}
+
+# 直接按属性名保存的标量字段
+CORE_FIELDS = [
+    ("faction_id", "<u2"), ("radius", "<f8"), ("mass", "<f8"), ("ships_built", "<u4"),
+    ("spawn_timer", "<i4"), ("max_ships", "<i4"), ("spawn_interval", "<i4"),
+    ("health", "<f8"), ("max_health", "<f8"), ("resources", "<f8"), ("ship_production_cost", "<f8"),
+    ("damage_flash_timer", "<i4"), ("shield_energy", "<f8"), ("max_shield", "<f8"),
+    ("shield_recharge_rate", "<f8"), ("total_kills", "<u4"), ("total_damage_dealt", "<f8"),
+    ("total_damage_taken", "<f8"),
+]
+
+SHIP_FIELDS = [
+    ("ship_id", "<u4"), ("faction_id", "<u2"), ("angle", "<f8"), ("length", "<f8"), ("width", "<f8"),
+    ("speed", "<f8"), ("health", "<f8"), ("max_health", "<f8"), ("attack_damage", "<f8"),
+    ("attack_range", "<f8"), ("attack_angle", "<f8"), ("attack_cooldown_max", "<i4"),
+    ("attack_cooldown", "<i4"), ("patrol_radius", "<f8"), ("damage_flash_timer", "<i4"),
+    ("is_moving", "?"), ("heal_particle_timer", "<i4"), ("kills", "<u4"), ("damage_dealt", "<f8"),
+    ("ai_due", "?"),
+]
+
+CORE_DTYPE = np.dtype([
+    ("in_play", "?"), ("x", "<f8"), ("y", "<f8"), ("vx", "<f8"), ("vy", "<f8"),
+] + CORE_FIELDS)
+
+SHIP_DTYPE = np.dtype([
+    ("owner", "<i4"), ("slot", "<u4"), ("x", "<f8"), ("y", "<f8"), ("vx", "<f8"), ("vy", "<f8"),
+    ("patrol_cx", "<f8"), ("patrol_cy", "<f8"), ("patrol_tx", "<f8"), ("patrol_ty", "<f8"),
+    ("state", "u1"), ("target_kind", "u1"), ("target_id", "<u4"),
+] + SHIP_FIELDS)
+
+EFFECT_DTYPE = np.dtype([("ship", "<u4"), ("debuff", "?"), ("value", "<f8"), ("duration", "<i4")])
+
+MAP_OBJECT_DTYPE = np.dtype([
+    ("type", "u1"), ("x", "<f8"), ("y", "<f8"), ("size", "<f8"), ("active", "?"),
+    ("animation_timer", "<f8"), ("effect_value", "<f8"), ("effect_duration", "<i4"), ("vertices", "<u2"),
+])
+
+PROJECTILE_DTYPE = np.dtype([
+    ("x", "<f8"), ("y", "<f8"), ("vx", "<f8"), ("vy", "<f8"), ("damage", "<f8"), ("lifetime", "<f8"),
+    ("color", "u1", (3,)), ("target_kind", "u1"), ("target_id", "<u4"),
+    ("trail", "<f8", (ProjectileSystem.TRAIL_LENGTH, 2)), ("trail_start", "u1"), ("trail_count", "u1"),
+])
+
+_core_values = operator.attrgetter(*(name for name, _ in CORE_FIELDS))
+_ship_values = operator.attrgetter(*(name for name, _ in SHIP_FIELDS))
+_CORE_NAMES = [name for name, _ in CORE_FIELDS]
+_SHIP_NAMES = [name for name, _ in SHIP_FIELDS]
+
+Target = Union[Ship, Core, None]
+
+class Snapshot(NamedTuple):
+    """解码后的快照，实体已重建并互相链接"""
+    config: GameConfig
+    seed: int
+    tick: int
+    screen_shake: int
+    rng_state: tuple
+    all_cores: List[Core]
+    cores: List[Core]
+    map_objects: List[MapObject]
+    projectile_arrays: Dict[str, np.ndarray]
+    projectile_targets: List[Target]
+    live_ships: List[Ship]  # 全局舰船名单的顺序
+
+def _target_ref(target: Target) -> Tuple[int, int]:
+    if target is None:
+        return TARGET_NONE, 0
+    if isinstance(target, Core):
+        return TARGET_CORE, target.faction_id
+    return TARGET_SHIP, target.ship_id
+
+def _collect_ships(simulator: 'SpaceWarSimulator', projectile_targets: List[Target]) -> Dict[Ship, int]:
+    """需要保存的舰船及其所属核心在 all_cores 中的下标：先按全局名单的顺序，再是只被引用的舰船"""
+    core_index = {core.faction_id: index for index, core in enumerate(simulator.all_cores)}
+    owners: Dict[Ship, int] = {ship: core_index[ship.faction_id] for ship in simulator.factions.ships}
+    pending = [ship.target for ship in owners if isinstance(ship.target, Ship)]
+    pending.extend(target for target in projectile_targets if isinstance(target, Ship))
+    while pending:
+        ship = pending.pop()
+        if ship not in owners:
+            owners[ship] = -1
+            if isinstance(ship.target, Ship):
+                pending.append(ship.target)
+    return owners
+
+def encode_snapshot(simulator: 'SpaceWarSimulator') -> bytes:
+    """把模拟器当前的逻辑状态编码为快照（应在两个逻辑帧之间调用）"""
+    all_cores = simulator.all_cores
+    in_play = set(simulator.cores)
+    projectile_arrays, projectile_targets = simulator.projectiles.get_state()
+    owners = _collect_ships(simulator, projectile_targets)
+
+    cores = np.array([
+        (core in in_play, core.pos.x, core.pos.y, core.velocity.x, core.velocity.y, *_core_values(core))
+        for core in all_cores
+    ], dtype=CORE_DTYPE)
+
+    ships = np.array([
+        (owner, all_cores[owner].ships.index(ship) if owner >= 0 else 0, ship.pos.x, ship.pos.y, ship.velocity.x, ship.velocity.y,
+         ship.patrol_center.x, ship.patrol_center.y, ship.patrol_target.x, ship.patrol_target.y,
+         STATE_CODES[ship.state], *_target_ref(ship.target), *_ship_values(ship))
+        for ship, owner in owners.items()
+    ], dtype=SHIP_DTYPE)
+
+    effects = np.array([
+        (index, debuff, value, duration)
+        for index, ship in enumerate(owners)
+        for debuff, entries in ((False, ship.buffs), (True, ship.debuffs))
+        for value, duration in entries
+    ], dtype=EFFECT_DTYPE)
+
+    map_objects = simulator.map_objects
+    objects = np.array([
+        (OBJECT_TYPE_CODES[obj.type], obj.pos.x, obj.pos.y, obj.size, obj.active, obj.animation_timer,
+         getattr(obj, "effect_value", math.nan), getattr(obj, "effect_duration", -1),
+         len(getattr(obj, "shape_points", ())))
+        for obj in map_objects
+    ], dtype=MAP_OBJECT_DTYPE)
+    vertices = np.array([point for obj in map_objects for point in getattr(obj, "shape_points", ())],
+                        dtype="<f8").reshape(-1, 2)
+
+    projectiles = np.zeros(len(projectile_targets), dtype=PROJECTILE_DTYPE)
+    projectiles["x"], projectiles["y"] = projectile_arrays["pos"].T
+    projectiles["vx"], projectiles["vy"] = projectile_arrays["velocity"].T
+    for name in ("damage", "lifetime", "color", "trail", "trail_start", "trail_count"):
+        projectiles[name] = projectile_arrays[name]
+    refs = np.array([_target_ref(target) for target in projectile_targets], dtype="<u4").reshape(-1, 2)
+    projectiles["target_kind"], projectiles["target_id"] = refs.T
+
+    _, internal, gauss_next = simulator.rng.getstate()
+    rng_state = (_GAUSS.pack(math.nan if gauss_next is None else gauss_next)
+                 + np.array(internal, dtype="<u4").tobytes())
+
+    sections = [config_to_json(simulator.config), rng_state, cores.tobytes(), ships.tobytes(),
+                effects.tobytes(), objects.tobytes(), vertices.tobytes(), projectiles.tobytes()]
+    parts = [_HEADER.pack(MAGIC, VERSION, simulator.seed, simulator.tick, simulator.screen_shake, len(sections))]
+    for section in sections:
+        parts.append(_LENGTH.pack(len(section)))
+        parts.append(section)
+    return b"".join(parts)
+
+def _read_sections(data: bytes):
+    magic, version, seed, tick, screen_shake, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("不支持的快照数据")
+    offset = _HEADER.size
+    sections = []
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        sections.append(data[offset:offset + length])
+        offset += length
+    return seed, tick, screen_shake, sections
+
+def decode_snapshot(data: bytes, rng: random.Random) -> Snapshot:
+    """解码快照并重建实体，实体的随机数生成器设为rng"""
+    seed, tick, screen_shake, sections = _read_sections(data)
+    config_json, rng_bytes, core_bytes, ship_bytes, effect_bytes, object_bytes, vertex_bytes, projectile_bytes = sections
+
+    (gauss_next,) = _GAUSS.unpack_from(rng_bytes, 0)
+    internal = tuple(np.frombuffer(rng_bytes, dtype="<u4", offset=_GAUSS.size).tolist())
+    rng_state = (3, internal, None if math.isnan(gauss_next) else gauss_next)
+
+    all_cores, cores = _decode_cores(np.frombuffer(core_bytes, dtype=CORE_DTYPE), rng)
+    ships, ship_targets, live_ships = _decode_ships(np.frombuffer(ship_bytes, dtype=SHIP_DTYPE), all_cores, rng)
+    for index, debuff, value, duration in np.frombuffer(effect_bytes, dtype=EFFECT_DTYPE).tolist():
+        ship = ships[index]
+        (ship.debuffs if debuff else ship.buffs).append((value, duration))
+
+    resolve = _resolver(all_cores, ships)
+    for ship, (kind, target_id) in zip(ships, ship_targets):
+        ship.target = resolve(kind, target_id)
+
+    map_objects = _decode_map_objects(np.frombuffer(object_bytes, dtype=MAP_OBJECT_DTYPE),
+                                      np.frombuffer(vertex_bytes, dtype="<f8").reshape(-1, 2))
+
+    projectiles = np.frombuffer(projectile_bytes, dtype=PROJECTILE_DTYPE)
+    projectile_arrays = {
+        "pos": np.stack((projectiles["x"], projectiles["y"]), axis=1),
+        "velocity": np.stack((projectiles["vx"], projectiles["vy"]), axis=1),
+    }
+    for name in ("damage", "lifetime", "color", "trail", "trail_start", "trail_count"):
+        projectile_arrays[name] = projectiles[name]
+    projectile_targets = [resolve(kind, target_id) for kind, target_id in
+                          zip(projectiles["target_kind"].tolist(), projectiles["target_id"].tolist())]
+
+    return Snapshot(config_from_json(config_json), seed, tick, screen_shake, rng_state,
+                    all_cores, cores, map_objects, projectile_arrays, projectile_targets, live_ships)
+
+def _decode_cores(records: np.ndarray, rng: random.Random) -> Tuple[List[Core], List[Core]]:
+    all_cores, cores = [], []
+    for in_play, x, y, vx, vy, *values in records.tolist():
+        core = Core.__new__(Core)
+        core.__dict__.update(zip(_CORE_NAMES, values))
+        core.__dict__.update(pos=Vector2(x, y), velocity=Vector2(vx, vy), rng=rng, ships=Roster(), prev_pos=None,
+                             color=faction_color(core.faction_id))
+        all_cores.append(core)
+        if in_play:
+            cores.append(core)
+    return all_cores, cores
+
+def _decode_ships(records: np.ndarray, all_cores: List[Core], rng: random.Random):
+    ships, targets, rosters = [], [], [[] for _ in all_cores]
+    for owner, slot, x, y, vx, vy, pcx, pcy, ptx, pty, state, kind, target_id, *values in records.tolist():
+        ship = Ship.__new__(Ship)
+        ship.__dict__.update(zip(_SHIP_NAMES, values))
+        ship.__dict__.update(
+            pos=Vector2(x, y), velocity=Vector2(vx, vy), rng=rng, state=STATE_NAMES[state],
+            patrol_center=Vector2(pcx, pcy), patrol_target=Vector2(ptx, pty),
+            target=None, buffs=[], debuffs=[], prev_pos=None, color=faction_color(ship.faction_id),
+        )
+        if owner >= 0:
+            rosters[owner].append((slot, ship))
+        ships.append(ship)
+        targets.append((kind, target_id))
+    for core, roster in zip(all_cores, rosters):
+        for _, ship in sorted(roster, key=operator.itemgetter(0)):
+            core.ships.add(ship)
+    live_ships = [ship for ship, owner in zip(ships, records["owner"].tolist()) if owner >= 0]
+    return ships, targets, live_ships
+
+def _resolver(all_cores: List[Core], ships: List[Ship]):
+    """把 (目标类型, ID) 还原为对象的函数"""
+    cores_by_faction = {core.faction_id: core for core in all_cores}
+    ships_by_id = {ship.ship_id: ship for ship in ships}
+
+    def resolve(kind: int, target_id: int) -> Target:
+        if kind == TARGET_SHIP:
+            return ships_by_id[target_id]
+        if kind == TARGET_CORE:
+            return cores_by_faction[target_id]
+        return None
+    return resolve
+
+def _decode_map_objects(records: np.ndarray, vertices: np.ndarray) -> List[MapObject]:
+    map_objects = []
+    points = vertices.tolist()
+    start = 0
+    for obj_type, x, y, size, active, animation_timer, effect_value, effect_duration, count in records.tolist():
+        obj = MapObject.__new__(MapObject)
+        obj.__dict__.update(pos=Vector2(x, y), size=size, type=OBJECT_TYPES[obj_type], active=active,
+                            animation_timer=animation_timer)
+        if not math.isnan(effect_value):
+            obj.effect_value = effect_value
+        if effect_duration >= 0:
+            obj.effect_duration = effect_duration
+        if count:
+            obj.shape_points = [tuple(point) for point in points[start:start + count]]
+            start += count
+        map_objects.append(obj)
+    return map_objects
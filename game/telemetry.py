@@ -0,0 +1,162 @@
+"""对局遥测：每隔固定帧数采样各阵营指标，由后台线程写成列式 .npz 分块
+
+输出目录结构:
+    meta.json           种子、采样间隔、配置、列名，结束时补充行数和丢弃的分块数
+    chunk_00000.npz     每列一个数组，每行是某一帧某个阵营的一条记录
+    chunk_00001.npz     ...
+
+模拟线程只把采样写进内存中的列缓冲，缓冲写满后交给有界队列；
+队列满时丢弃该分块并计数，模拟线程从不等待磁盘。
+"""
+import json
+import os
+import queue
+import threading
+from dataclasses import asdict
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from game.fleet_store import STATE_CODES
+
+if TYPE_CHECKING:
+    from game.simulator import SpaceWarSimulator
+
+STATE_COLUMNS = [f"state_{name}" for name in STATE_CODES]
+
+COLUMNS = {
+    "tick": np.uint32,
+    "faction_id": np.uint16,
+    "alive": bool,
+    "core_health": np.float32,
+    "shield": np.float32,
+    "resources": np.float32,
+    "ships": np.uint32,
+    **{column: np.uint32 for column in STATE_COLUMNS},
+    "kills": np.uint32,
+    "damage_dealt": np.float32,
+    "damage_taken": np.float32,
+}
+
+_STOP = object()
+
+class TelemetryRecorder:
+    """按interval帧采样一次全部阵营（含已被摧毁的），每chunk_rows行写一个分块"""
+
+    def __init__(self, directory: str, simulator: 'SpaceWarSimulator', interval: int = 30,
+                 chunk_rows: int = 4096, max_pending: int = 8):
+        self.directory = directory
+        self.interval = max(1, interval)
+        self.chunk_rows = max(1, chunk_rows)
+        self.rows_written = 0
+        self.chunks_written = 0
+        self.dropped_chunks = 0
+        self.error: Optional[BaseException] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._meta = {
+            "seed": simulator.seed,
+            "interval": self.interval,
+            "config": asdict(simulator.config),
+            "columns": list(COLUMNS),
+        }
+        self._write_meta()
+
+        self._buffer = self._new_buffer()
+        self._rows = 0
+        self._next_chunk = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending))
+        self._thread = threading.Thread(target=self._writer, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        self.sample(simulator)
+
+    def _new_buffer(self) -> Dict[str, np.ndarray]:
+        return {name: np.zeros(self.chunk_rows, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def on_tick(self, simulator: 'SpaceWarSimulator'):
+        """每个逻辑帧结束后调用"""
+        if simulator.tick % self.interval == 0:
+            self.sample(simulator)
+
+    def sample(self, simulator: 'SpaceWarSimulator'):
+        """把当前各阵营的指标追加到列缓冲"""
+        for core in simulator.all_cores:
+            if self._rows == self.chunk_rows:
+                self._flush()
+            row = self._rows
+            buffer = self._buffer
+            buffer["tick"][row] = simulator.tick
+            buffer["faction_id"][row] = core.faction_id
+            buffer["alive"][row] = core.health > 0
+            buffer["core_health"][row] = core.health
+            buffer["shield"][row] = core.shield_energy
+            buffer["resources"][row] = core.resources
+            buffer["ships"][row] = len(core.ships)
+            states = dict.fromkeys(STATE_CODES, 0)
+            for ship in core.ships:
+                states[ship.state] = states.get(ship.state, 0) + 1
+            for name, column in zip(STATE_CODES, STATE_COLUMNS):
+                buffer[column][row] = states[name]
+            buffer["kills"][row] = core.total_kills
+            buffer["damage_dealt"][row] = core.total_damage_dealt
+            buffer["damage_taken"][row] = core.total_damage_taken
+            self._rows += 1
+
+    def _flush(self, block: bool = False):
+        """把已填充的缓冲交给写入线程；队列满且不允许等待时丢弃"""
+        if self._rows == 0:
+            return
+        chunk = {name: column[:self._rows] for name, column in self._buffer.items()}
+        try:
+            self._queue.put((self._next_chunk, chunk), block=block)
+        except queue.Full:
+            self.dropped_chunks += 1
+        else:
+            self._buffer = self._new_buffer()
+        self._next_chunk += 1
+        self._rows = 0
+
+    def _writer(self):
+        """写入线程：依次把分块保存为 .npz"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            index, chunk = item
+            if self.error is not None:
+                continue
+            try:
+                np.savez(os.path.join(self.directory, f"chunk_{index:05d}.npz"), **chunk)
+            except OSError as e:
+                self.error = e
+                continue
+            self.rows_written += len(chunk["tick"])
+            self.chunks_written += 1
+
+    def _write_meta(self):
+        with open(os.path.join(self.directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self._meta, f, ensure_ascii=False, indent=1)
+
+    def close(self):
+        """写出剩余的采样，等待写入线程结束并更新 meta.json"""
+        if self._thread is None:
+            return
+        self._flush(block=True)
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._meta.update(rows=self.rows_written, chunks=self.chunks_written, dropped_chunks=self.dropped_chunks)
+        self._write_meta()
+        if self.error is not None:
+            raise self.error
+
+def load_telemetry(directory: str) -> Dict[str, np.ndarray]:
+    """按顺序读取目录中的全部分块，返回拼接后的各列"""
+    names = sorted(name for name in os.listdir(directory) if name.startswith("chunk_") and name.endswith(".npz"))
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in COLUMNS}
+    for name in names:
+        with np.load(os.path.join(directory, name)) as chunk:
+            for column in parts:
+                parts[column].append(chunk[column])
+    return {column: np.concatenate(arrays) if arrays else np.zeros(0, dtype=COLUMNS[column])
+            for column, arrays in parts.items()}
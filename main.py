@@ -1,4 +1,5 @@
 """太空战争模拟器 - 主程序入口"""
+import argparse
 import pygame
 import sys
 import os
@@ -6,19 +7,53 @@ import os
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config import GameConfig
+from config import GameConfig, SCREEN_WIDTH, SCREEN_HEIGHT
 from game.simulator import SpaceWarSimulator
 
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="太空战争模拟器")
+    parser.add_argument("--seed", type=int, help="随机种子，相同种子和配置得到相同的对局")
+    parser.add_argument("--record", metavar="PATH", help="把对局录制到该文件")
+    parser.add_argument("--telemetry", metavar="DIR", help="把各阵营指标的时间序列写入该目录")
+    parser.add_argument("--telemetry-interval", type=int, default=30, metavar="N", help="遥测采样间隔（逻辑帧）")
+    parser.add_argument("--replay", metavar="PATH", help="回放录像文件")
+    parser.add_argument("--profile-log", metavar="PATH", help="把逐帧性能数据导出为CSV或JSONL文件")
+    parser.add_argument("--dirty-rects", action="store_true", help="无屏幕震动时只重绘并提交变化的区域")
+    parser.add_argument("--frame-budget", type=float, default=GameConfig.quality_frame_budget_ms, metavar="MS",
+                        help="每帧耗时预算（毫秒），超出时自动降低视觉效果，0表示始终使用最高画质")
+    parser.add_argument("--world-scale", type=float, default=1.0,
+                        help="战场边长相对窗口的倍数，大于1时用WASD/右键拖动平移、滚轮缩放")
+    return parser.parse_args()
+
 def main():
     """主函数"""
+    args = parse_args()
     pygame.init()
     
     try:
+        if args.replay:
+            from game.replay import ReplayPlayer
+            ReplayPlayer(args.replay).run()
+            return
+            
         # 创建游戏配置
-        config = GameConfig()
+        config = GameConfig(
+            dirty_rect_rendering=args.dirty_rects,
+            quality_frame_budget_ms=args.frame_budget,
+            world_width=int(SCREEN_WIDTH * args.world_scale),
+            world_height=int(SCREEN_HEIGHT * args.world_scale),
+        )
         
         # 创建并运行模拟器
-        simulator = SpaceWarSimulator(config)
+        simulator = SpaceWarSimulator(config, seed=args.seed)
+        if args.record:
+            simulator.start_recording(args.record)
+        if args.telemetry:
+            simulator.start_telemetry(args.telemetry, args.telemetry_interval)
+        if args.profile_log:
+            simulator.profiler.enabled = True
+            simulator.profiler.start_export(args.profile_log)
         simulator.run()
         
     except Exception as e:
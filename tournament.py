@@ -0,0 +1,160 @@
+"""太空战争模拟器 - 多进程批量对局入口
+
+用法示例:
+    python tournament.py --matches 64 --max-ticks 36000 --seed 1000
+    python tournament.py --matches 32 --set ship_speed=120 --set num_factions=4 --output results.jsonl
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields, replace
+from typing import Dict, List, Optional
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import GameConfig, FPS
+from game.simulator import SpaceWarSimulator
+
+def parse_overrides(items: List[str]) -> Dict[str, object]:
+    """解析 key=value 形式的 GameConfig 覆盖项"""
+    valid_names = {f.name for f in fields(GameConfig)}
+    overrides = {}
+    for item in items:
+        name, sep, raw = item.partition("=")
+        name = name.strip()
+        if not sep or name not in valid_names:
+            raise ValueError(f"无效的配置项: {item}")
+        try:
+            overrides[name] = ast.literal_eval(raw.strip())
+        except (ValueError, SyntaxError):
+            overrides[name] = raw.strip()
+    return overrides
+
+def run_match(match_id: int, seed: int, max_ticks: int, overrides: Dict[str, object],
+              record_dir: Optional[str] = None, telemetry_dir: Optional[str] = None) -> dict:
+    """在子进程中运行一局无界面对局并返回结果"""
+    config = replace(GameConfig(), **overrides)
+
+    start = time.perf_counter()
+    simulator = SpaceWarSimulator(config, headless=True, seed=seed)
+    if record_dir:
+        simulator.start_recording(os.path.join(record_dir, f"match_{match_id:04d}_seed_{seed}.swr"))
+    if telemetry_dir:
+        simulator.start_telemetry(os.path.join(telemetry_dir, f"match_{match_id:04d}_seed_{seed}"))
+    winner = simulator.run_until(max_ticks=max_ticks)
+    simulator.stop_recording()
+    simulator.stop_telemetry()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "match_id": match_id,
+        "seed": seed,
+        "winner": winner,
+        "ticks": simulator.tick,
+        "timed_out": not simulator.is_game_over(),
+        "wall_time": elapsed,
+        "factions": simulator.faction_stats(),
+    }
+
+def format_match_line(result: dict) -> str:
+    """单局结果的简要描述"""
+    if result["winner"] is not None:
+        outcome = f"阵营 {result['winner'] + 1} 获胜"
+    elif result["timed_out"]:
+        outcome = "超时"
+    else:
+        outcome = "平局"
+    return (f"[对局 {result['match_id']:>3}] 种子={result['seed']} {outcome}, "
+            f"{result['ticks']} 帧 ({result['ticks'] / FPS:.0f} 秒游戏时间), "
+            f"耗时 {result['wall_time']:.1f}s")
+
+def summarize(results: List[dict]) -> str:
+    """汇总各阵营胜率、击杀和伤害"""
+    per_faction: Dict[int, Dict[str, list]] = {}
+    for result in results:
+        for stats in result["factions"]:
+            entry = per_faction.setdefault(stats["faction_id"], {
+                "wins": 0, "survived": 0, "kills": [], "damage_dealt": [], "damage_taken": []
+            })
+            entry["wins"] += result["winner"] == stats["faction_id"]
+            entry["survived"] += stats["alive"]
+            entry["kills"].append(stats["kills"])
+            entry["damage_dealt"].append(stats["damage_dealt"])
+            entry["damage_taken"].append(stats["damage_taken"])
+
+    total = len(results)
+    ticks = [r["ticks"] for r in results]
+    lines = [
+        f"对局数: {total}  超时: {sum(r['timed_out'] for r in results)}  "
+        f"平局: {sum(r['winner'] is None and not r['timed_out'] for r in results)}",
+        f"对局长度(帧): 平均 {statistics.mean(ticks):.0f}  中位数 {statistics.median(ticks):.0f}  "
+        f"最短 {min(ticks)}  最长 {max(ticks)}",
+        "",
+        f"{'阵营':<6}{'胜率':>8}{'存活率':>8}{'平均击杀':>10}{'平均输出':>12}{'平均承伤':>12}",
+    ]
+    for faction_id in sorted(per_faction):
+        entry = per_faction[faction_id]
+        games = len(entry["kills"])
+        lines.append(
+            f"{faction_id + 1:<8}{entry['wins'] / total:>9.1%}{entry['survived'] / games:>10.1%}"
+            f"{statistics.mean(entry['kills']):>12.1f}{statistics.mean(entry['damage_dealt']):>14.0f}"
+            f"{statistics.mean(entry['damage_taken']):>14.0f}"
+        )
+    return "\n".join(lines)
+
+def main():
+    """批量对局主函数"""
+    parser = argparse.ArgumentParser(description="并行运行多局无界面对局并汇总阵营统计")
+    parser.add_argument("--matches", type=int, default=16, help="对局数量")
+    parser.add_argument("--max-ticks", type=int, default=FPS * 60 * 10, help="每局最多运行的逻辑帧数")
+    parser.add_argument("--seed", type=int, default=0, help="起始种子，第i局使用 seed + i")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="并行进程数")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="覆盖 GameConfig 字段，可重复")
+    parser.add_argument("--output", help="把每局结果以JSON行写入该文件")
+    parser.add_argument("--record-dir", help="把每局录像保存到该目录，可用 main.py --replay 回看")
+    parser.add_argument("--telemetry-dir", help="把每局各阵营指标的时间序列保存到该目录下的子目录")
+    args = parser.parse_args()
+
+    try:
+        overrides = parse_overrides(args.overrides)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.record_dir:
+        os.makedirs(args.record_dir, exist_ok=True)
+
+    results = []
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(run_match, i, args.seed + i, args.max_ticks, overrides,
+                                args.record_dir, args.telemetry_dir)
+                for i in range(args.matches)
+            ]
+            # 每局结束立即输出，不等待最慢的对局
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                print(format_match_line(result), flush=True)
+                if output:
+                    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    output.flush()
+    finally:
+        if output:
+            output.close()
+
+    print(f"\n全部完成，总耗时 {time.perf_counter() - start:.1f}s\n")
+    print(summarize(results))
+
+if __name__ == "__main__":
+    main()
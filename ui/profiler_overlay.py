@@ -0,0 +1,45 @@
+"""性能分析叠加层UI"""
+import pygame
+from utils.colors import *
+
+class ProfilerOverlay:
+    """在屏幕左上角显示各阶段滚动耗时和实体计数"""
+
+    def __init__(self, font):
+        self.font = font
+        self.visible = False
+        self.line_height = 18
+        self.width = 420
+
+    def _layout(self, profiler):
+        """叠加层的文本行及面板尺寸"""
+        stats = profiler.stats()
+        lines = [("性能分析 (平均 / 最大 ms)", GOLD)]
+        for name in sorted(stats):
+            entry = stats[name]
+            lines.append((f"{name:<24}{entry['mean_ms']:7.2f} /{entry['max_ms']:7.2f}", WHITE))
+        if profiler.counts:
+            lines.append((" ".join(f"{name}:{value}" for name, value in sorted(profiler.counts.items())), LIGHT_GRAY))
+        width = max(self.width, max(self.font.size(text)[0] for text, _ in lines) + 16)
+        return lines, width, 12 + len(lines) * self.line_height
+
+    def rect(self, profiler):
+        """叠加层在屏幕上的范围，隐藏时返回None"""
+        if not self.visible:
+            return None
+        _, width, height = self._layout(profiler)
+        return pygame.Rect(10, 10, width, height)
+
+    def draw(self, screen, profiler):
+        """绘制叠加层"""
+        if not self.visible:
+            return
+
+        lines, width, height = self._layout(profiler)
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill(PANEL_BG)
+        pygame.draw.rect(background, PANEL_BORDER, (0, 0, width, height), 2)
+        screen.blit(background, (10, 10))
+
+        for i, (text, color) in enumerate(lines):
+            screen.blit(self.font.render(text, True, color), (18, 16 + i * self.line_height))
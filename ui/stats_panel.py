@@ -3,100 +3,145 @@ import pygame
 import time
 from typing import List
 from utils.colors import *
+from utils.text_cache import text_cache
 from config import SCREEN_WIDTH
 
+SHIP_STATES = ("patrol", "attack_ship", "assault_core", "retreat")
+
 class FleetStatsPanel:
-    """舰队统计面板"""
-    
-    def __init__(self, font, small_font):
+    """舰队统计面板
+
+    面板整体渲染到缓存表面上，每帧只做一次blit；最多每 1/refresh_hz 秒
+    采样一次显示的数值，数值有变化时才重绘缓存。
+    """
+
+    def __init__(self, font, small_font, refresh_hz: float = 5.0):
         self.font = font
         self.small_font = small_font
         self.panel_width = 380
         self.panel_height = 0
         self.visible = True
-        
+        self.refresh_interval = 1.0 / refresh_hz if refresh_hz > 0 else 0.0
+        self._surface = None
+        self._values = None
+        self._last_refresh = float('-inf')
+
+    def rect(self):
+        """面板在屏幕上的范围（按上次绘制的高度），隐藏时返回None"""
+        if not self.visible or self.panel_height == 0:
+            return None
+        return pygame.Rect(SCREEN_WIDTH - self.panel_width - 10, 10, self.panel_width, self.panel_height)
+
+    def invalidate(self):
+        """下一帧强制重新采样并重绘"""
+        self._values = None
+        self._last_refresh = float('-inf')
+
     def draw(self, screen, cores, game_time):
         """绘制统计面板"""
         if not self.visible:
             return
-            
+
         active_cores = [core for core in cores if core.health > 0]
         if not active_cores:
             return
-            
+
+        now = time.perf_counter()
+        if now - self._last_refresh >= self.refresh_interval:
+            self._last_refresh = now
+            values = self._snapshot(active_cores, game_time)
+            if values != self._values:
+                self._values = values
+                self._render(values)
+
+        screen.blit(self._surface, (SCREEN_WIDTH - self.panel_width - 10, 10))
+
+    def _snapshot(self, active_cores, game_time):
+        """面板上显示的全部数值"""
+        factions = tuple(
+            self._faction_values(core)
+            for core in sorted(active_cores, key=lambda c: c.health, reverse=True)
+        )
+        return int(game_time // 60), int(game_time % 60), factions
+
+    def _faction_values(self, core):
+        """单个阵营显示的数值，血量条和护盾条按像素取整"""
+        state_counts = dict.fromkeys(SHIP_STATES, 0)
+        alive_ships = 0
+        for ship in core.ships:
+            if ship.health > 0:
+                alive_ships += 1
+                state_counts[ship.state] = state_counts.get(ship.state, 0) + 1
+
+        health_pct = (core.health / core.max_health) * 100
+        return (
+            core.faction_id,
+            core.color,
+            f"核心血量: {int(core.health)}/{int(core.max_health)} ({health_pct:.1f}%)",
+            int(200 * (core.health / core.max_health)),
+            int(200 * (core.shield_energy / core.max_shield)),
+            f"舰队规模: {alive_ships}/{core.max_ships}",
+            f"资源: {int(core.resources)}",
+            f"击杀: {core.total_kills}",
+            f"输出伤害: {int(core.total_damage_dealt)}",
+            alive_ships,
+            tuple(state_counts[state] for state in SHIP_STATES),
+        )
+
+    def _render(self, values):
+        """把面板重绘到缓存表面"""
+        minutes, seconds, factions = values
+
         # 计算面板高度
-        self.panel_height = 80 + len(active_cores) * 140
-        panel_x = SCREEN_WIDTH - self.panel_width - 10
-        panel_y = 10
-        
-        # 绘制主面板背景
-        panel_surface = pygame.Surface((self.panel_width, self.panel_height), pygame.SRCALPHA)
-        panel_surface.fill(PANEL_BG)
-        pygame.draw.rect(panel_surface, PANEL_BORDER, (0, 0, self.panel_width, self.panel_height), 2)
-        screen.blit(panel_surface, (panel_x, panel_y))
-        
+        self.panel_height = 80 + len(factions) * 140
+        if self._surface is None or self._surface.get_height() != self.panel_height:
+            self._surface = pygame.Surface((self.panel_width, self.panel_height), pygame.SRCALPHA)
+        surface = self._surface
+
+        # 主面板背景
+        surface.fill(PANEL_BG)
+        pygame.draw.rect(surface, PANEL_BORDER, (0, 0, self.panel_width, self.panel_height), 2)
+
         # 标题
-        title_text = self.font.render("舰队实时状态", True, GOLD)
-        screen.blit(title_text, (panel_x + 10, panel_y + 10))
-        
+        surface.blit(text_cache.render(self.font, "舰队实时状态", GOLD), (10, 10))
+
         # 游戏时间
-        minutes = int(game_time // 60)
-        seconds = int(game_time % 60)
-        time_text = self.small_font.render(f"游戏时间: {minutes:02d}:{seconds:02d}", True, WHITE)
-        screen.blit(time_text, (panel_x + 10, panel_y + 45))
-        
+        surface.blit(text_cache.render(self.small_font, f"游戏时间: {minutes:02d}:{seconds:02d}", WHITE), (10, 45))
+
         # 各阵营详细信息
         y_offset = 75
-        for core in sorted(active_cores, key=lambda c: c.health, reverse=True):
-            self._draw_faction_stats(screen, core, panel_x + 10, panel_y + y_offset)
+        for faction in factions:
+            self._draw_faction_stats(surface, faction, 10, y_offset)
             y_offset += 140
-            
-    def _draw_faction_stats(self, screen, core, x, y):
+
+    def _draw_faction_stats(self, surface, faction, x, y):
         """绘制单个阵营的统计信息"""
-        color = FACTION_COLORS[core.faction_id % len(FACTION_COLORS)]
-        
-        # 阵营标题
-        faction_text = self.small_font.render(f"阵营 {core.faction_id + 1}", True, color)
-        screen.blit(faction_text, (x, y))
-        
-        # 核心状态
-        health_pct = (core.health / core.max_health) * 100
-        health_text = self.small_font.render(f"核心血量: {int(core.health)}/{int(core.max_health)} ({health_pct:.1f}%)", True, WHITE)
-        screen.blit(health_text, (x, y + 20))
-        
+        (faction_id, color, health_text, health_bar, shield_bar, fleet_text, resource_text,
+         kills_text, damage_text, alive_ships, state_counts) = faction
+        font = self.small_font
+
+        # 阵营标题和核心状态
+        surface.blit(text_cache.render(font, f"阵营 {faction_id + 1}", color), (x, y))
+        surface.blit(text_cache.render(font, health_text, WHITE), (x, y + 20))
+
         # 血量条
         bar_width = 200
         bar_height = 8
-        pygame.draw.rect(screen, (60, 0, 0), (x, y + 40, bar_width, bar_height))
-        pygame.draw.rect(screen, GREEN, (x, y + 40, bar_width * (core.health / core.max_health), bar_height))
-        
+        pygame.draw.rect(surface, (60, 0, 0), (x, y + 40, bar_width, bar_height))
+        pygame.draw.rect(surface, GREEN, (x, y + 40, health_bar, bar_height))
+
         # 护盾条
-        pygame.draw.rect(screen, (20, 20, 60), (x, y + 50, bar_width, 4))
-        pygame.draw.rect(screen, (100, 200, 255), (x, y + 50, bar_width * (core.shield_energy / core.max_shield), 4))
-        
-        # 舰队信息
-        alive_ships = len([ship for ship in core.ships if ship.health > 0])
-        fleet_text = self.small_font.render(f"舰队规模: {alive_ships}/{core.max_ships}", True, WHITE)
-        screen.blit(fleet_text, (x, y + 58))
-        
-        # 资源信息
-        resource_text = self.small_font.render(f"资源: {int(core.resources)}", True, YELLOW)
-        screen.blit(resource_text, (x, y + 76))
-        
-        # 战斗统计
-        stats_text = self.small_font.render(f"击杀: {core.total_kills}", True, RED)
-        screen.blit(stats_text, (x, y + 94))
-        
-        damage_text = self.small_font.render(f"输出伤害: {int(core.total_damage_dealt)}", True, ORANGE)
-        screen.blit(damage_text, (x, y + 112))
-        
+        pygame.draw.rect(surface, (20, 20, 60), (x, y + 50, bar_width, 4))
+        pygame.draw.rect(surface, (100, 200, 255), (x, y + 50, shield_bar, 4))
+
+        # 舰队、资源和战斗统计
+        surface.blit(text_cache.render(font, fleet_text, WHITE), (x, y + 58))
+        surface.blit(text_cache.render(font, resource_text, YELLOW), (x, y + 76))
+        surface.blit(text_cache.render(font, kills_text, RED), (x, y + 94))
+        surface.blit(text_cache.render(font, damage_text, ORANGE), (x, y + 112))
+
         # 舰队状态分布
         if alive_ships > 0:
-            patrol_count = len([s for s in core.ships if s.state == "patrol" and s.health > 0])
-            attack_count = len([s for s in core.ships if s.state == "attack_ship" and s.health > 0])
-            assault_count = len([s for s in core.ships if s.state == "assault_core" and s.health > 0])
-            retreat_count = len([s for s in core.ships if s.state == "retreat" and s.health > 0])
-            
+            patrol_count, attack_count, assault_count, retreat_count = state_counts
             status_text = f"巡逻:{patrol_count} 攻击:{attack_count} 突击:{assault_count} 撤退:{retreat_count}"
-            status_surface = self.small_font.render(status_text, True, LIGHT_GRAY)
-            screen.blit(status_surface, (x, y + 130))
\ No newline at end of file
+            surface.blit(text_cache.render(font, status_text, LIGHT_GRAY), (x, y + 130))
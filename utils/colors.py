@@ -32,4 +32,8 @@ FACTION_COLORS = [
     (255, 120, 200),  # 粉色
     (120, 255, 120),  # 淡绿
     (255, 200, 120)   # 淡橙
-]
\ No newline at end of file
+]
+
+def faction_color(faction_id: int):
+    """阵营的主题色"""
+    return FACTION_COLORS[faction_id % len(FACTION_COLORS)]
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""自适应画质：按帧耗时在几个档位之间切换，只影响纯视觉效果
+
+当前档位的参数保存在全局的 render_quality 中，绘制代码和特效发射处直接读取；
+模拟逻辑从不读取这些参数，因此画质变化不影响对局结果。
+"""
+from dataclasses import dataclass, replace
+from typing import List
+
+@dataclass
+class QualitySettings:
+    """一个画质档位"""
+    particle_scale: float = 1.0      # 爆炸粒子数的比例
+    trail_points: int = 7            # 每枚子弹绘制的尾迹点数上限
+    star_fraction: float = 1.0       # 绘制的星星比例
+    glow_layers: int = 2             # 核心和地图物体的光晕层数：2全部，1只画外层，0不画
+    heal_effect_interval: int = 1    # 每几次治疗特效才实际产生粒子
+
+    def particles(self, count: int) -> int:
+        """按比例缩减后的粒子数，至少为1"""
+        return max(1, int(count * self.particle_scale))
+
+# 从高到低的档位
+QUALITY_LEVELS: List[QualitySettings] = [
+    QualitySettings(),
+    QualitySettings(particle_scale=0.6, trail_points=5, star_fraction=0.75, glow_layers=2, heal_effect_interval=2),
+    QualitySettings(particle_scale=0.35, trail_points=3, star_fraction=0.5, glow_layers=1, heal_effect_interval=3),
+    QualitySettings(particle_scale=0.15, trail_points=1, star_fraction=0.25, glow_layers=0, heal_effect_interval=4),
+]
+
+# 当前生效的画质参数（原地更新）
+render_quality = replace(QUALITY_LEVELS[0])
+
+class QualityGovernor:
+    """观察每帧的耗时（不含等待垂直同步/限帧的时间），超出预算时逐档降低画质，余量恢复后逐档提高
+
+    帧耗时取指数滑动平均：连续 DOWNGRADE_FRAMES 帧高于预算时降一档，
+    连续 UPGRADE_FRAMES 帧低于预算的 HEADROOM 倍时升一档。升档等待更久，避免在两档之间来回切换。
+    budget_ms 为0时不做调整，始终使用最高档。
+    """
+
+    SMOOTHING = 0.1
+    DOWNGRADE_FRAMES = 10
+    UPGRADE_FRAMES = 120
+    HEADROOM = 0.7
+
+    def __init__(self, budget_ms: float, settings: QualitySettings = render_quality):
+        self.budget_ms = budget_ms
+        self.settings = settings
+        self.average_ms = 0.0
+        self._over = 0
+        self._under = 0
+        self.set_level(0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_ms > 0
+
+    def set_level(self, level: int):
+        """切换到指定档位（0为最高画质）"""
+        self.level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        self.settings.__dict__.update(QUALITY_LEVELS[self.level].__dict__)
+        self._over = self._under = 0
+
+    def observe(self, frame_ms: float) -> bool:
+        """记录一帧的耗时，返回档位是否改变"""
+        if not self.enabled:
+            return False
+        self.average_ms += (frame_ms - self.average_ms) * self.SMOOTHING
+        if self.average_ms > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif self.average_ms < self.budget_ms * self.HEADROOM:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.DOWNGRADE_FRAMES and self.level < len(QUALITY_LEVELS) - 1:
+            self.set_level(self.level + 1)
+            return True
+        if self._under >= self.UPGRADE_FRAMES and self.level > 0:
+            self.set_level(self.level - 1)
+            return True
+        return False
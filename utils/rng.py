@@ -0,0 +1,13 @@
+"""随机数工具
+
+模拟逻辑使用每个模拟器独立的 random.Random（由种子确定），
+只影响画面的随机效果使用这里的 cosmetic_rng，二者互不干扰，保证对局可复现。
+"""
+import random
+
+# 仅用于视觉效果（星空、屏幕震动、尾焰等）的随机数
+cosmetic_rng = random.Random()
+
+def new_seed() -> int:
+    """生成一个新的32位随机种子"""
+    return random.SystemRandom().getrandbits(32)
@@ -0,0 +1,72 @@
+"""稠密名单工具"""
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Roster(Generic[T]):
+    """连续存放的对象名单，追加和删除都是O(1)
+
+    删除时用最后一个对象填补空位，因此名单顺序会改变（但只取决于增删的顺序，仍是确定的）。
+    挂接上级名单后，在本名单中增删的对象同时在上级名单中增删，用于维护全局名单。
+    """
+
+    def __init__(self, items: Iterable[T] = (), parent: Optional['Roster[T]'] = None):
+        self.items: List[T] = []  # 只读，需要下标或列表的地方直接使用
+        self._index: Dict[T, int] = {}
+        self.parent = parent
+        self.version = 0  # 每次增删加一，用于判断名单是否变化
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __getitem__(self, index: int) -> T:
+        return self.items[index]
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._index
+
+    def index(self, item: T) -> int:
+        return self._index[item]
+
+    def add(self, item: T):
+        """追加到名单末尾"""
+        self._index[item] = len(self.items)
+        self.items.append(item)
+        self.version += 1
+        if self.parent is not None:
+            self.parent.add(item)
+
+    def remove(self, item: T) -> bool:
+        """移除item（最后一个对象移到它的位置），item不在名单中时返回False"""
+        i = self._index.pop(item, None)
+        if i is None:
+            return False
+        last = self.items.pop()
+        if last is not item:
+            self.items[i] = last
+            self._index[last] = i
+        self.version += 1
+        if self.parent is not None:
+            self.parent.remove(item)
+        return True
+
+    def clear(self):
+        """清空名单，并从上级名单中移除这些对象"""
+        if self.parent is not None:
+            for item in self.items:
+                self.parent.remove(item)
+        self.items.clear()
+        self._index.clear()
+        self.version += 1
+
+    def attach(self, parent: 'Roster[T]'):
+        """挂接上级名单，已有对象中不在上级名单里的按顺序追加过去"""
+        self.parent = parent
+        for item in self.items:
+            if item not in parent:
+                parent.add(item)
@@ -0,0 +1,110 @@
+"""舰船精灵图集：预先画好各个朝向的舰船主体和尾焰，绘制时只需贴图"""
+import math
+from typing import Callable, Dict, List, Tuple
+
+import pygame
+
+from utils.colors import ORANGE, YELLOW
+
+Sprite = Tuple[pygame.Surface, int, int]  # (表面, 左上角相对舰船中心的x偏移, y偏移)
+
+class ShipSpriteAtlas:
+    """按尺寸和颜色缓存预先旋转好的舰船精灵
+
+    每种（主体色、轮廓色）组合——即每个阵营颜色及受击闪白——首次使用时一次性画出 steps 个朝向，
+    绘制时取与舰船角度最接近的一张。尾焰与阵营无关，按尺寸画出 FLAME_STEPS 种长度
+    （对应逐帧的随机闪烁）× steps 个朝向。精灵裁剪到实际内容的范围以减少贴图面积。
+    steps 为0时不使用图集，舰船逐帧绘制多边形。
+    """
+
+    FLAME_STEPS = 4
+
+    def __init__(self, steps: int = 64):
+        self.steps = steps
+        self._bodies: Dict[tuple, List[Sprite]] = {}
+        self._flames: Dict[tuple, List[List[Sprite]]] = {}
+
+    def configure(self, steps: int):
+        """设置朝向数，改变时清空已有精灵"""
+        if steps != self.steps:
+            self.steps = steps
+            self.clear()
+
+    def clear(self):
+        self._bodies.clear()
+        self._flames.clear()
+
+    def angle_index(self, angle: float) -> int:
+        """与angle最接近的朝向编号"""
+        return int(round(angle * self.steps / (2 * math.pi))) % self.steps
+
+    def body(self, length: float, width: float, body_color, color, index: int) -> Sprite:
+        """第index个朝向的舰船主体（阴影、船体、轮廓）"""
+        key = (length, width, body_color, color)
+        frames = self._bodies.get(key)
+        if frames is None:
+            radius = int(max(length, width) / 2) + 4
+            frames = self._bodies[key] = [
+                _render(radius, lambda surface, c, angle=self._angle(i):
+                        _draw_body(surface, c, angle, length, width, body_color, color))
+                for i in range(self.steps)
+            ]
+        return frames[index]
+
+    def flame(self, length: float, width: float, index: int, flicker: int) -> Sprite:
+        """第index个朝向、第flicker种长度的引擎尾焰"""
+        key = (length, width)
+        frames = self._flames.get(key)
+        if frames is None:
+            radius = int(length / 1.6 + length * 1.2 * 1.3) + 3
+            frames = self._flames[key] = [
+                [_render(radius, lambda surface, c, angle=self._angle(i), scale=self._flicker(f):
+                         _draw_flame(surface, c, angle, length, width, scale))
+                 for i in range(self.steps)]
+                for f in range(self.FLAME_STEPS)
+            ]
+        return frames[flicker][index]
+
+    def _angle(self, index: int) -> float:
+        return index * 2 * math.pi / self.steps
+
+    def _flicker(self, flicker: int) -> float:
+        """第flicker种尾焰长度的比例，均匀分布在逐帧绘制时的随机范围 0.7~1.3 内"""
+        return 0.7 + 0.6 * (flicker + 0.5) / self.FLAME_STEPS
+
+def _render(radius: int, draw: Callable[[pygame.Surface, float], None]) -> Sprite:
+    """在以 (radius, radius) 为舰船中心的透明表面上绘制，裁剪到内容范围"""
+    surface = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+    draw(surface, radius)
+    bounds = surface.get_bounding_rect()
+    sprite = surface.subsurface(bounds).copy()
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    return sprite, bounds.x - radius, bounds.y - radius
+
+def _draw_body(surface, c: float, angle: float, length: float, width: float, body_color, color):
+    """与 Ship._draw_ship_body 相同的外形，中心在 (c, c)"""
+    l, w = length / 2, width / 2
+    points = [
+        (c + l*math.cos(angle), c + l*math.sin(angle)),
+        (c + w*math.cos(angle-math.pi/2), c + w*math.sin(angle-math.pi/2)),
+        (c - l*0.6*math.cos(angle), c - l*0.6*math.sin(angle)),
+        (c + w*math.cos(angle+math.pi/2), c + w*math.sin(angle+math.pi/2))
+    ]
+    pygame.draw.polygon(surface, (20, 20, 20), [(x + 1, y + 1) for x, y in points])
+    pygame.draw.polygon(surface, body_color, points)
+    pygame.draw.polygon(surface, color, points, 3)
+
+def _draw_flame(surface, c: float, angle: float, length: float, width: float, scale: float):
+    """与 Ship._draw_engine_flames 相同的内外两层火焰，中心在 (c, c)"""
+    dx, dy = math.cos(angle), math.sin(angle)
+    flame_len = length * 1.2 * scale
+    half_w = width * 0.8 / 2
+    fx, fy = c - dx * (length / 1.6), c - dy * (length / 1.6)
+    p1 = (fx - dy * half_w, fy + dx * half_w)
+    p2 = (fx + dy * half_w, fy - dx * half_w)
+    pygame.draw.polygon(surface, ORANGE, [p1, p2, (fx - dx * flame_len, fy - dy * flame_len)])
+    pygame.draw.polygon(surface, YELLOW, [p1, p2, (fx - dx * flame_len * 0.6, fy - dy * flame_len * 0.6)])
+
+# 所有舰船共享的图集
+ship_atlas = ShipSpriteAtlas()
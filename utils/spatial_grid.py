@@ -0,0 +1,152 @@
+"""均匀空间哈希网格"""
+import math
+from typing import Dict, List, Optional, Tuple, Iterable, Any
+
+class SpatialHashGrid:
+    """按固定格子尺寸划分平面的空间索引，用于最近敌人查询和视口裁剪
+
+    存放的对象需要有 pos 属性，最近敌人查询还需要 faction_id 和 health 属性。
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = float(cell_size)
+        self.cells: Dict[Tuple[int, int], List[Any]] = {}
+        self._item_cells: Dict[Any, Tuple[int, int]] = {}
+        self._min_cell = (0, 0)
+        self._max_cell = (0, 0)
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def clear(self):
+        """清空网格"""
+        self.cells.clear()
+        self._item_cells.clear()
+
+    def rebuild(self, items: Iterable[Any]):
+        """用当前位置重建整个网格"""
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def insert(self, item: Any):
+        """插入对象"""
+        key = self._cell_of(item.pos.x, item.pos.y)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+        self._item_cells[item] = key
+        self._expand_bounds(key)
+
+    def remove(self, item: Any):
+        """移除对象，不在网格中的对象会被忽略（已占用范围不收缩）"""
+        key = self._item_cells.pop(item, None)
+        if key is not None:
+            self.cells[key].remove(item)
+
+    def relocate(self, item: Any):
+        """对象移动后更新其所在格子，不在网格中的对象会被忽略"""
+        old_key = self._item_cells.get(item)
+        if old_key is None:
+            return
+        key = self._cell_of(item.pos.x, item.pos.y)
+        if key == old_key:
+            return
+        self.cells[old_key].remove(item)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+        self._item_cells[item] = key
+        self._expand_bounds(key)
+
+    def _expand_bounds(self, key: Tuple[int, int]):
+        """维护已占用格子的包围范围"""
+        if len(self._item_cells) <= 1:
+            self._min_cell = self._max_cell = key
+            return
+        self._min_cell = (min(self._min_cell[0], key[0]), min(self._min_cell[1], key[1]))
+        self._max_cell = (max(self._max_cell[0], key[0]), max(self._max_cell[1], key[1]))
+
+    def nearest_enemy(self, pos, faction_id: int, max_distance: float = float('inf')):
+        """查询离pos最近的存活敌方对象，返回 (对象, 距离) 或 None
+
+        按格子环逐圈向外搜索，当已找到的最近距离不超过下一圈的最小可能距离时停止，
+        结果与全表扫描一致（距离相等时的选择可能不同）。
+        """
+        if not self._item_cells:
+            return None
+
+        cx, cy = self._cell_of(pos.x, pos.y)
+        max_ring = max(
+            abs(cx - self._min_cell[0]), abs(cx - self._max_cell[0]),
+            abs(cy - self._min_cell[1]), abs(cy - self._max_cell[1])
+        )
+
+        closest = None
+        closest_distance_sq = float('inf')
+        max_distance_sq = max_distance * max_distance
+        px, py = pos.x, pos.y
+        cells = self.cells
+
+        for ring in range(max_ring + 1):
+            # 第ring圈及以外的对象距离至少为 (ring - 1) * cell_size
+            ring_min_distance = (ring - 1) * self.cell_size
+            if ring_min_distance > 0:
+                ring_min_distance_sq = ring_min_distance * ring_min_distance
+                if ring_min_distance_sq > max_distance_sq or closest_distance_sq <= ring_min_distance_sq:
+                    break
+
+            for key in self._ring_cells(cx, cy, ring):
+                bucket = cells.get(key)
+                if not bucket:
+                    continue
+                for item in bucket:
+                    if item.faction_id != faction_id and item.health > 0:
+                        dx = item.pos.x - px
+                        dy = item.pos.y - py
+                        distance_sq = dx * dx + dy * dy
+                        if distance_sq < closest_distance_sq:
+                            closest_distance_sq = distance_sq
+                            closest = item
+
+        if closest is None or closest_distance_sq > max_distance_sq:
+            return None
+        return closest, math.sqrt(closest_distance_sq)
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> List[Any]:
+        """位置落在矩形内的全部对象，只遍历与矩形相交的已占用格子"""
+        if not self._item_cells:
+            return []
+        x0, y0 = self._cell_of(left, top)
+        x1, y1 = self._cell_of(right, bottom)
+        x0, y0 = max(x0, self._min_cell[0]), max(y0, self._min_cell[1])
+        x1, y1 = min(x1, self._max_cell[0]), min(y1, self._max_cell[1])
+
+        found = []
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for item in bucket:
+                        pos = item.pos
+                        if left <= pos.x <= right and top <= pos.y <= bottom:
+                            found.append(item)
+        return found
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        """按切比雪夫距离遍历第ring圈的格子"""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield (x, cy - ring)
+            yield (x, cy + ring)
+        for y in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, y)
+            yield (cx + ring, y)
@@ -0,0 +1,65 @@
+"""半透明圆形精灵缓存"""
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+class SpriteCache:
+    """按（量化半径、颜色、线宽）缓存圆形精灵，带LRU淘汰和内存上限
+
+    精灵以完全不透明的颜色绘制，透明度在绘制时通过 set_alpha 与逐像素alpha相乘，
+    因此同一颜色不同透明度共用一张表面。
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._sprites: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+
+        # 统计数据
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def circle(self, radius: float, color: Tuple[int, int, int], width: int = 0) -> pygame.Surface:
+        """获取半径为radius的圆形精灵，表面尺寸为 2r x 2r，圆心在 (r, r)"""
+        r = max(1, int(radius))
+        key = (r, color[0], color[1], color[2], width)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (color[0], color[1], color[2], 255), (r, r), r, width)
+        self._sprites[key] = sprite
+        self.bytes_used += r * r * 16
+        self._evict()
+        return sprite
+
+    def _evict(self):
+        """超出内存上限时淘汰最久未使用的精灵"""
+        while self.bytes_used > self.max_bytes and len(self._sprites) > 1:
+            (r, *_), _ = self._sprites.popitem(last=False)
+            self.bytes_used -= r * r * 16
+            self.evictions += 1
+
+    def clear(self):
+        """清空缓存"""
+        self._sprites.clear()
+        self.bytes_used = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+# 所有绘制路径共享的缓存
+sprite_cache = SpriteCache()
+
+def draw_alpha_circle(surface: pygame.Surface, color, center, radius: float, width: int = 0):
+    """以RGBA颜色绘制半透明圆，等价于在临时SRCALPHA表面上画圆再贴图"""
+    r = max(1, int(radius))
+    sprite = sprite_cache.circle(r, color, width)
+    sprite.set_alpha(color[3] if len(color) > 3 else 255)
+    surface.blit(sprite, (center[0] - r, center[1] - r))
@@ -0,0 +1,46 @@
+"""文字渲染缓存"""
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+class TextCache:
+    """按（字体、文本、颜色）缓存 font.render 的结果，带LRU淘汰
+
+    界面上大部分文字每帧都相同或只在少数取值间变化，复用渲染好的表面
+    可以省去逐帧的字形栅格化。
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._surfaces: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+
+        # 统计数据
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """获取抗锯齿渲染的文字表面"""
+        key = (font, text, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空缓存"""
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+# 所有界面共享的缓存
+text_cache = TextCache()
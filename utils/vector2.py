@@ -1,30 +1,104 @@
 """2D向量数学工具"""
 import math
+from typing import Iterable, List, Optional, Tuple
 
 class Vector2:
-    """2D向量类"""
-    
+    """2D向量类
+
+    算术运算符返回新向量；原地运算符（+=、-=、*=、/=）和 set() 直接修改自身，
+    热路径中用它们避免临时对象。
+    """
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float = 0, y: float = 0):
         self.x, self.y = x, y
-        
+
+    def __repr__(self):
+        return f"Vector2({self.x}, {self.y})"
+
     def __add__(self, other):
         return Vector2(self.x + other.x, self.y + other.y)
-        
+
     def __sub__(self, other):
         return Vector2(self.x - other.x, self.y - other.y)
-        
+
     def __mul__(self, scalar):
         return Vector2(self.x * scalar, self.y * scalar)
-        
+
     def __truediv__(self, scalar):
         return Vector2(self.x / scalar, self.y / scalar)
-        
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def __itruediv__(self, scalar):
+        self.x /= scalar
+        self.y /= scalar
+        return self
+
+    def set(self, x: float, y: float) -> 'Vector2':
+        """原地设置分量"""
+        self.x, self.y = x, y
+        return self
+
+    def copy(self) -> 'Vector2':
+        return Vector2(self.x, self.y)
+
     def magnitude(self):
         return math.sqrt(self.x * self.x + self.y * self.y)
-        
+
+    def magnitude_sq(self):
+        return self.x * self.x + self.y * self.y
+
     def normalized(self):
         mag = self.magnitude()
         return Vector2(0, 0) if mag == 0 else Vector2(self.x / mag, self.y / mag)
-        
+
+    def normalize_ip(self) -> 'Vector2':
+        """原地归一化，零向量保持不变"""
+        mag = self.magnitude()
+        if mag != 0:
+            self.x /= mag
+            self.y /= mag
+        return self
+
+    def distance_sq_to(self, other):
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+
     def distance_to(self, other):
-        return (self - other).magnitude()
\ No newline at end of file
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return math.sqrt(dx * dx + dy * dy)
+
+def distances_sq(origin: Vector2, points: Iterable[Vector2]) -> List[float]:
+    """origin到一组点的距离平方"""
+    ox, oy = origin.x, origin.y
+    return [(p.x - ox) * (p.x - ox) + (p.y - oy) * (p.y - oy) for p in points]
+
+def nearest(origin: Vector2, points: Iterable[Vector2]) -> Optional[Tuple[int, float]]:
+    """一组点中离origin最近的点，返回 (下标, 距离平方)，空列表返回None"""
+    ox, oy = origin.x, origin.y
+    best_index = -1
+    best_sq = float('inf')
+    for i, p in enumerate(points):
+        dx = p.x - ox
+        dy = p.y - oy
+        d_sq = dx * dx + dy * dy
+        if d_sq < best_sq:
+            best_sq = d_sq
+            best_index = i
+    return None if best_index < 0 else (best_index, best_sq)